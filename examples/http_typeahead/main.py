@@ -0,0 +1,40 @@
+import asyncio
+import json
+
+from fastapi.responses import StreamingResponse
+from nicegui import app, ui
+
+import nice_droplets.dui as dui
+from nice_droplets.components import HttpSearchTask
+
+CITIES = [
+    'Amsterdam', 'Athens', 'Barcelona', 'Berlin', 'Bern', 'Bratislava', 'Brussels', 'Bucharest', 'Budapest',
+    'Copenhagen', 'Dublin', 'Helsinki', 'Kyiv', 'Lisbon', 'Ljubljana', 'London', 'Luxembourg', 'Madrid',
+    'Monaco', 'Oslo', 'Paris', 'Prague', 'Riga', 'Rome', 'Sofia', 'Stockholm', 'Tallinn', 'Valletta',
+    'Vienna', 'Vilnius', 'Warsaw', 'Zagreb',
+]
+
+
+@app.get('/api/cities')
+async def search_cities(q: str = '') -> StreamingResponse:
+    """Stand-in search backend streaming newline delimited JSON with an artificial delay."""
+    async def generate():
+        for city in CITIES:
+            if q.lower() in city.lower():
+                await asyncio.sleep(0.05)
+                yield json.dumps(city) + '\n'
+    return StreamingResponse(generate(), media_type='application/x-ndjson')
+
+
+@ui.page('/')
+def index():
+    ui.markdown('## City Search via HTTP').classes('text-h5 mt-4 mb-2')
+
+    with ui.input(label='Search cities', placeholder='Type to search...'):
+        dui.typeahead(
+            on_search=lambda query: HttpSearchTask('http://127.0.0.1:8080/api/cities', query,
+                                                   timeout=2.0, max_elements=10),
+            min_chars=1,
+        )
+
+ui.run()
@@ -0,0 +1,208 @@
+"""Simulates many users typing into a typeahead concurrently and reports how the server copes.
+
+Each simulated user loads the page, connects the NiceGUI websocket and types random prefixes of words at human
+cadence by sending the same value change events as a browser. Together with the rendered items the server sends the
+query they belong to. The keystroke-to-render latency is the time from sending a value until the websocket update
+carrying the results of exactly that value arrives, so it includes the debounce time, the search, the rendering and
+the transfer, but not the browser's layout and paint. Keystrokes superseded by a later one before their results
+were rendered are counted as superseded instead. Throughput is reported together with the server's per-stage
+latencies, executor queue depth, event loop lag and memory per client, polled from the endpoints of server.py.
+
+Example: ``python load_test.py --start-server --clients 200 --duration 60``
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import string
+import subprocess
+import sys
+import time
+import uuid
+from pathlib import Path
+
+import httpx
+import socketio
+
+
+class SimulatedUser:
+    """A websocket client typing into the typeahead of one page"""
+
+    def __init__(self, url: str, number: int, cadence: float, think_time: float):
+        self.url = url
+        self.number = number
+        self.cadence = cadence
+        self.think_time = think_time
+        self.latencies: list[float] = []
+        self.keystrokes = 0
+        self.renders = 0
+        self.superseded = 0
+        self.messages = 0
+        self._session: dict = {}
+        self._listeners: dict[tuple[int, str], str] = {}
+        self._listeners_received = asyncio.Event()
+        self._pending: list[tuple[str, float]] = []
+        self._sio = socketio.AsyncClient(reconnection=False)
+        self._sio.on('*', self._handle_message)
+
+    async def run(self, until: float) -> None:
+        async with httpx.AsyncClient(base_url=self.url) as http:
+            await http.get('/', params={'session': str(self.number)})
+            session = self._session = (await http.get(f'/loadtest/session/{self.number}')).json()
+            client_id = session['client_id']
+            await self._sio.connect(f'{self.url}?client_id={client_id}', socketio_path='/_nicegui_ws/socket.io',
+                                    transports=['websocket'])
+            await self._sio.emit('handshake', {'client_id': client_id, 'tab_id': str(uuid.uuid4()),
+                                               'old_tab_id': None})
+            await http.post(f'/loadtest/session/{self.number}/announce')
+        await asyncio.wait_for(self._listeners_received.wait(), 10.0)
+        input_listener = self._listener(session['input_id'], 'update:model-value')
+        await self._emit(session['popover_id'], self._listener(session['popover_id'], '_show'),
+                         {'target': session['input_id']})
+        try:
+            while time.monotonic() < until:
+                word = ''.join(random.choices(string.ascii_lowercase, k=random.randint(3, 8)))
+                for length in range(1, len(word) + 1):
+                    self._pending.append((word[:length], time.monotonic()))
+                    self.keystrokes += 1
+                    await self._emit(session['input_id'], input_listener, word[:length])
+                    await asyncio.sleep(max(0.02, random.gauss(self.cadence, self.cadence / 3)))
+                await asyncio.sleep(random.uniform(0.5, 1.5) * self.think_time)
+                await self._emit(session['input_id'], input_listener, '')
+        finally:
+            await self._sio.disconnect()
+
+    def _listener(self, element_id: int, event_type: str) -> str:
+        """Get the id of an event listener as announced to the client"""
+        return self._listeners[(element_id, _normalized_event_type(event_type))]
+
+    async def _emit(self, element_id: int, listener_id: str, value: object) -> None:
+        await self._sio.emit('event', {'id': element_id, 'client_id': self._session['client_id'],
+                                       'listener_id': listener_id, 'args': [json.dumps(value)]})
+
+    async def _handle_message(self, event: str, data: object = None) -> None:
+        self.messages += 1
+        if event != 'update' or not isinstance(data, dict):
+            return
+        now = time.monotonic()
+        for element_id, element in data.items():
+            if not isinstance(element, dict):
+                continue
+            element_id = int(element_id)
+            if element_id in (self._session.get('input_id'), self._session.get('popover_id')):
+                for listener in element.get('events', []):
+                    self._listeners[(element_id, _normalized_event_type(listener['type']))] = listener['listener_id']
+                if len({key[0] for key in self._listeners}) == 2:
+                    self._listeners_received.set()
+            elif element_id == self._session.get('rendered_query_id'):
+                self._handle_render(element.get('text') or '', now)
+
+    def _handle_render(self, query: str, now: float) -> None:
+        """Measure the latency of the keystroke whose results were rendered, the ones before it were superseded"""
+        for index in range(len(self._pending) - 1, -1, -1):
+            value, sent = self._pending[index]
+            if value == query:
+                self.latencies.append(now - sent)
+                self.renders += 1
+                self.superseded += index
+                del self._pending[:index + 1]
+                return
+
+
+def _normalized_event_type(event_type: str) -> str:
+    """NiceGUI may announce event types in camel case, e.g. update:modelValue"""
+    return event_type.replace('-', '').lower()
+
+
+def percentiles(values: list[float]) -> dict[str, float | None]:
+    ordered = sorted(values)
+    pick = lambda p: ordered[min(len(ordered) - 1, int(len(ordered) * p / 100))] if ordered else None
+    return {'p50': pick(50), 'p90': pick(90), 'p99': pick(99)}
+
+
+async def sample_server(url: str, until: float, samples: list[dict]) -> None:
+    async with httpx.AsyncClient(base_url=url) as http:
+        while time.monotonic() < until:
+            try:
+                samples.append((await http.get('/loadtest/metrics')).json())
+            except httpx.HTTPError:
+                pass
+            await asyncio.sleep(1.0)
+
+
+async def run_load_test(arguments: argparse.Namespace) -> dict:
+    started = time.monotonic()
+    until = started + arguments.ramp_up + arguments.duration
+    users = [SimulatedUser(arguments.url, number, arguments.cadence, arguments.think_time)
+             for number in range(arguments.clients)]
+    samples: list[dict] = []
+
+    async def start(user: SimulatedUser) -> None:
+        await asyncio.sleep(arguments.ramp_up * user.number / max(1, arguments.clients))
+        await user.run(until)
+
+    sampler = asyncio.create_task(sample_server(arguments.url, until, samples))
+    results = await asyncio.gather(*(start(user) for user in users), return_exceptions=True)
+    await sampler
+    elapsed = time.monotonic() - started
+    failed = [result for result in results if isinstance(result, Exception)]
+    final = samples[-1] if samples else {}
+    distributions = final.get('metrics', {}).get('distributions', {})
+    counters = final.get('metrics', {}).get('counters', {})
+    return {
+        'clients': arguments.clients,
+        'failed_clients': len(failed),
+        'first_error': repr(failed[0]) if failed else None,
+        'duration': elapsed,
+        'keystrokes_per_second': sum(user.keystrokes for user in users) / elapsed,
+        'renders_per_second': sum(user.renders for user in users) / elapsed,
+        'superseded_keystrokes': sum(user.superseded for user in users),
+        'messages_per_second': sum(user.messages for user in users) / elapsed,
+        'server_searches_per_second': counters.get('loadtest.searches', 0) / elapsed,
+        'keystroke_to_render': percentiles([latency for user in users for latency in user.latencies]),
+        'executor_wait_time': distributions.get('executor.wait_time{executor=default}'),
+        'search_time': distributions.get('loadtest.search_time'),
+        'event_loop_lag': distributions.get('event_loop.lag'),
+        'event_loop_stalls': {key: value for key, value in counters.items() if key.startswith('event_loop.stalls')},
+        'max_executor_queue_depth': max((sample['executor_queue_depth'] for sample in samples), default=None),
+        'rss_bytes_per_client': max((sample['rss_bytes_per_client'] or 0 for sample in samples), default=None),
+    }
+
+
+def start_server(arguments: argparse.Namespace, server_arguments: list[str]) -> subprocess.Popen:
+    port = arguments.url.rsplit(':', 1)[-1].strip('/')
+    process = subprocess.Popen([sys.executable, str(Path(__file__).parent / 'server.py'), '--port', port,
+                                *server_arguments])
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        try:
+            httpx.get(f'{arguments.url}/loadtest/metrics')
+            return process
+        except httpx.HTTPError:
+            time.sleep(0.5)
+    process.terminate()
+    raise RuntimeError('The load test server did not start within 60 seconds')
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Load test a typeahead server with simulated typists.',
+                                     epilog='Unknown arguments are passed to server.py when using --start-server.')
+    parser.add_argument('--url', default='http://127.0.0.1:8090')
+    parser.add_argument('--clients', type=int, default=100)
+    parser.add_argument('--duration', type=float, default=30.0, help='Seconds of typing after the ramp up')
+    parser.add_argument('--ramp-up', type=float, default=10.0, help='Seconds over which the clients connect')
+    parser.add_argument('--cadence', type=float, default=0.18, help='Average seconds between two keystrokes')
+    parser.add_argument('--think-time', type=float, default=1.0, help='Average pause in seconds between two words')
+    parser.add_argument('--start-server', action='store_true', help='Start server.py as subprocess')
+    arguments, server_arguments = parser.parse_known_args()
+    process = start_server(arguments, server_arguments) if arguments.start_server else None
+    try:
+        print(json.dumps(asyncio.run(run_load_test(arguments)), indent=2))
+    finally:
+        if process is not None:
+            process.terminate()
+
+
+if __name__ == '__main__':
+    main()
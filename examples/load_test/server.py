@@ -0,0 +1,116 @@
+"""Typeahead server used by load_test.py.
+
+Every page load registers the ids of the elements the simulated client types into. The ids of their event listeners
+are sent over the websocket once the client asks for them, like NiceGUI sends them to a browser. A hidden label
+shows the query of the rendered results, so the client can tell which keystroke an update belongs to.
+Run it directly with ``python server.py --port 8090`` or let ``load_test.py --start-server`` start it.
+"""
+
+import argparse
+import os
+import random
+import resource
+import string
+import time
+
+from nicegui import Client, app, ui
+
+import nice_droplets.dui as dui
+from nice_droplets.components import CancellationToken, LoopWatchdog, SearchTask, chunked_scan, executors, metrics
+from nice_droplets.factories import FlexDefaultFactory, FlexItemListFactory
+
+parser = argparse.ArgumentParser(description='Typeahead server for load tests.')
+parser.add_argument('--port', type=int, default=8090)
+parser.add_argument('--records', type=int, default=100_000, help='The number of searchable records')
+parser.add_argument('--debounce', type=float, default=0.1)
+parser.add_argument('--max-elements', type=int, default=20)
+parser.add_argument('--factory', choices=['default', 'item'], default='default')
+parser.add_argument('--workers', type=int, default=4, help='The worker threads of the search executor')
+arguments = parser.parse_args()
+
+random.seed(42)
+RECORDS = [' '.join(''.join(random.choices(string.ascii_lowercase, k=random.randint(3, 9)))
+                    for _ in range(random.randint(1, 3))) for _ in range(arguments.records)]
+executors.register('default', max_workers=arguments.workers)
+sessions: dict[str, dict[str, str | int]] = {}
+session_elements: dict[str, list[ui.element]] = {}
+
+
+def rss_bytes() -> int:
+    """The current resident memory of the server"""
+    try:
+        with open('/proc/self/statm', encoding='ascii') as file:
+            return int(file.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+BASELINE_RSS = rss_bytes()
+
+
+def search(query: str, token: CancellationToken) -> list[str]:
+    started = time.monotonic()
+    query = query.lower()
+    results = chunked_scan(RECORDS, lambda record: query in record, token, limit=arguments.max_elements * 5)
+    metrics.observe('loadtest.search_time', time.monotonic() - started)
+    metrics.increment('loadtest.searches')
+    return results
+
+
+def on_search(query: str) -> SearchTask:
+    return SearchTask(search, query, max_elements=arguments.max_elements, with_token=True)
+
+
+@ui.page('/')
+def index(session: str = ''):
+    factory = FlexItemListFactory() if arguments.factory == 'item' else FlexDefaultFactory()
+    with ui.input(label='Search') as search_input:
+        typeahead = dui.typeahead(on_search=on_search, debounce=arguments.debounce, factory=factory,
+                                  client_cache_size=0)
+    rendered_query = ui.label().classes('hidden')
+    rendered = {'at': 0.0}
+
+    def handle_content_update(_) -> None:
+        if rendered['at']:
+            metrics.observe('loadtest.render_interval', time.monotonic() - rendered['at'])
+        rendered['at'] = time.monotonic()
+        metrics.increment('loadtest.renders')
+        rendered_query.set_text(typeahead._search_list.query)  # sent in the same update as the rendered items
+    typeahead._search_list.on_content_update(handle_content_update)
+    sessions[session] = {
+        'client_id': ui.context.client.id,
+        'input_id': search_input.id,
+        'popover_id': typeahead.id,
+        'rendered_query_id': rendered_query.id,
+    }
+    session_elements[session] = [search_input, typeahead]
+
+
+@app.get('/loadtest/session/{session}')
+def session_info(session: str) -> dict:
+    return sessions.get(session, {})
+
+
+@app.post('/loadtest/session/{session}/announce')
+def announce(session: str) -> dict:
+    """Send the elements of a session to its connected client again, including their event listeners"""
+    for element in session_elements.get(session, []):
+        element.update()
+    return {}
+
+
+@app.get('/loadtest/metrics')
+def server_metrics() -> dict:
+    clients = len(Client.instances)
+    rss = rss_bytes()
+    return {
+        'clients': clients,
+        'rss_bytes': rss,
+        'rss_bytes_per_client': (rss - BASELINE_RSS) / clients if clients else None,
+        'executor_queue_depth': executors.get('default').queue_depth,
+        'metrics': metrics.snapshot(),
+    }
+
+
+LoopWatchdog().install()
+ui.run(port=arguments.port, reload=False, show=False)
@@ -1,6 +1,7 @@
 from nicegui import ui
 import nice_droplets.dui as dui
 from nice_droplets.components.search_task import SearchTask
+from nice_droplets.components.normalization import default_normalizer
 
 FRUITS = [
     'Apple', 'Apricot', 'Avocado',
@@ -20,11 +21,13 @@ FRUITS = [
     'Tangerine',
     'Watermelon'
 ]
+# Normalized once, so searches only need to normalize the query
+NORMALIZED_FRUITS = [(fruit, default_normalizer.normalize(fruit)) for fruit in FRUITS]
 
 async def search_fruits_filter(query: str) -> list[str]:
     """Search fruits that match the query."""
-    query = query.lower()
-    return [fruit for fruit in FRUITS if query in fruit.lower()]
+    query = default_normalizer.key(query)
+    return [fruit for fruit, normalized in NORMALIZED_FRUITS if query in normalized]
 
 @ui.page('/')
 def index():
@@ -40,6 +43,10 @@ def index():
         ):
             pass  # Content is managed by the typeahead component
 
+    # Small datasets can be filtered in the browser without a server round trip per keystroke
+    with ui.input(label='Search fruits locally', placeholder='Type to search...'):
+        dui.typeahead(items=FRUITS)
+
     # Show all fruits for reference
     ui.markdown('### Available Fruits:').classes('mt-4 mb-2')
     with ui.row().classes('flex-wrap gap-2'):
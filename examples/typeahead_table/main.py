@@ -2,10 +2,13 @@ from nicegui import ui
 import nice_droplets.dui as dui
 from nice_droplets.factories import FlexTableFactory
 from nice_droplets.components.search_task import SearchTask
+from nice_droplets.components.cancellation_token import chunked_scan
+from nice_droplets.components.record_store import RecordStore
+from nice_droplets.components.normalization import default_normalizer
 
 
-# Sample data with more structured information
-products = [
+# Sample data with more structured information, stored column by column with shared category strings
+products = RecordStore.from_dicts([
     {'id': 1, 'name': 'Apple MacBook Pro', 'category': 'Laptops', 'price': 1299.99, 'stock': 50},
     {'id': 2, 'name': 'Dell XPS 13', 'category': 'Laptops', 'price': 999.99, 'stock': 30},
     {'id': 3, 'name': 'iPhone 13', 'category': 'Phones', 'price': 799.99, 'stock': 100},
@@ -16,23 +19,27 @@ products = [
     {'id': 8, 'name': 'Sony WH-1000XM4', 'category': 'Audio', 'price': 349.99, 'stock': 60},
     {'id': 9, 'name': 'Apple Watch Series 7', 'category': 'Wearables', 'price': 399.99, 'stock': 80},
     {'id': 10, 'name': 'Samsung Galaxy Watch 4', 'category': 'Wearables', 'price': 249.99, 'stock': 45},
-]
+], intern=['category'])
+# The searchable text of every product, normalized once instead of on every keystroke
+SEARCH_TEXTS = [default_normalizer.normalize(' '.join(str(value) for value in product.values())) for product in products]
 
 class TableSearchTask(SearchTask):
 
-    def __init__(self, products: list[dict], query: str):
+    def __init__(self, products: RecordStore, query: str):
         super().__init__()
         self.products = products
         self.query = query
     
     def execute(self):
         """Search products that match the query across all fields."""
-        query = self.query.lower()
-        results = [
-            product for product in self.products
-            if any(str(value).lower().find(query) >= 0 for value in product.values())            
-        ]
-        self.set_elements(results)
+        query = default_normalizer.key(self.query)
+        matches = chunked_scan(
+            range(len(SEARCH_TEXTS)),
+            lambda index: query in SEARCH_TEXTS[index],
+            self.token,
+            publish_interval=None,
+        )
+        self.set_elements(self.products.views(matches))
     
 @ui.page('/')
 def index():
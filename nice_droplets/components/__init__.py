@@ -1,6 +1,72 @@
 from nice_droplets.components.event_handler_tracker import EventHandlerTracker
 from nice_droplets.components.task import Task
+from nice_droplets.components.cancellation_token import CancellationToken, cancellable, chunked_scan
 from nice_droplets.components.search_task import SearchTask
+from nice_droplets.components.normalization import Normalizer, default_normalizer
+from nice_droplets.components.ranking import Ranker
+from nice_droplets.components.executors import ExecutorBusyError, ExecutorRegistry, SearchExecutor, executors
 from nice_droplets.components.task_executor import TaskExecutor
+from nice_droplets.components.http_search_task import HttpSearchTask
+from nice_droplets.components.federated_search import FederatedSearch, FederatedSearchTask, GroupHeader
+from nice_droplets.components.fuzzy_search import FuzzySource, SymSpellDictionary
+from nice_droplets.components.line_file_source import LineFileIndex, LineFileSource
+from nice_droplets.components.metrics import Metrics, metrics
+from nice_droplets.components.record_store import RecordStore, RecordView
+from nice_droplets.components.search_index import SearchIndex, SearchIndexBuilder, SearchIndexSource
+from nice_droplets.components.sharded_search import ShardedSearch, ShardedSearchTask
+from nice_droplets.components.loop_watchdog import LoopWatchdog, Stall
+from nice_droplets.components.task_profiler import TaskProfiler, profiler
+from nice_droplets.components.session_recorder import RecordedEvent, RecordedSession, SessionRecorder, SessionRecording
+from nice_droplets.components.replay import ReplayHarness, ReplayReport
+from nice_droplets.components.traffic_meter import TrafficMeter, traffic
+from nice_droplets.components.resilient_search import CircuitBreaker, CircuitOpenError, ResilientSearch, ResilientSearchTask
 
-__all__ = ['Task', 'SearchTask', 'EventHandlerTracker', 'TaskExecutor']
\ No newline at end of file
+__all__ = [
+    'EventHandlerTracker',
+    'Task',
+    'CancellationToken',
+    'cancellable',
+    'chunked_scan',
+    'SearchTask',
+    'Normalizer',
+    'default_normalizer',
+    'Ranker',
+    'ExecutorBusyError',
+    'ExecutorRegistry',
+    'SearchExecutor',
+    'executors',
+    'TaskExecutor',
+    'HttpSearchTask',
+    'FederatedSearch',
+    'FederatedSearchTask',
+    'GroupHeader',
+    'FuzzySource',
+    'SymSpellDictionary',
+    'LineFileIndex',
+    'LineFileSource',
+    'Metrics',
+    'metrics',
+    'RecordStore',
+    'RecordView',
+    'SearchIndex',
+    'SearchIndexBuilder',
+    'SearchIndexSource',
+    'ShardedSearch',
+    'ShardedSearchTask',
+    'LoopWatchdog',
+    'Stall',
+    'TaskProfiler',
+    'profiler',
+    'RecordedEvent',
+    'RecordedSession',
+    'SessionRecorder',
+    'SessionRecording',
+    'ReplayHarness',
+    'ReplayReport',
+    'TrafficMeter',
+    'traffic',
+    'CircuitBreaker',
+    'CircuitOpenError',
+    'ResilientSearch',
+    'ResilientSearchTask',
+]
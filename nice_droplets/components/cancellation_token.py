@@ -0,0 +1,96 @@
+"""Cancellation and progress tokens handed to plain search functions."""
+
+import time
+from typing import TYPE_CHECKING, Any, Callable, Iterable, Iterator
+
+if TYPE_CHECKING:
+    from .search_task import SearchTask
+
+
+class CancellationToken:
+    """Gives a search function access to the cancellation state of its task.
+
+    Search functions receive the token if the SearchTask was created with ``with_token=True``.
+    They can check is_cancelled to stop early, publish partial results and report their progress.
+    """
+
+    def __init__(self, task: 'SearchTask'):
+        self._task = task
+        self._progress: tuple[int, int] = (0, 0)
+
+    @property
+    def is_cancelled(self) -> bool:
+        """Check if the task has been cancelled, e.g. because a newer query superseded it."""
+        return self._task.is_cancelled
+
+    def publish(self, elements: list[Any]) -> None:
+        """Publish the results found so far, they are shown while the search continues."""
+        self._task.publish_partial(list(elements))
+
+    def report_progress(self, done: int, total: int) -> None:
+        """Report how many of the total records were processed."""
+        self._progress = (done, total)
+
+    @property
+    def progress(self) -> tuple[int, int]:
+        """The last reported progress as tuple of processed and total records."""
+        return self._progress
+
+
+def cancellable(records: Iterable[Any], token: CancellationToken, check_every: int = 1000) -> Iterator[Any]:
+    """Iterate over records and stop silently once the token is cancelled.
+
+    Cancellation is checked every check_every records, so existing loops stop shortly after
+    being superseded by simply wrapping their iterable: ``for record in cancellable(records, token): ...``
+
+    :param records: The records to iterate.
+    :param token: The token of the running task.
+    :param check_every: The number of records between two cancellation checks.
+    """
+    total = len(records) if hasattr(records, '__len__') else 0
+    for index, record in enumerate(records):
+        if index % check_every == 0:
+            if token.is_cancelled:
+                return
+            token.report_progress(index, total)
+        yield record
+    token.report_progress(total, total)
+
+
+def chunked_scan(
+    records: Iterable[Any],
+    predicate: Callable[[Any], bool],
+    token: CancellationToken,
+    *,
+    chunk_size: int = 1000,
+    limit: int = -1,
+    publish_interval: float | None = 0.1,
+    result_fn: Callable[[Any], Any] | None = None,
+) -> list[Any]:
+    """Linear scan returning all records matching the predicate, stopping once the token is cancelled.
+
+    :param records: The records to scan.
+    :param predicate: Function returning True for matching records.
+    :param token: The token of the running task.
+    :param chunk_size: The number of records between two cancellation checks.
+    :param limit: The maximum number of matches to collect, -1 for no limit.
+    :param publish_interval: Minimum time in seconds between publishing partial results, None to disable.
+    :param result_fn: Optional function mapping a matching record to the published and returned result,
+        e.g. to drop a precomputed search text.
+    :return: The matching records, incomplete if the scan was cancelled.
+    """
+    matches: list[Any] = []
+    published = 0
+    last_publish = time.monotonic()
+    for index, record in enumerate(cancellable(records, token, chunk_size)):
+        if predicate(record):
+            matches.append(record if result_fn is None else result_fn(record))
+            if len(matches) == limit:
+                break
+        if publish_interval is not None and index % chunk_size == chunk_size - 1 and len(matches) > published:
+            now = time.monotonic()
+            if now - last_publish >= publish_interval:
+                token.publish(matches)
+                published = len(matches)
+                last_publish = now
+    return matches
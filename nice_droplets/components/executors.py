@@ -0,0 +1,180 @@
+"""Named, sized thread pools executing sync search tasks, separate from NiceGUI's shared run.thread_pool."""
+
+import asyncio
+import os
+import time
+from concurrent.futures import CancelledError, Future, ThreadPoolExecutor
+from threading import Lock
+from typing import Any, Awaitable, Callable
+
+from nicegui import app
+
+from .metrics import metrics
+from .task import Task
+
+
+class ExecutorBusyError(Exception):
+    """Raised if a task is submitted to an executor whose queue is full."""
+
+
+class SearchExecutor:
+    """Thread pool with a bounded queue which reports its queue depth and the time tasks wait for a worker.
+
+    The metrics are ``executor.queue_depth`` (gauge), ``executor.wait_time`` (distribution, in seconds) and
+    ``executor.rejected`` (counter), each labelled with the executor name.
+    """
+
+    def __init__(self, name: str, max_workers: int = 4, max_queue: int | None = None):
+        """Initialize the executor.
+
+        :param name: The name of the executor, used as metrics label.
+        :param max_workers: The number of worker threads.
+        :param max_queue: The maximum number of tasks waiting for a worker, None for no limit.
+            Submitting more tasks raises ExecutorBusyError.
+        """
+        self.name = name
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=f'nd-{name}')
+        self._lock = Lock()
+        self._queued = 0
+
+    @property
+    def queue_depth(self) -> int:
+        """The number of submitted tasks waiting for a worker."""
+        return self._queued
+
+    def submit(self, fn: Callable[..., Any], *args: Any) -> Future:
+        """Execute a function in the pool.
+
+        :raises ExecutorBusyError: If the queue is full.
+        :raises RuntimeError: If the executor was shut down, e.g. because it was replaced.
+        """
+        with self._lock:
+            if self.max_queue is not None and self._queued >= self.max_queue:
+                metrics.increment('executor.rejected', executor=self.name)
+                raise ExecutorBusyError(f'Executor {self.name!r} has {self._queued} queued tasks')
+            self._queued += 1
+            metrics.set_gauge('executor.queue_depth', self._queued, executor=self.name)
+        try:
+            future = self._pool.submit(self._run, time.monotonic(), fn, *args)
+        except RuntimeError:
+            with self._lock:
+                self._queued -= 1
+                metrics.set_gauge('executor.queue_depth', self._queued, executor=self.name)
+            raise
+        future.add_done_callback(self._handle_cancelled)
+        return future
+
+    def run_task(self, task: Task) -> Future:
+        """Execute task.run in the pool. If the queue is full or the executor was shut down the task fails instead."""
+        try:
+            future = self.submit(task.run)
+        except (ExecutorBusyError, RuntimeError) as e:
+            task.reject(e)
+            future = Future()
+            future.set_result(None)
+            return future
+        future.add_done_callback(lambda f: self._reject_dropped(f, task))
+        return future
+
+    def shutdown(self, wait: bool = False) -> None:
+        """Stop the worker threads. Queued tasks are dropped and fail with a CancelledError, so they are done."""
+        self._pool.shutdown(wait=wait, cancel_futures=True)
+
+    def _handle_cancelled(self, future: Future) -> None:
+        """Remove a queued function which never ran from the queue depth"""
+        if future.cancelled():
+            with self._lock:
+                self._queued -= 1
+                metrics.set_gauge('executor.queue_depth', self._queued, executor=self.name)
+
+    def _reject_dropped(self, future: Future, task: Task) -> None:
+        """Complete a task dropped from the queue, otherwise it and everyone polling it would wait forever"""
+        if future.cancelled():
+            task.reject(CancelledError(f'Executor {self.name!r} was shut down before the task ran'))
+
+    def _run(self, submitted: float, fn: Callable[..., Any], *args: Any) -> Any:
+        with self._lock:
+            self._queued -= 1
+            metrics.set_gauge('executor.queue_depth', self._queued, executor=self.name)
+        metrics.observe('executor.wait_time', time.monotonic() - submitted, executor=self.name)
+        return fn(*args)
+
+
+class ExecutorRegistry:
+    """Registry of the named executors and of the executor used by each task.
+
+    Register executors with ``executors.register('database', max_workers=4, max_queue=16)`` and select them
+    per task (``SearchTask(..., executor='database')``) or per task type (``executors.assign(MyTask, 'database')``).
+    Other tasks use the ``default`` executor, which is created on first use unless registered explicitly.
+    """
+
+    DEFAULT = 'default'
+
+    def __init__(self):
+        self._executors: dict[str, SearchExecutor] = {}
+        self._assignments: dict[type, str] = {}
+        self._lock = Lock()
+        self._shutdown_registered = False
+
+    def register(self, name: str, max_workers: int = 4, max_queue: int | None = None) -> SearchExecutor:
+        """Create an executor, replacing and shutting down an existing one of the same name."""
+        executor = SearchExecutor(name, max_workers, max_queue)
+        with self._lock:
+            previous = self._executors.get(name)
+            self._executors[name] = executor
+            self._register_shutdown()
+        if previous is not None:
+            previous.shutdown()
+        return executor
+
+    def assign(self, task_type: type[Task], name: str) -> None:
+        """Execute all tasks of a type, including subclasses, with the named executor."""
+        self._assignments[task_type] = name
+
+    def get(self, name: str) -> SearchExecutor:
+        """Get an executor by its name.
+
+        :raises KeyError: If no executor of that name was registered.
+        """
+        with self._lock:
+            executor = self._executors.get(name)
+            if executor is None and name == self.DEFAULT:
+                executor = SearchExecutor(name, max_workers=min(32, (os.cpu_count() or 1) + 4))
+                self._executors[name] = executor
+                self._register_shutdown()
+        if executor is None:
+            raise KeyError(f'No executor named {name!r} was registered')
+        return executor
+
+    def for_task(self, task: Task) -> SearchExecutor:
+        """Get the executor of a task, selected by its executor attribute or its type."""
+        name = getattr(task, 'executor', None)
+        if name is None:
+            name = next((self._assignments[cls] for cls in type(task).__mro__ if cls in self._assignments),
+                        self.DEFAULT)
+        return self.get(name)
+
+    def run_task(self, task: Task) -> Future:
+        """Execute a sync task with its executor."""
+        return self.for_task(task).run_task(task)
+
+    def run(self, task: Task) -> Awaitable[None]:
+        """Run a task on the event loop if it is async, otherwise with its executor, and await its completion."""
+        return task.run_async() if task.is_async else asyncio.wrap_future(self.run_task(task))
+
+    def shutdown(self) -> None:
+        """Stop all executors."""
+        with self._lock:
+            executors, self._executors = list(self._executors.values()), {}
+        for executor in executors:
+            executor.shutdown()
+
+    def _register_shutdown(self) -> None:
+        if not self._shutdown_registered:
+            self._shutdown_registered = True
+            app.on_shutdown(self.shutdown)
+
+
+executors = ExecutorRegistry()
@@ -0,0 +1,163 @@
+"""Search combining the results of several sources which are queried concurrently."""
+
+import asyncio
+from dataclasses import dataclass
+from typing import Any, Callable
+
+from .executors import executors
+from .metrics import metrics
+from .search_task import SearchTask
+
+
+@dataclass(frozen=True)
+class GroupHeader:
+    """Labels the group of results of one source within a federated result list.
+
+    Headers are disabled, so factories render them as non-selectable items.
+    """
+    label: str
+    source: str
+    disabled: bool = True
+
+    def __str__(self) -> str:
+        return self.label
+
+
+class FederatedSearch:
+    """Queries several search sources concurrently and merges their results into labelled groups.
+
+    Pass an instance as search task factory, e.g.
+    ``Typeahead(on_search=FederatedSearch({'Recent': recent_search, 'Catalog': catalog_search}))``.
+    """
+
+    def __init__(
+        self,
+        sources: dict[str, Callable[[str], SearchTask]],
+        *,
+        timeout: float | dict[str, float] = 2.0,
+        default_timeout: float = 2.0,
+        key_fn: Callable[[Any], Any] | None = None,
+        group_labels: bool = True,
+        max_elements: int = -1,
+    ):
+        """Initialize the federated search.
+
+        :param sources: The search task factories of all sources by their group label, in display order.
+        :param timeout: The time in seconds after which a source is skipped, either for all or per source label.
+        :param default_timeout: The timeout of sources missing in a timeout dict.
+        :param key_fn: Function returning the key by which duplicates are detected, by default the item itself or
+            its string representation if it is not hashable. Of duplicate items the one of the first source is kept.
+        :param group_labels: Whether to insert a GroupHeader before the results of each source.
+        :param max_elements: The maximum number of results of the merged result list, group headers not counted.
+        """
+        self.sources = sources
+        self.timeout = timeout
+        self.default_timeout = default_timeout
+        self.key_fn = key_fn or _default_key
+        self.group_labels = group_labels
+        self.max_elements = max_elements
+
+    def __call__(self, query: str) -> 'FederatedSearchTask':
+        return FederatedSearchTask(self, {label: on_search(query) for label, on_search in self.sources.items()},
+                                   query)
+
+    def timeout_of(self, label: str) -> float:
+        """Get the timeout of a source."""
+        return self.timeout.get(label, self.default_timeout) if isinstance(self.timeout, dict) else self.timeout
+
+
+class FederatedSearchTask(SearchTask):
+    """Search task running the tasks of all sources of a FederatedSearch concurrently.
+
+    Sync tasks are executed in the thread pool, async ones on the event loop. The merged results are published
+    each time a source finishes, so fast sources are visible without waiting for slow ones.
+    """
+
+    def __init__(self, search: FederatedSearch, tasks: dict[str, SearchTask], query: str):
+        super().__init__(query=query, max_elements=search.max_elements)
+        self._search = search
+        self._tasks = tasks
+        self._groups: dict[str, list[Any]] = {}
+
+    @property
+    def groups(self) -> dict[str, list[Any]]:
+        """The results received so far by source label."""
+        return dict(self._groups)
+
+    @property
+    def publishes_partial_results(self) -> bool:
+        return True  # the results of fast sources are shown while slow ones are running
+
+    def cancel(self) -> None:
+        super().cancel()
+        for task in self._tasks.values():
+            task.cancel()
+
+    async def execute_async(self):
+        pending = {asyncio.ensure_future(self._run_source(label, task)): label for label, task in self._tasks.items()}
+        errors: list[Exception] = []
+        for finished in asyncio.as_completed(pending):
+            label, results, error = await finished
+            if self.is_cancelled:
+                return
+            if error is not None:
+                errors.append(error)
+                continue
+            self._groups[label] = results
+            self._merge_groups()
+        if errors and len(errors) == len(self._tasks):
+            raise errors[0]
+
+    async def _run_source(self, label: str, task: SearchTask) -> tuple[str, list[Any], Exception | None]:
+        try:
+            await asyncio.wait_for(executors.run(task), self._search.timeout_of(label))
+        except TimeoutError as e:
+            task.cancel()
+            metrics.increment('search.timeouts', source=label)
+            return label, [], e
+        if task.has_error:
+            metrics.increment('search.errors', source=label)
+            return label, [], task.error
+        return label, task.elements, None
+
+    def _merge_groups(self) -> None:
+        """Merge the groups in the order of the sources, skipping duplicates. Headers do not count as results."""
+        merged: list[Any] = []
+        seen: set[Any] = set()
+        total = 0
+        included = 0
+        more = False
+        for label in self._tasks:
+            group = []
+            for item in self._groups.get(label, ()):
+                key = self._search.key_fn(item)
+                if key in seen:
+                    continue
+                seen.add(key)
+                group.append(item)
+            if not group:
+                continue
+            total += len(group)
+            if self.max_elements != -1:
+                remaining = self.max_elements - included
+                if len(group) > remaining:
+                    more = True
+                    group = group[:remaining]
+                if not group:
+                    continue
+            included += len(group)
+            if self._search.group_labels:
+                merged.append(GroupHeader(label=label, source=label))
+            merged.extend(group)
+        self.total_elements = total
+        with self._data_lock:
+            self._more_elements = more
+            self._publish(tuple(merged))
+
+
+def _default_key(item: Any) -> Any:
+    try:
+        hash(item)
+        return item
+    except TypeError:
+        return str(item)
@@ -0,0 +1,194 @@
+"""Typo tolerant search based on a precomputed SymSpell deletion dictionary."""
+
+import time
+from bisect import bisect_left
+from typing import Any, Callable, Iterable
+
+from .cancellation_token import CancellationToken
+from .normalization import Normalizer, default_normalizer
+from .search_task import SearchTask
+
+
+def edit_distance(a: str, b: str, max_distance: int) -> int:
+    """Compute the optimal string alignment distance (Levenshtein with transpositions) of two strings.
+
+    :return: The distance or max_distance + 1 if it exceeds max_distance.
+    """
+    if abs(len(a) - len(b)) > max_distance:
+        return max_distance + 1
+    previous_previous: list[int] = []
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        row_minimum = i
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            value = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                value = min(value, previous_previous[j - 2] + 1)
+            current[j] = value
+            row_minimum = min(row_minimum, value)
+        if row_minimum > max_distance:
+            return max_distance + 1
+        previous_previous, previous = previous, current
+    return min(previous[-1], max_distance + 1)
+
+
+def deletes(word: str, max_distance: int) -> set[str]:
+    """Get all variants of a word with up to max_distance characters removed, including the word itself."""
+    result = {word}
+    current = {word}
+    for _ in range(max_distance):
+        current = {variant[:i] + variant[i + 1:] for variant in current for i in range(len(variant))} - result
+        result |= current
+    return result
+
+
+class SymSpellDictionary:
+    """Dictionary answering edit distance lookups in near-constant time.
+
+    At build time every term is stored under all variants of its prefix with up to max_distance characters
+    deleted. A lookup only generates the deletions of the query and verifies the few terms sharing one of them,
+    instead of computing the edit distance to every term.
+    """
+
+    def __init__(self, max_distance: int = 2, prefix_length: int = 7):
+        """Initialize the dictionary.
+
+        :param max_distance: The maximum edit distance supported by lookups.
+        :param prefix_length: The number of leading characters of each term which are indexed,
+            longer prefixes need more memory but produce fewer candidates to verify.
+        """
+        self.max_distance = max_distance
+        self.prefix_length = prefix_length
+        self._deletes: dict[str, list[str]] = {}
+        self._terms: set[str] = set()
+        self._sorted_terms: list[str] | None = None
+
+    def __contains__(self, term: str) -> bool:
+        return term in self._terms
+
+    def __len__(self) -> int:
+        return len(self._terms)
+
+    def add(self, term: str) -> None:
+        """Add a term to the dictionary."""
+        if term in self._terms:
+            return
+        self._terms.add(term)
+        self._sorted_terms = None
+        for variant in deletes(term[:self.prefix_length], self.max_distance):
+            self._deletes.setdefault(variant, []).append(term)
+
+    def lookup(self, word: str, max_distance: int | None = None, *, deadline: float | None = None) -> list[tuple[str, int]]:
+        """Find the terms within the given edit distance of a word.
+
+        :param word: The word to look up.
+        :param max_distance: The maximum edit distance, at most the distance the dictionary was built for.
+        :param deadline: Optional time.monotonic() value after which the lookup returns the terms found so far.
+        :return: Pairs of term and distance, ordered by distance.
+        """
+        max_distance = self.max_distance if max_distance is None else min(max_distance, self.max_distance)
+        found: dict[str, int] = {}
+        for variant in deletes(word[:self.prefix_length], max_distance):
+            for term in self._deletes.get(variant, ()):
+                if term in found:
+                    continue
+                found[term] = edit_distance(word, term, max_distance)
+            if deadline is not None and time.monotonic() > deadline:
+                break
+        return sorted(((term, distance) for term, distance in found.items() if distance <= max_distance),
+                      key=lambda pair: (pair[1], pair[0]))
+
+    def finalize(self) -> None:
+        """Prepare the sorted term list used by prefix lookups, otherwise it is built by the first lookup."""
+        if self._sorted_terms is None:
+            self._sorted_terms = sorted(self._terms)
+
+    def prefixed(self, prefix: str, limit: int = 100) -> list[str]:
+        """Find terms starting with the prefix."""
+        self.finalize()
+        index = bisect_left(self._sorted_terms, prefix)
+        result = []
+        while index < len(self._sorted_terms) and len(result) < limit and self._sorted_terms[index].startswith(prefix):
+            result.append(self._sorted_terms[index])
+            index += 1
+        return result
+
+
+class FuzzySource:
+    """Search source tolerating typos, e.g. finding "MacBook" for the query "macbok".
+
+    Each query token matches terms within the maximum edit distance, the last token additionally matches
+    terms it is a prefix of, as the user is probably still typing it. Records must match all query tokens and are
+    ordered by the sum of their edit distances.
+    Pass an instance as search task factory, e.g. ``Typeahead(on_search=FuzzySource(records))``.
+    """
+
+    def __init__(
+        self,
+        records: Iterable[Any],
+        *,
+        text_fn: Callable[[Any], str] | None = None,
+        max_distance: int = 2,
+        prefix_length: int = 7,
+        max_elements: int = 50,
+        time_budget: float = 0.05,
+        normalizer: Normalizer | None = None,
+    ):
+        """Build the fuzzy dictionary of the records.
+
+        :param records: The records to search.
+        :param text_fn: Function returning the searchable text of a record, by default str() is used.
+        :param max_distance: The maximum edit distance of a matching token.
+        :param prefix_length: The number of leading characters of each term which are indexed.
+        :param max_elements: The maximum number of results per query.
+        :param time_budget: The maximum time in seconds spent on the term lookups of a query,
+            once it is exceeded the terms found so far are used.
+        :param normalizer: The normalizer applied to the records and queries.
+        """
+        self.records = list(records)
+        self.normalizer = normalizer or default_normalizer
+        self.max_elements = max_elements
+        self.time_budget = time_budget
+        self.dictionary = SymSpellDictionary(max_distance, prefix_length)
+        self._postings: dict[str, list[int]] = {}
+        text_fn = text_fn or str
+        for record_id, record in enumerate(self.records):
+            for term in set(self.normalizer.tokenize(text_fn(record))):
+                self.dictionary.add(term)
+                self._postings.setdefault(term, []).append(record_id)
+        self.dictionary.finalize()
+
+    def __call__(self, query: str) -> SearchTask:
+        return SearchTask(self.search, query, max_elements=self.max_elements, with_token=True)
+
+    def search(self, query: str, token: CancellationToken | None = None) -> list[Any]:
+        """Find the records matching all tokens of the query within the maximum edit distance."""
+        query_tokens = self.normalizer.tokenize(query)
+        if not query_tokens:
+            return []
+        deadline = time.monotonic() + self.time_budget
+        distances: dict[int, int] | None = None
+        for position, query_token in enumerate(query_tokens):
+            if token is not None and token.is_cancelled:
+                return []
+            max_distance = min(self.dictionary.max_distance, max(0, len(query_token) - 2))  # short tokens must match exactly
+            term_distances = dict(self.dictionary.lookup(query_token, max_distance, deadline=deadline))
+            if position == len(query_tokens) - 1:
+                for term in self.dictionary.prefixed(query_token):
+                    term_distances[term] = 0
+            token_distances: dict[int, int] = {}
+            for term, distance in term_distances.items():
+                for record_id in self._postings.get(term, ()):
+                    if distance < token_distances.get(record_id, distance + 1):
+                        token_distances[record_id] = distance
+            if distances is None:
+                distances = token_distances
+            else:
+                distances = {record_id: distance + token_distances[record_id]
+                             for record_id, distance in distances.items() if record_id in token_distances}
+            if not distances:
+                return []
+        ranked = sorted(distances.items(), key=lambda pair: (pair[1], pair[0]))
+        return [self.records[record_id] for record_id, _ in ranked]
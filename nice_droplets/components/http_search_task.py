@@ -0,0 +1,175 @@
+"""Search task fetching its results from an HTTP service."""
+
+import asyncio
+from threading import Lock
+from typing import Any, Callable
+
+import httpx
+from nicegui import app
+
+from .json_stream_decoder import JsonStreamDecoder
+from .search_task import SearchTask
+
+
+class HttpSearchTask(SearchTask):
+    """A search task querying an HTTP endpoint.
+
+    All tasks of a process share one pooled keep-alive client per event loop, so consecutive queries reuse
+    open connections instead of creating a new client for every keystroke.
+    The in-flight request is aborted as soon as the task gets cancelled, e.g. because the
+    TaskExecutor scheduled a newer query.
+
+    Responses are decoded incrementally, streamed responses (newline delimited JSON or a top-level JSON array)
+    publish their elements while they arrive and the request is closed once max_elements is reached.
+    """
+
+    POOL_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=20, keepalive_expiry=30.0)
+    """The connection limits of the shared client pool."""
+
+    _shared_clients: dict[int, httpx.AsyncClient] = {}
+    _shared_clients_lock = Lock()
+    _shutdown_registered = False
+
+    def __init__(
+        self,
+        url: str,
+        query: str | None = None,
+        *,
+        method: str = 'GET',
+        query_param: str = 'q',
+        params: dict[str, Any] | None = None,
+        headers: dict[str, str] | None = None,
+        limit_param: str | None = None,
+        result_key: str | None = None,
+        transform: Callable[[Any], Any] | None = None,
+        timeout: float = 5.0,
+        max_elements: int = -1,
+        client: httpx.AsyncClient | None = None,
+    ):
+        """Initialize the HTTP search task.
+
+        :param url: The URL of the search endpoint.
+        :param query: The query string to search for.
+        :param method: The HTTP method. For GET the query is passed as URL parameter, otherwise as JSON body.
+        :param query_param: The name of the parameter receiving the query.
+        :param params: Additional parameters passed with every request.
+        :param headers: Additional headers passed with every request.
+        :param limit_param: If provided, max_elements is passed to the server using this parameter name.
+        :param result_key: If the server responds with an object, the key of the list of results within it.
+        :param transform: Optional function converting each received record into a list element.
+        :param timeout: The maximum time in seconds the whole request may take, including streaming.
+        :param max_elements: The maximum number of elements to return.
+        :param client: An explicit client to use instead of the shared pool, e.g. to target a local stand-in server.
+        """
+        super().__init__(query=query, max_elements=max_elements)
+        self.url = url
+        self.method = method.upper()
+        self.query_param = query_param
+        self.params = params or {}
+        self.headers = headers or {}
+        self.limit_param = limit_param
+        self.result_key = result_key
+        self.transform = transform
+        self.timeout = timeout
+        self._client = client
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._request_task: asyncio.Task | None = None
+
+    @classmethod
+    def shared_client(cls) -> httpx.AsyncClient:
+        """Get the pooled client of the current event loop, creating it on first use."""
+        loop = asyncio.get_running_loop()
+        with cls._shared_clients_lock:
+            client = cls._shared_clients.get(id(loop))
+            if client is None or client.is_closed:
+                client = httpx.AsyncClient(limits=cls.POOL_LIMITS, timeout=httpx.Timeout(None))
+                cls._shared_clients[id(loop)] = client
+            if not cls._shutdown_registered:
+                HttpSearchTask._shutdown_registered = True
+                app.on_shutdown(HttpSearchTask.close_shared_clients)
+        return client
+
+    @classmethod
+    async def close_shared_clients(cls) -> None:
+        """Close all pooled clients and their keep-alive connections."""
+        with cls._shared_clients_lock:
+            clients = list(cls._shared_clients.values())
+            cls._shared_clients.clear()
+        for client in clients:
+            if not client.is_closed:
+                await client.aclose()
+
+    @property
+    def publishes_partial_results(self) -> bool:
+        return True  # streamed elements are shown while they arrive
+
+    def cancel(self) -> None:
+        """Request cancellation of the task and abort the in-flight request."""
+        super().cancel()
+        request_task = self._request_task
+        if request_task is not None and not request_task.done() and self._loop is not None:
+            self._loop.call_soon_threadsafe(request_task.cancel)
+
+    async def execute_async(self):
+        """Send the request and publish the results while they are received."""
+        if self._query is None or self.is_cancelled:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._request_task = asyncio.ensure_future(self._fetch())
+        try:
+            await self._request_task
+        except asyncio.CancelledError:
+            if not self.is_cancelled:
+                raise
+        finally:
+            self._request_task = None
+
+    def build_request(self, client: httpx.AsyncClient) -> httpx.Request:
+        """Build the request for the current query.
+
+        Overwrite to customize how the query is passed to the server.
+        """
+        params = dict(self.params)
+        if self.limit_param and self.max_elements != -1:
+            params[self.limit_param] = self.max_elements
+        if self.method == 'GET':
+            params[self.query_param] = self._query
+            return client.build_request(self.method, self.url, params=params, headers=self.headers)
+        return client.build_request(self.method, self.url, params=params, headers=self.headers,
+                                    json={self.query_param: self._query})
+
+    def _add_decoded(self, values: list[Any]) -> bool:
+        """Add decoded values to the results.
+
+        :return: False if no more elements are required.
+        """
+        elements = []
+        for value in values:
+            if isinstance(value, dict) and self.result_key is not None and self.result_key in value:
+                found = value[self.result_key]
+                elements.extend(found if isinstance(found, list) else [found])
+            elif isinstance(value, list):
+                elements.extend(value)
+            else:
+                elements.append(value)
+        if self.transform:
+            elements = [self.transform(element) for element in elements]
+        self.total_elements += len(elements)
+        self.add_elements(elements)
+        return not self.more_elements
+
+    async def _fetch(self) -> None:
+        client = self._client or self.shared_client()
+        async with asyncio.timeout(self.timeout):
+            response = await client.send(self.build_request(client), stream=True)
+            try:
+                response.raise_for_status()
+                decoder = JsonStreamDecoder()
+                async for chunk in response.aiter_text():
+                    if self.is_cancelled:
+                        return
+                    if not self._add_decoded(decoder.feed(chunk)):
+                        return
+                self._add_decoded(decoder.close())
+            finally:
+                await response.aclose()
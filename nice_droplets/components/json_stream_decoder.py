@@ -0,0 +1,78 @@
+"""Incremental JSON decoding for streamed HTTP responses."""
+
+import json
+from typing import Any
+
+
+class JsonStreamDecoder:
+    """Decodes JSON values from a stream of text chunks as soon as they are complete.
+
+    Supports newline delimited JSON (one value per line), concatenated JSON values and a
+    single top-level JSON array whose elements are emitted one by one while the array is still being received.
+    """
+
+    def __init__(self):
+        self._decoder = json.JSONDecoder()
+        self._buffer = ''
+        self._in_array = False
+        self._started = False
+
+    def feed(self, chunk: str) -> list[Any]:
+        """Add a chunk of text and return all values which could be decoded completely.
+
+        :param chunk: The next piece of the response body.
+        :return: The values decoded from the buffered data, may be empty.
+        """
+        self._buffer += chunk
+        values: list[Any] = []
+        position = 0
+        length = len(self._buffer)
+        while position < length:
+            position = self._skip_separators(position)
+            if position >= length:
+                break
+            if not self._started:
+                self._started = True
+                if self._buffer[position] == '[':
+                    self._in_array = True
+                    position += 1
+                    continue
+            if self._in_array and self._buffer[position] == ']':
+                position += 1
+                continue
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, position)
+            except json.JSONDecodeError:
+                break  # incomplete value, wait for more data
+            if end >= length and isinstance(value, (int, float)) and not isinstance(value, bool):
+                break  # a trailing number might still continue in the next chunk
+            values.append(value)
+            position = end
+        self._buffer = self._buffer[position:]
+        return values
+
+    def close(self) -> list[Any]:
+        """Flush the remaining buffer at the end of the stream.
+
+        :return: The remaining decoded values.
+        :raises ValueError: If the stream ended with an incomplete value.
+        """
+        remaining = self._buffer.strip()
+        self._buffer = ''
+        if not remaining or remaining == ']':
+            return []
+        try:
+            return [json.loads(remaining)]
+        except json.JSONDecodeError as e:
+            raise ValueError(f'Incomplete JSON value at end of stream: {remaining[:50]!r}') from e
+
+    @property
+    def is_array(self) -> bool:
+        """True if the stream is a single top-level JSON array."""
+        return self._in_array
+
+    def _skip_separators(self, position: int) -> int:
+        separators = ' \t\r\n,' if self._in_array else ' \t\r\n'
+        while position < len(self._buffer) and self._buffer[position] in separators:
+            position += 1
+        return position
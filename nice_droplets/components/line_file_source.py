@@ -0,0 +1,267 @@
+"""Search source scanning large newline separated files through a memory map."""
+
+import mmap
+import os
+import re
+import struct
+import sys
+from array import array
+from bisect import bisect_right
+
+from .cancellation_token import CancellationToken
+from .ranking import Ranker
+from .search_task import SearchTask
+
+
+class LineFileIndex:
+    """Memory mapped newline separated file with a persisted index of its line start offsets.
+
+    The file and the index are mapped read-only, so multiple worker processes share the operating system's
+    page cache instead of each holding a copy of the data. The index is stored next to the file
+    (``<path>.idx`` by default) and rebuilt automatically if the file changed.
+    """
+
+    MAGIC = b'NDLIDX01'
+    _HEADER = struct.Struct('<8sQQQB7x')  # magic, file size, modification time, line count, byte order
+
+    def __init__(self, path: str, *, index_path: str | None = None, encoding: str = 'utf-8'):
+        """Open the file and load or build its offset index.
+
+        :param path: The path of the newline separated file.
+        :param index_path: The path of the persisted offset index, defaults to the file path with the suffix .idx.
+        :param encoding: The encoding used to decode matching lines.
+        """
+        self.path = path
+        self.index_path = index_path or path + '.idx'
+        self.encoding = encoding
+        self._file = open(path, 'rb')
+        self._size = os.fstat(self._file.fileno()).st_size
+        self._data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if self._size else b''
+        self._index_file = None
+        self._index_map: mmap.mmap | None = None
+        offsets = self._load_index()
+        self._offsets: memoryview | array = offsets if offsets is not None else self._build_index()
+
+    def __len__(self) -> int:
+        return len(self._offsets)
+
+    @property
+    def data(self) -> mmap.mmap | bytes:
+        """The raw, memory mapped file content."""
+        return self._data
+
+    def line_span(self, line: int) -> tuple[int, int]:
+        """Get the byte range of a line without its line break."""
+        start = self._offsets[line]
+        end = self._offsets[line + 1] - 1 if line + 1 < len(self._offsets) else self._size
+        if end == self._size and end > start and self._data[end - 1:end] == b'\n':
+            end -= 1
+        if end > start and self._data[end - 1:end] == b'\r':
+            end -= 1
+        return start, end
+
+    def line_bytes(self, line: int) -> bytes:
+        """Get the raw bytes of a line."""
+        start, end = self.line_span(line)
+        return self._data[start:end]
+
+    def line(self, line: int) -> str:
+        """Get a decoded line."""
+        return self.line_bytes(line).decode(self.encoding, errors='replace')
+
+    def line_at(self, position: int) -> int:
+        """Get the number of the line containing the given byte position."""
+        return bisect_right(self._offsets, position) - 1
+
+    def close(self) -> None:
+        """Release the memory maps and files."""
+        if isinstance(self._offsets, memoryview):
+            self._offsets.release()
+        if self._index_map is not None:
+            self._index_map.close()
+            self._index_file.close()
+        if isinstance(self._data, mmap.mmap):
+            self._data.close()
+        self._file.close()
+
+    def _signature(self) -> tuple[int, int]:
+        stat = os.fstat(self._file.fileno())
+        return stat.st_size, stat.st_mtime_ns
+
+    def _load_index(self) -> memoryview | None:
+        """Map a previously persisted index if it matches the current file."""
+        try:
+            index_file = open(self.index_path, 'rb')
+        except OSError:
+            return None
+        try:
+            header = index_file.read(self._HEADER.size)
+            if len(header) < self._HEADER.size:
+                raise ValueError('truncated index')
+            magic, size, mtime, count, little_endian = self._HEADER.unpack(header)
+            if magic != self.MAGIC or (size, mtime) != self._signature() or little_endian != (sys.byteorder == 'little'):
+                raise ValueError('outdated index')
+            if count == 0:
+                index_file.close()
+                return memoryview(array('Q'))
+            index_map = mmap.mmap(index_file.fileno(), 0, access=mmap.ACCESS_READ)
+            if len(index_map) < self._HEADER.size + count * 8:
+                index_map.close()
+                raise ValueError('truncated index')
+        except ValueError:
+            index_file.close()
+            return None
+        self._index_file = index_file
+        self._index_map = index_map
+        return memoryview(index_map)[self._HEADER.size:self._HEADER.size + count * 8].cast('Q')
+
+    def _build_index(self) -> array:
+        """Scan the file for line breaks and persist the resulting offsets."""
+        offsets = array('Q')
+        if self._size:
+            offsets.append(0)
+            find = self._data.find
+            position = find(b'\n')
+            while position != -1 and position + 1 < self._size:
+                offsets.append(position + 1)
+                position = find(b'\n', position + 1)
+        size, mtime = self._signature()
+        header = self._HEADER.pack(self.MAGIC, size, mtime, len(offsets), sys.byteorder == 'little')
+        temp_path = f'{self.index_path}.{os.getpid()}.tmp'
+        try:
+            with open(temp_path, 'wb') as f:
+                f.write(header)
+                offsets.tofile(f)
+            os.replace(temp_path, self.index_path)
+        except OSError:
+            pass  # the index stays in memory only, e.g. if the directory is read-only
+        return offsets
+
+
+class LineFileSource:
+    """Search source for multi-GB newline separated files such as SKU or token lists.
+
+    Matching happens directly on the memory mapped bytes, only lines containing a hit are decoded.
+    Pass an instance as search task factory, e.g. ``Typeahead(on_search=LineFileSource('skus.txt'))``.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        *,
+        index_path: str | None = None,
+        encoding: str = 'utf-8',
+        mode: str = 'contains',
+        case_sensitive: bool = False,
+        max_elements: int = 50,
+        window_size: int = 1 << 20,
+        ranker: Ranker | None = None,
+        max_candidates: int = 1000,
+    ):
+        """Initialize the source.
+
+        :param path: The path of the newline separated file.
+        :param index_path: The path of the persisted offset index, defaults to the file path with the suffix .idx.
+        :param encoding: The encoding of the file.
+        :param mode: 'contains' scans the whole file for the query, 'prefix' binary searches a file whose lines
+            are sorted by their bytes (case-sensitive only).
+        :param case_sensitive: Whether the 'contains' mode distinguishes upper and lower case. Non-ASCII characters
+            are matched in their simple upper and lower case forms, e.g. "Ä" and "ä", but not in their case folded
+            forms, e.g. "ß" does not match "ss".
+        :param max_elements: The maximum number of lines to return per query.
+        :param window_size: The number of bytes scanned between two cancellation checks.
+        :param ranker: Optional ranker returning the best instead of the first max_elements lines. It ranks up to
+            max_candidates matching lines, the term statistics are computed from them unless the ranker was fitted.
+        :param max_candidates: The maximum number of matching lines collected for the ranker.
+        """
+        if mode not in ('contains', 'prefix'):
+            raise ValueError(f"Unknown mode {mode!r}, use 'contains' or 'prefix'")
+        self.index = LineFileIndex(path, index_path=index_path, encoding=encoding)
+        self.mode = mode
+        self.case_sensitive = case_sensitive
+        self.max_elements = max_elements
+        self.window_size = window_size
+        self.ranker = ranker
+        self.max_candidates = max_candidates
+
+    def __call__(self, query: str) -> SearchTask:
+        return SearchTask(self.search, query, max_elements=self.max_elements, with_token=True, ranker=self.ranker)
+
+    def search(self, query: str, token: CancellationToken | None = None) -> list[str]:
+        """Find the lines matching the query.
+
+        :param query: The query string.
+        :param token: Optional token of the running task, the search stops once it is cancelled.
+        """
+        needle = query.encode(self.index.encoding)
+        if not needle or not len(self.index):
+            return []
+        if self.max_elements == -1:
+            limit = -1
+        else:
+            # one more than max_elements tells the task that more exist, a ranker has to see even more than the
+            # first matches, the task keeps the best max_elements of them
+            limit = self.max_elements + 1 if self.ranker is None else max(self.max_elements + 1, self.max_candidates)
+        if self.mode == 'prefix':
+            return self._search_prefix(needle, limit)
+        return self._search_contains(self._pattern(query), token, limit)
+
+    def close(self) -> None:
+        """Release the memory mapped file."""
+        self.index.close()
+
+    def _pattern(self, query: str) -> re.Pattern[bytes]:
+        """Compile the byte pattern of the 'contains' mode.
+
+        re.IGNORECASE only folds ASCII bytes, so other characters are matched as alternatives of their encoded
+        upper and lower case forms.
+        """
+        encoding = self.index.encoding
+        if self.case_sensitive or query.isascii():
+            return re.compile(re.escape(query.encode(encoding)), 0 if self.case_sensitive else re.IGNORECASE)
+        parts = []
+        for char in query:
+            forms = dict.fromkeys((char, char.lower(), char.upper()))
+            variants = [re.escape(form.encode(encoding)) for form in forms]
+            parts.append(variants[0] if len(variants) == 1 else b'(?:' + b'|'.join(variants) + b')')
+        return re.compile(b''.join(parts), re.IGNORECASE)
+
+    def _search_contains(self, pattern: re.Pattern[bytes], token: CancellationToken | None, limit: int) -> list[str]:
+        index = self.index
+        data = index.data
+        size = len(data)
+        results: list[str] = []
+        position = 0
+        while position < size and (limit == -1 or len(results) < limit):
+            if token is not None and token.is_cancelled:
+                break
+            # scan windows ending at a line break, a query can not span lines so no match is missed
+            window_end = data.find(b'\n', min(position + self.window_size, size))
+            window_end = size if window_end == -1 else window_end
+            match = pattern.search(data, position, window_end)
+            if match is None:
+                position = window_end + 1
+                continue
+            line = index.line_at(match.start())
+            results.append(index.line(line))
+            position = index.line_span(line)[1] + 1
+        return results
+
+    def _search_prefix(self, needle: bytes, limit: int) -> list[str]:
+        index = self.index
+        low, high = 0, len(index)
+        while low < high:  # find the first line not smaller than the prefix
+            middle = (low + high) // 2
+            if index.line_bytes(middle) < needle:
+                low = middle + 1
+            else:
+                high = middle
+        results: list[str] = []
+        line = low
+        while line < len(index) and (limit == -1 or len(results) < limit):
+            raw = index.line_bytes(line)
+            if not raw.startswith(needle):
+                break
+            results.append(raw.decode(index.encoding, errors='replace'))
+            line += 1
+        return results
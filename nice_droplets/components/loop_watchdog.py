@@ -0,0 +1,149 @@
+"""Watchdog measuring the lag of the event loop and attributing stalls to the code blocking it."""
+
+import asyncio
+import logging
+import os
+import sys
+import sysconfig
+import threading
+import time
+import traceback
+from collections import Counter, deque
+from dataclasses import dataclass, field
+from types import FrameType
+
+from nicegui import app
+
+from .metrics import metrics
+from .task import Task
+
+logger = logging.getLogger(__name__)
+
+_LIBRARY_PATHS = tuple({sysconfig.get_paths()['stdlib'], sysconfig.get_paths()['purelib'],
+                        os.path.dirname(asyncio.__file__), os.path.abspath(__file__)})
+
+
+@dataclass
+class Stall:
+    """A period in which the event loop did not process callbacks."""
+    started: float
+    duration: float = 0.0
+    culprit: str = 'unknown'
+    samples: list[str] = field(default_factory=list)
+    culprits: Counter = field(default_factory=Counter)
+
+
+class LoopWatchdog:
+    """Measures the lag of the event loop continuously and samples its stack while it is blocked.
+
+    A heartbeat coroutine observes its scheduling delay as ``event_loop.lag``. A watcher thread samples the stack
+    of the loop thread once the last heartbeat is older than the threshold and attributes the stall to the
+    innermost search task or list factory on the stack, otherwise to the innermost application function,
+    e.g. an event handler. Stalls are reported as ``event_loop.stalls`` and ``event_loop.stall_duration``
+    labelled with the culprit, and the most recent ones are kept in stalls.
+
+    The watchdog is opt-in, call ``LoopWatchdog().install()`` before ``ui.run()``.
+    """
+
+    def __init__(self, interval: float = 0.05, threshold: float = 0.1, max_samples: int = 5, history: int = 50):
+        """Initialize the watchdog.
+
+        :param interval: The time in seconds between two heartbeats.
+        :param threshold: The lag in seconds above which the loop is considered stalled.
+        :param max_samples: The maximum number of stack samples taken per stall.
+        :param history: The number of recent stalls kept.
+        """
+        self.interval = interval
+        self.threshold = threshold
+        self.max_samples = max_samples
+        self.stalls: deque[Stall] = deque(maxlen=history)
+        self._last_beat = 0.0
+        self._loop_thread_id: int | None = None
+        self._heartbeat: asyncio.Task | None = None
+        self._watcher: threading.Thread | None = None
+        self._running = False
+
+    def install(self) -> 'LoopWatchdog':
+        """Start the watchdog with the app and stop it on shutdown."""
+        app.on_startup(self.start)
+        app.on_shutdown(self.stop)
+        return self
+
+    def start(self) -> None:
+        """Start watching the running event loop."""
+        if self._running:
+            return
+        self._running = True
+        self._loop_thread_id = threading.get_ident()
+        self._last_beat = time.monotonic()
+        self._heartbeat = asyncio.get_running_loop().create_task(self._beat())
+        self._watcher = threading.Thread(target=self._watch, name='nd-loop-watchdog', daemon=True)
+        self._watcher.start()
+
+    def stop(self) -> None:
+        """Stop watching."""
+        self._running = False
+        if self._heartbeat is not None:
+            self._heartbeat.cancel()
+            self._heartbeat = None
+
+    async def _beat(self) -> None:
+        while self._running:
+            expected = time.monotonic() + self.interval
+            await asyncio.sleep(self.interval)
+            now = time.monotonic()
+            self._last_beat = now
+            metrics.observe('event_loop.lag', max(0.0, now - expected))
+
+    def _watch(self) -> None:
+        stall: Stall | None = None
+        while self._running:
+            time.sleep(min(self.interval, self.threshold / 2))
+            beat = self._last_beat
+            if time.monotonic() - beat > self.threshold:
+                if stall is None or stall.started != beat:
+                    if stall is not None:
+                        self._report(stall, beat)
+                    stall = Stall(started=beat)
+                if len(stall.samples) < self.max_samples:
+                    self._sample(stall)
+            elif stall is not None:
+                self._report(stall, beat)
+                stall = None
+
+    def _sample(self, stall: Stall) -> None:
+        frame = sys._current_frames().get(self._loop_thread_id)
+        if frame is None:
+            return
+        stall.samples.append(''.join(traceback.format_stack(frame)))
+        stall.culprits[culprit_of(frame)] += 1
+        stall.culprit = stall.culprits.most_common(1)[0][0]
+
+    def _report(self, stall: Stall, next_beat: float) -> None:
+        stall.duration = max(0.0, next_beat - stall.started - self.interval)
+        self.stalls.append(stall)
+        metrics.increment('event_loop.stalls', culprit=stall.culprit)
+        metrics.observe('event_loop.stall_duration', stall.duration, culprit=stall.culprit)
+        logger.warning('event loop blocked for %.3fs by %s\n%s', stall.duration, stall.culprit,
+                       stall.samples[0] if stall.samples else '')
+
+
+def culprit_of(frame: FrameType) -> str:
+    """Describe the task, factory or function responsible for the code running in a frame."""
+    from nice_droplets.factories import FlexListFactory  # imported late as the factories depend on the components
+
+    application_frame: FrameType | None = None
+    current: FrameType | None = frame
+    while current is not None:
+        owner = current.f_locals.get('self')
+        if isinstance(owner, Task):
+            return f'task:{type(owner).__name__}'
+        if isinstance(owner, FlexListFactory):
+            return f'factory:{type(owner).__name__}'
+        if application_frame is None and not current.f_code.co_filename.startswith(_LIBRARY_PATHS):
+            application_frame = current
+        current = current.f_back
+    if application_frame is None:
+        return 'unknown'
+    code = application_frame.f_code
+    return f'handler:{code.co_name} ({os.path.basename(code.co_filename)}:{application_frame.f_lineno})'
@@ -0,0 +1,108 @@
+"""Lightweight in-process metrics shared by the NiceDroplets components."""
+
+from collections import deque
+from threading import Lock
+from typing import Any
+
+MetricKey = tuple[str, tuple[tuple[str, Any], ...]]
+
+
+def _make_key(name: str, labels: dict[str, Any]) -> MetricKey:
+    return name, tuple(sorted(labels.items()))
+
+
+def _format_key(key: MetricKey) -> str:
+    name, labels = key
+    if not labels:
+        return name
+    return name + '{' + ','.join(f'{label}={value}' for label, value in labels) + '}'
+
+
+class Metrics:
+    """Thread-safe registry of counters, gauges and sample distributions.
+
+    Every metric is identified by a name and optional labels, e.g. ``metrics.increment('search.errors', source='db')``.
+    """
+
+    def __init__(self, max_samples: int = 1000):
+        """Initialize the registry.
+
+        :param max_samples: The number of most recent samples kept per distribution.
+        """
+        self._lock = Lock()
+        self._max_samples = max_samples
+        self._counters: dict[MetricKey, float] = {}
+        self._gauges: dict[MetricKey, float] = {}
+        self._samples: dict[MetricKey, deque[float]] = {}
+
+    def increment(self, name: str, value: float = 1, **labels: Any) -> None:
+        """Increase a counter."""
+        key = _make_key(name, labels)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def set_gauge(self, name: str, value: float, **labels: Any) -> None:
+        """Set a gauge to its current value."""
+        with self._lock:
+            self._gauges[_make_key(name, labels)] = value
+
+    def observe(self, name: str, value: float, **labels: Any) -> None:
+        """Record a sample of a distribution such as a latency."""
+        key = _make_key(name, labels)
+        with self._lock:
+            samples = self._samples.get(key)
+            if samples is None:
+                samples = self._samples[key] = deque(maxlen=self._max_samples)
+            samples.append(value)
+
+    def counter(self, name: str, **labels: Any) -> float:
+        """Get the current value of a counter."""
+        with self._lock:
+            return self._counters.get(_make_key(name, labels), 0)
+
+    def gauge(self, name: str, **labels: Any) -> float | None:
+        """Get the current value of a gauge, None if it was never set."""
+        with self._lock:
+            return self._gauges.get(_make_key(name, labels))
+
+    def percentile(self, name: str, percentile: float, **labels: Any) -> float | None:
+        """Get a percentile (0-100) of the recorded samples, None if there are none."""
+        with self._lock:
+            samples = sorted(self._samples.get(_make_key(name, labels), ()))
+        if not samples:
+            return None
+        index = min(len(samples) - 1, max(0, round(percentile / 100 * (len(samples) - 1))))
+        return samples[index]
+
+    def snapshot(self) -> dict[str, Any]:
+        """Get a copy of all metrics with their labels rendered into the keys.
+
+        Distributions are summarized by count, mean, p50, p90 and p99.
+        """
+        with self._lock:
+            counters = {_format_key(key): value for key, value in self._counters.items()}
+            gauges = {_format_key(key): value for key, value in self._gauges.items()}
+            samples = {_format_key(key): sorted(values) for key, values in self._samples.items()}
+        distributions = {}
+        for key, values in samples.items():
+            if not values:
+                continue
+            distributions[key] = {
+                'count': len(values),
+                'mean': sum(values) / len(values),
+                'p50': values[round(0.5 * (len(values) - 1))],
+                'p90': values[round(0.9 * (len(values) - 1))],
+                'p99': values[round(0.99 * (len(values) - 1))],
+            }
+        return {'counters': counters, 'gauges': gauges, 'distributions': distributions}
+
+    def reset(self) -> None:
+        """Remove all recorded values."""
+        with self._lock:
+            self._counters.clear()
+            self._gauges.clear()
+            self._samples.clear()
+
+
+metrics = Metrics()
+"""The default registry used by all components."""
@@ -0,0 +1,70 @@
+"""Text normalization shared by indexing, ranking and querying."""
+
+import re
+import unicodedata
+from functools import lru_cache
+
+
+class Normalizer:
+    """Configurable normalization pipeline: Unicode normalization, case folding, diacritic stripping and tokenizing.
+
+    Sources apply the same normalizer once to their records at ingest and once to each query, so that e.g.
+    "Größe", "GROSSE" and "große" all match. Pure ASCII text takes a fast path, as only its case needs folding.
+    """
+
+    def __init__(
+        self,
+        *,
+        form: str | None = 'NFKC',
+        casefold: bool = True,
+        strip_diacritics: bool = True,
+        token_pattern: str = r'\w+',
+        cache_size: int = 1024,
+    ):
+        """Initialize the normalizer.
+
+        :param form: The Unicode normalization form applied first, None to skip it.
+        :param casefold: Whether to fold the case, e.g. "Straße" becomes "strasse".
+        :param strip_diacritics: Whether to remove accents and other combining marks, e.g. "café" becomes "cafe".
+        :param token_pattern: The regular expression matching a single token.
+        :param cache_size: The number of recent queries whose keys are cached.
+        """
+        self.form = form
+        self.casefold = casefold
+        self.strip_diacritics = strip_diacritics
+        self._token_pattern = re.compile(token_pattern)
+        self.key = lru_cache(maxsize=cache_size)(self._key)
+
+    def normalize(self, text: str) -> str:
+        """Normalize a text."""
+        if text.isascii():
+            return text.lower() if self.casefold else text
+        if self.form:
+            text = unicodedata.normalize(self.form, text)
+        if self.casefold:
+            text = text.casefold()
+        if self.strip_diacritics:
+            decomposed = unicodedata.normalize('NFD', text)
+            text = unicodedata.normalize('NFC', ''.join(char for char in decomposed if not unicodedata.combining(char)))
+        return text
+
+    def split(self, normalized: str) -> list[str]:
+        """Split an already normalized text into tokens."""
+        return self._token_pattern.findall(normalized)
+
+    def tokenize(self, text: str) -> list[str]:
+        """Normalize a text and split it into tokens."""
+        return self.split(self.normalize(text))
+
+    def _key(self, query: str) -> str:
+        """The canonical form of a query with collapsed whitespace, used as key of caches and shared searches."""
+        return ' '.join(self.normalize(query).split())
+
+
+default_normalizer = Normalizer()
+"""The normalizer used by all sources unless another one is passed."""
+
+
+def tokenize(text: str) -> list[str]:
+    """Split a text into normalized word tokens, see Normalizer."""
+    return default_normalizer.tokenize(text)
@@ -0,0 +1,204 @@
+"""Relevance ranking of search results."""
+
+import heapq
+import itertools
+import math
+from bisect import bisect_left
+from collections.abc import Mapping
+from typing import TYPE_CHECKING, Any, Callable, Iterable
+
+from .normalization import Normalizer, default_normalizer
+
+if TYPE_CHECKING:
+    from .search_task import SearchTask
+
+
+class Ranker:
+    """Ranks search results by relevance and selects the best k of them.
+
+    Each field of a record contributes its BM25 score for the query tokens, increased by boosts for exact matches,
+    prefix matches and matches at word boundaries, multiplied by the weight of the field.
+    Selection uses a bounded heap, so ranking k of n results costs O(n log k) instead of sorting all of them.
+
+    Assign a ranker to a SearchTask (``SearchTask(..., ranker=Ranker())``) or wrap any task factory
+    with ``ranker.apply_to(on_search)`` so that max_elements returns the best instead of the first results.
+    Call fit with the whole dataset once. Otherwise the term statistics are recomputed from the results
+    of every task.
+    """
+
+    def __init__(
+        self,
+        fields: dict[str, float] | None = None,
+        *,
+        k1: float = 1.2,
+        b: float = 0.75,
+        exact_boost: float = 3.0,
+        prefix_boost: float = 2.0,
+        word_boost: float = 1.0,
+        field_fn: Callable[[Any], dict[str, str]] | None = None,
+        normalizer: Normalizer | None = None,
+    ):
+        """Initialize the ranker.
+
+        :param fields: The searchable fields of dict or object records and their weights.
+            By default all string values of dicts are used with a weight of 1, other records are converted using str().
+        :param k1: The BM25 term frequency saturation.
+        :param b: The BM25 field length normalization.
+        :param exact_boost: Score added if a field equals the query.
+        :param prefix_boost: Score added if a field starts with the query.
+        :param word_boost: Score added per query token which starts a word of a field.
+        :param field_fn: Optional function returning the searchable fields of a record, overrides fields.
+        :param normalizer: The normalizer applied to fields and queries, should be the one of the source.
+        """
+        self.fields = fields
+        self.k1 = k1
+        self.b = b
+        self.exact_boost = exact_boost
+        self.prefix_boost = prefix_boost
+        self.word_boost = word_boost
+        self._field_fn = field_fn
+        self.normalizer = normalizer or default_normalizer
+        self._statistics: _TermStatistics | None = None
+        self._normalized: dict[Any, dict[str, tuple[str, list[str]]]] = {}
+        self._fitted_records: list[Any] = []
+
+    def fields_of(self, record: Any) -> dict[str, str]:
+        """Get the searchable fields of a record."""
+        if self._field_fn is not None:
+            return self._field_fn(record)
+        if isinstance(record, str):
+            return {'': record}
+        if self.fields is None:
+            if isinstance(record, Mapping):
+                return {key: value for key, value in record.items() if isinstance(value, str)}
+            return {'': str(record)}
+        if isinstance(record, Mapping):
+            return {name: str(record[name]) for name in self.fields if record.get(name) is not None}
+        return {name: str(getattr(record, name)) for name in self.fields if getattr(record, name, None) is not None}
+
+    def normalized_fields(self, record: Any) -> dict[str, tuple[str, list[str]]]:
+        """Get the normalized text and tokens of each searchable field of a record.
+
+        The fields of records passed to fit are normalized only once, others on every call.
+        """
+        fields = self._normalized.get(_cache_key(record)) if self._normalized else None
+        if fields is None:
+            fields = {}
+            for name, text in self.fields_of(record).items():
+                normalized = self.normalizer.normalize(text)
+                fields[name] = (normalized, self.normalizer.split(normalized))
+        return fields
+
+    def fit(self, records: Iterable[Any]) -> 'Ranker':
+        """Collect the term statistics of the whole dataset and normalize the fields of its records once.
+
+        Without fitting, the statistics are computed from the results of each query and every field is normalized
+        on every query, so sources ranking large datasets should call fit once at ingest.
+        """
+        self._normalized = {}
+        self._fitted_records = list(records)  # keeps the records alive, so their ids stay unique
+        fields = [self.normalized_fields(record) for record in self._fitted_records]
+        self._normalized = {_cache_key(record): record_fields
+                            for record, record_fields in zip(self._fitted_records, fields)}
+        self._statistics = _TermStatistics(fields)
+        return self
+
+    def score(self, record: Any, query: str) -> float:
+        """Compute the relevance of a record for a query."""
+        return self._scores([record], query)[0] if self.normalizer.tokenize(query) else 0.0
+
+    def top_k(self, records: list[Any], query: str | None, k: int = -1) -> list[Any]:
+        """Get the k most relevant records, ordered by relevance. Ties keep the order of the source.
+
+        :param records: The records to rank.
+        :param query: The query the records were found for.
+        :param k: The number of records to return, -1 to rank all of them.
+        """
+        if not records or not self.normalizer.tokenize(query or ''):
+            return list(records if k == -1 else records[:k])
+        scored = ((score, -index) for index, score in enumerate(self._scores(records, query)))
+        if k == -1 or k >= len(records):
+            best = sorted(scored, reverse=True)
+        else:
+            best = heapq.nlargest(k, scored)
+        return [records[-negative_index] for _, negative_index in best]
+
+    def apply_to(self, on_search: Callable[[str], 'SearchTask']) -> Callable[[str], 'SearchTask']:
+        """Wrap a search task factory so all of its tasks rank their results.
+
+        The ranker only sees the results the source returns. Sources which cut their matches to max_elements,
+        such as LineFileSource and SearchIndexSource, take the ranker as parameter instead.
+        """
+        def create_task(query: str) -> 'SearchTask':
+            task = on_search(query)
+            task.ranker = self
+            return task
+        return create_task
+
+    def _scores(self, records: list[Any], query: str) -> list[float]:
+        fields = [self.normalized_fields(record) for record in records]
+        statistics = self._statistics or _TermStatistics(fields)
+        normalized_query = self.normalizer.normalize(query.strip())
+        query_tokens = self.normalizer.split(normalized_query)
+        idfs = [statistics.idf(query_token) for query_token in query_tokens]
+        return [self._score(record_fields, normalized_query, query_tokens, idfs, statistics)
+                for record_fields in fields]
+
+    def _score(self, fields: dict[str, tuple[str, list[str]]], query: str, query_tokens: list[str],
+               idfs: list[float], statistics: '_TermStatistics') -> float:
+        total = 0.0
+        for name, (normalized, tokens) in fields.items():
+            weight = 1.0 if self.fields is None else self.fields.get(name, 1.0)
+            score = 0.0
+            if normalized == query:
+                score += self.exact_boost
+            elif normalized.startswith(query):
+                score += self.prefix_boost
+            length_norm = 1 - self.b + self.b * len(tokens) / (statistics.average_lengths.get(name) or 1.0)
+            for query_token, idf in zip(query_tokens, idfs):
+                matching = sum(1 for token in tokens if token.startswith(query_token))
+                if matching:
+                    score += self.word_boost
+                    score += idf * matching * (self.k1 + 1) / (matching + self.k1 * length_norm)
+            total += weight * score
+        return total
+
+
+class _TermStatistics:
+    """Document frequencies and average field lengths of a set of records."""
+
+    def __init__(self, records_fields: Iterable[dict[str, tuple[str, list[str]]]]):
+        frequencies: dict[str, int] = {}
+        lengths: dict[str, int] = {}
+        self.count = 0
+        for fields in records_fields:
+            self.count += 1
+            terms = set()
+            for name, (_, tokens) in fields.items():
+                lengths[name] = lengths.get(name, 0) + len(tokens)
+                terms.update(tokens)
+            for term in terms:
+                frequencies[term] = frequencies.get(term, 0) + 1
+        self.average_lengths = {name: total / self.count for name, total in lengths.items()}
+        self._terms = sorted(frequencies)
+        self._cumulative = [0, *itertools.accumulate(frequencies[term] for term in self._terms)]
+
+    def idf(self, prefix: str) -> float:
+        """The inverse document frequency of the terms starting with the prefix.
+
+        The frequencies of all matching terms are summed up, which overestimates the number of documents
+        containing several of them, but takes only two binary searches.
+        """
+        first = bisect_left(self._terms, prefix)
+        last = bisect_left(self._terms, prefix + '\U0010ffff', first)
+        frequency = min(self.count, self._cumulative[last] - self._cumulative[first])
+        return math.log(1 + (self.count - frequency + 0.5) / (frequency + 0.5))
+
+
+def _cache_key(record: Any) -> Any:
+    """Key of the normalized fields of a record, records which are not hashable are identified by their id"""
+    try:
+        hash(record)
+    except TypeError:
+        return (_cache_key, id(record))
+    return record
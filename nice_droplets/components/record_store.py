@@ -0,0 +1,174 @@
+"""Compact columnar storage for large in-memory lists of records."""
+
+from array import array
+from collections.abc import Iterable, Iterator, Mapping
+from typing import Any, overload
+
+
+class RecordView(Mapping):
+    """Lazy read-only view of a single row of a RecordStore.
+
+    Behaves like a dict of the row, so factories, rankers and to_string callbacks can read its values,
+    but the values stay in the columns of the store until accessed.
+    """
+
+    __slots__ = ('_store', '_index')
+
+    def __init__(self, store: 'RecordStore', index: int):
+        self._store = store
+        self._index = index
+
+    @property
+    def index(self) -> int:
+        """The row number within the store."""
+        return self._index
+
+    def __getitem__(self, key: str) -> Any:
+        column = self._store._columns.get(key)
+        if column is None:
+            raise KeyError(key)
+        value = column[self._index]
+        if value is None and self._index in self._store._missing.get(key, ()):
+            raise KeyError(key)
+        return value
+
+    def __iter__(self) -> Iterator[str]:
+        missing = self._store._missing
+        return (name for name in self._store._columns if self._index not in missing.get(name, ()))
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __getattr__(self, name: str) -> Any:
+        # allows attribute access such as item.disabled, as for dataclass records
+        if name.startswith('_'):
+            raise AttributeError(name)
+        try:
+            return self[name]
+        except KeyError:
+            raise AttributeError(name) from None
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, RecordView):
+            return self._store is other._store and self._index == other._index
+        return super().__eq__(other)
+
+    def __hash__(self) -> int:
+        return hash((id(self._store), self._index))
+
+    def __repr__(self) -> str:
+        return repr(self.to_dict())
+
+    def to_dict(self) -> dict[str, Any]:
+        """Materialize the row as dict, e.g. for a table row."""
+        return dict(self.items())
+
+
+class RecordStore:
+    """Stores records column by column instead of as one dict per record.
+
+    Integer and float columns are kept in typed arrays, all others in lists, and the strings of the columns
+    passed as intern, e.g. categories, are shared between rows. Indexing and iterating return RecordView objects
+    which read the columns lazily, so search results only hold a reference to the store and their row number.
+
+    Usage: ``products = RecordStore.from_dicts(records, intern=['category'])``
+    """
+
+    def __init__(self, columns: Iterable[str], *, intern: Iterable[str] = ()):
+        """Initialize an empty store.
+
+        :param columns: The names of the columns.
+        :param intern: The names of the columns whose repeated string values are stored only once.
+        """
+        self._columns: dict[str, list[Any] | array] = {name: [] for name in columns}
+        self._intern = set(intern)
+        self._strings: dict[str, str] = {}
+        self._missing: dict[str, set[int]] = {}
+        self._length = 0
+
+    @classmethod
+    def from_dicts(cls, records: Iterable[Mapping[str, Any]], *, columns: Iterable[str] | None = None,
+                   intern: Iterable[str] = ()) -> 'RecordStore':
+        """Create a store from dicts, the columns default to the keys of all records in order of appearance.
+
+        Columns with only integers or only floats are converted to typed arrays.
+        """
+        records = records if isinstance(records, list) else list(records)
+        if columns is None:
+            columns = list(dict.fromkeys(key for record in records for key in record))
+        store = cls(columns, intern=intern)
+        store.extend(records)
+        store.compact()
+        return store
+
+    def __len__(self) -> int:
+        return self._length
+
+    @overload
+    def __getitem__(self, index: int) -> RecordView: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[RecordView]: ...
+
+    def __getitem__(self, index: int | slice) -> RecordView | list[RecordView]:
+        if isinstance(index, slice):
+            return [RecordView(self, i) for i in range(*index.indices(self._length))]
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError('record index out of range')
+        return RecordView(self, index)
+
+    def __iter__(self) -> Iterator[RecordView]:
+        return (RecordView(self, index) for index in range(self._length))
+
+    @property
+    def columns(self) -> list[str]:
+        return list(self._columns)
+
+    def column(self, name: str) -> list[Any] | array:
+        """Get the values of a column, e.g. to scan it without creating views. Do not modify it."""
+        return self._columns[name]
+
+    def views(self, indices: Iterable[int]) -> list[RecordView]:
+        """Get the views of the given rows, e.g. of the matches of a column scan."""
+        return [RecordView(self, index) for index in indices]
+
+    def append(self, record: Mapping[str, Any]) -> RecordView:
+        """Add a record, keys which are not a column of the store are ignored."""
+        index = self._length
+        for name, column in self._columns.items():
+            if name in record:
+                value = record[name]
+                if name in self._intern and isinstance(value, str):
+                    value = self._strings.setdefault(value, value)
+            else:
+                value = None
+                self._missing.setdefault(name, set()).add(index)
+            if isinstance(column, array):
+                try:
+                    column.append(value)
+                    continue
+                except (TypeError, OverflowError):
+                    column = self._columns[name] = column.tolist()
+            column.append(value)
+        self._length += 1
+        return RecordView(self, index)
+
+    def extend(self, records: Iterable[Mapping[str, Any]]) -> None:
+        for record in records:
+            self.append(record)
+
+    def compact(self) -> None:
+        """Convert complete columns consisting only of integers or only of floats to typed arrays."""
+        for name, column in self._columns.items():
+            if isinstance(column, array) or not column or self._missing.get(name):
+                continue
+            types = {type(value) for value in column}
+            if types == {int}:
+                try:
+                    self._columns[name] = array('q', column)
+                except OverflowError:
+                    pass
+            elif types == {float}:
+                self._columns[name] = array('d', column)
@@ -0,0 +1,231 @@
+"""Headless replay of recorded typeahead sessions against search sources.
+
+Usage: ``python -m nice_droplets.components.replay sessions.jsonl my_app.search:on_search --speed 2``
+"""
+
+import argparse
+import asyncio
+import importlib
+import json
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Sequence
+
+from .metrics import Metrics
+from .search_manager import SearchManager
+from .search_task import SearchTask
+from .session_recorder import RecordedSession, SessionRecorder
+
+
+@dataclass
+class ReplayReport:
+    """The outcome of replaying sessions.
+
+    :param executions: The number of search tasks which were executed, the other keystrokes were debounced.
+    :param completed: The number of keystrokes whose final results were rendered.
+    :param wasted: The number of executed tasks whose final results were never rendered because a newer query
+        superseded them.
+    :param renders: The number of result lists passed to the list, including partial results.
+    :param metrics: The distributions ``replay.latency``, the time in seconds from a keystroke to its final
+        results, and ``replay.first_render``, the time to its first, possibly partial, results.
+    """
+    sessions: int = 0
+    keystrokes: int = 0
+    hotkeys: int = 0
+    executions: int = 0
+    completed: int = 0
+    wasted: int = 0
+    renders: int = 0
+    errors: int = 0
+    metrics: Metrics = field(default_factory=lambda: Metrics(max_samples=1_000_000))
+
+    @property
+    def calls_saved(self) -> int:
+        """The number of keystrokes which did not cause a backend call."""
+        return self.keystrokes - self.executions
+
+    def percentile(self, percentile: float, name: str = 'replay.latency') -> float | None:
+        """Get a percentile (0-100) of the keystroke to final render latency or of another distribution."""
+        return self.metrics.percentile(name, percentile)
+
+    def summary(self) -> dict[str, Any]:
+        return {
+            'sessions': self.sessions, 'keystrokes': self.keystrokes, 'hotkeys': self.hotkeys,
+            'executions': self.executions, 'calls_saved': self.calls_saved, 'completed': self.completed,
+            'wasted': self.wasted,
+            'renders': self.renders, 'errors': self.errors,
+            'latency_p50': self.percentile(50), 'latency_p90': self.percentile(90), 'latency_p99': self.percentile(99),
+            'first_render_p50': self.percentile(50, 'replay.first_render'),
+            'first_render_p90': self.percentile(90, 'replay.first_render'),
+        }
+
+
+class _ReplayTimer:
+    """Stand-in for ui.timer running its callback on the replay's event loop"""
+
+    def __init__(self, interval: float, callback: Callable[[], Any], *, active: bool = True, once: bool = False):
+        self.interval = interval
+        self._callback = callback
+        self._once = once
+        self._generation = 0
+        self._runner: asyncio.Task | None = None
+        if active:
+            self.activate()
+
+    def activate(self) -> None:
+        """Start the timer, restarting its interval."""
+        self._generation += 1
+        self._runner = asyncio.ensure_future(self._run(self._generation))
+
+    def deactivate(self) -> None:
+        """Stop the timer, a running callback is completed."""
+        self._generation += 1
+        self._runner = None
+
+    def cancel(self) -> None:
+        self.deactivate()
+
+    async def _run(self, generation: int) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            if generation != self._generation:
+                return
+            result = self._callback()
+            if asyncio.iscoroutine(result):
+                await result
+            if self._once or generation != self._generation:
+                return
+
+
+class _ReplayHandler:
+    """Result handler recording what a search list would render and when"""
+
+    def __init__(self, report: ReplayReport):
+        self.report = report
+        self.keystroke: float | None = None
+        self.rendered = False
+
+    def begin(self) -> None:
+        """Start measuring the latency of a keystroke."""
+        self.keystroke = time.monotonic()
+        self.rendered = False
+
+    def on_search_started(self) -> None:
+        pass
+
+    def on_search_error(self, error: Exception) -> None:
+        self.report.errors += 1
+        self.keystroke = None
+
+    def on_search_results(self, results: Sequence[Any], view_models: list[Any] | None = None,
+                          fingerprint: str | None = None) -> None:
+        if self.keystroke is None:
+            return
+        self.report.renders += 1
+        if not self.rendered:
+            self.rendered = True
+            self.report.metrics.observe('replay.first_render', time.monotonic() - self.keystroke)
+
+    def on_search_completed(self) -> None:
+        if self.keystroke is None:
+            return
+        self.report.metrics.observe('replay.latency', time.monotonic() - self.keystroke)
+        self.report.completed += 1
+        self.keystroke = None
+
+
+class ReplayHarness:
+    """Replays recorded sessions headlessly through a real SearchManager and TaskExecutor.
+
+    NiceGUI's timers are replaced by timers on the replay's event loop, everything else is the code used by
+    SearchList: the debouncing, the cancellation of superseded tasks, the executors, the publishing of partial
+    results and the preparation of view models in the worker. So sources, caches and rankers can be
+    compared under realistic typing. The creation of elements is not measured.
+    """
+
+    def __init__(
+        self,
+        on_search: Callable[[str], SearchTask],
+        *,
+        debounce: float = 0.1,
+        poll_interval: float = 0.1,
+        min_chars: int = 1,
+        speed: float = 1.0,
+        view_model_fn: Callable[[list[Any]], list[Any]] | None = None,
+    ):
+        """Initialize the harness.
+
+        :param on_search: The search task factory to benchmark.
+        :param debounce: The debounce time in seconds, as passed to SearchList.
+        :param poll_interval: The interval in seconds in which results are polled.
+        :param min_chars: Minimum number of characters required to start a search.
+        :param speed: Factor by which the recorded timing is accelerated, 2 replays twice as fast.
+        :param view_model_fn: Optional function projecting the results into view models in the worker, e.g. a
+            factory's prepare_items, to include it in the latency.
+        """
+        self.on_search = on_search
+        self.debounce = debounce
+        self.poll_interval = poll_interval
+        self.min_chars = min_chars
+        self.speed = speed
+        self.view_model_fn = view_model_fn
+
+    def run(self, sessions: list[RecordedSession]) -> ReplayReport:
+        """Replay the sessions one after another."""
+        return asyncio.run(self.replay(sessions))
+
+    async def replay(self, sessions: list[RecordedSession]) -> ReplayReport:
+        report = ReplayReport()
+        for session in sessions:
+            await self._replay_session(session, report)
+        report.wasted = report.executions - report.completed - report.errors
+        return report
+
+    async def _replay_session(self, session: RecordedSession, report: ReplayReport) -> None:
+        report.sessions += 1
+        handler = _ReplayHandler(report)
+        manager = SearchManager(
+            on_search=self.on_search,
+            result_handler=handler,
+            min_chars=self.min_chars,
+            debounce=self.debounce,
+            poll_interval=self.poll_interval,
+            view_model_fn=self.view_model_fn,
+            timer=_ReplayTimer,
+        )
+        start = time.monotonic()
+        for event in session.events:
+            await asyncio.sleep(max(0.0, start + event.time / self.speed - time.monotonic()))
+            if event.kind != 'input':
+                report.hotkeys += 1
+                continue
+            report.keystrokes += 1
+            if len(event.value) < self.min_chars:  # SearchList clears its items without searching
+                handler.keystroke = None
+                continue
+            handler.begin()
+            manager.handle_search(event.value)
+        while manager.is_searching:
+            await asyncio.sleep(self.poll_interval)
+        report.executions += manager.task_executor.executions
+        manager.cleanup()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Replay recorded typeahead sessions against a search source.')
+    parser.add_argument('recording', help='JSON lines file written by SessionRecorder.save')
+    parser.add_argument('on_search', help='The search task factory as module:attribute')
+    parser.add_argument('--debounce', type=float, default=0.1)
+    parser.add_argument('--poll-interval', type=float, default=0.1)
+    parser.add_argument('--min-chars', type=int, default=1)
+    parser.add_argument('--speed', type=float, default=1.0)
+    arguments = parser.parse_args()
+    module_name, attribute = arguments.on_search.split(':')
+    on_search = getattr(importlib.import_module(module_name), attribute)
+    harness = ReplayHarness(on_search, debounce=arguments.debounce, poll_interval=arguments.poll_interval,
+                            min_chars=arguments.min_chars, speed=arguments.speed)
+    print(json.dumps(harness.run(SessionRecorder.load(arguments.recording)).summary(), indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,315 @@
+"""Resilience layer for slow or failing search backends."""
+
+import asyncio
+import time
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Callable, Sequence
+
+from .executors import executors
+from .metrics import metrics
+from .normalization import Normalizer, default_normalizer
+from .search_task import SearchTask
+
+
+class CircuitOpenError(Exception):
+    """Raised if a search is rejected because the circuit breaker of its source is open."""
+
+
+class CircuitBreaker:
+    """Stops calling a backend after repeated failures and probes it again after a cool-down period.
+
+    The breaker is closed while the backend is healthy. After failure_threshold consecutive
+    failures it opens and rejects all requests. Once reset_timeout elapsed it becomes half-open and
+    lets a single probe request through, which either closes or re-opens it.
+    """
+
+    CLOSED = 'closed'
+    HALF_OPEN = 'half_open'
+    OPEN = 'open'
+
+    _STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+    def __init__(self, name: str = 'default', *, failure_threshold: int = 5, reset_timeout: float = 10.0):
+        """Initialize the circuit breaker.
+
+        :param name: The name of the guarded source, used as metrics label.
+        :param failure_threshold: The number of consecutive failures after which the breaker opens.
+        :param reset_timeout: The time in seconds after which an open breaker lets a probe request through.
+        """
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._lock = Lock()
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_running = False
+        self._publish_state()
+
+    @property
+    def state(self) -> str:
+        """The current state, one of CLOSED, HALF_OPEN or OPEN."""
+        with self._lock:
+            if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+                return self.HALF_OPEN
+            return self._state
+
+    def allow_request(self) -> bool:
+        """Check if a request may be sent to the backend."""
+        with self._lock:
+            if self._state == self.CLOSED:
+                return True
+            if self._state == self.OPEN:
+                if time.monotonic() - self._opened_at < self.reset_timeout:
+                    return False
+                self._state = self.HALF_OPEN
+                self._probe_running = False
+                self._publish_state()
+            if self._probe_running:
+                return False
+            self._probe_running = True
+            return True
+
+    def record_success(self) -> None:
+        """Report a successful request."""
+        with self._lock:
+            self._failures = 0
+            self._probe_running = False
+            if self._state != self.CLOSED:
+                self._state = self.CLOSED
+                self._publish_state()
+
+    def release_probe(self) -> None:
+        """Let the next request probe the backend, e.g. because the probe was cancelled before reporting its outcome.
+
+        The state is not changed.
+        """
+        with self._lock:
+            self._probe_running = False
+
+    def record_failure(self) -> None:
+        """Report a failed or timed out request."""
+        with self._lock:
+            self._failures += 1
+            self._probe_running = False
+            if self._state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                if self._state != self.OPEN:
+                    metrics.increment('search.breaker_opened', source=self.name)
+                self._state = self.OPEN
+                self._opened_at = time.monotonic()
+                self._publish_state()
+
+    def _publish_state(self) -> None:
+        metrics.set_gauge('search.breaker_state', self._STATE_VALUES[self._state], source=self.name)
+
+
+class ResilientSearch:
+    """Wraps a search task factory with a deadline, a circuit breaker and a stale-while-revalidate cache.
+
+    Pass an instance wherever a search task factory is expected, e.g. ``Typeahead(on_search=ResilientSearch(...))``.
+    The last good results of the query or of its nearest cached prefix are published immediately
+    while the backend is queried. If the backend fails, times out or its breaker is open,
+    the stale results stay visible instead of an empty list.
+
+    Queries are identified by their normalized form, see Normalizer.key. Tasks for the same normalized query,
+    e.g. of different clients, share a single backend search while it is running.
+
+    The following metrics are recorded with the label ``source``: ``search.breaker_state`` (0 closed, 1 half-open,
+    2 open), ``search.breaker_opened``, ``search.timeouts``, ``search.errors``, ``search.rejected``,
+    ``search.stale_served``, ``search.fallbacks`` and ``search.coalesced``.
+    """
+
+    def __init__(
+        self,
+        on_search: Callable[[str], SearchTask],
+        *,
+        name: str = 'default',
+        deadline: float = 2.0,
+        failure_threshold: int = 5,
+        reset_timeout: float = 10.0,
+        cache_size: int = 256,
+        min_prefix_length: int = 1,
+        normalizer: Normalizer | None = None,
+    ):
+        """Initialize the resilient search.
+
+        :param on_search: The function creating the search task of the wrapped source.
+        :param name: The name of the source, used as metrics label.
+        :param deadline: The maximum time in seconds a search may take before it counts as failed.
+        :param failure_threshold: The number of consecutive failures after which the circuit breaker opens.
+        :param reset_timeout: The time in seconds after which the open breaker lets a probe request through.
+        :param cache_size: The number of queries whose last good results are kept.
+        :param min_prefix_length: The minimum length of a query prefix used as stale fallback.
+        :param normalizer: The normalizer producing the cache and sharing keys of queries.
+        """
+        self._on_search = on_search
+        self.name = name
+        self.deadline = deadline
+        self.breaker = CircuitBreaker(name, failure_threshold=failure_threshold, reset_timeout=reset_timeout)
+        self._cache_size = cache_size
+        self._min_prefix_length = min_prefix_length
+        self._cache: OrderedDict[str, tuple[Any, ...]] = OrderedDict()
+        self._cache_lock = Lock()
+        self.normalizer = normalizer or default_normalizer
+        self._flights: dict[str, _Flight] = {}
+
+    def __call__(self, query: str) -> 'ResilientSearchTask':
+        return ResilientSearchTask(self, query)
+
+    def lookup(self, query: str) -> tuple[Any, ...] | None:
+        """Get the cached results of the query or of its longest cached prefix."""
+        key = self.normalizer.key(query)
+        with self._cache_lock:
+            for length in range(len(key), self._min_prefix_length - 1, -1):
+                results = self._cache.get(key[:length])
+                if results is not None:
+                    self._cache.move_to_end(key[:length])
+                    return results
+        return None
+
+    def store(self, query: str, results: Sequence[Any]) -> None:
+        """Remember the good results of a query."""
+        key = self.normalizer.key(query)
+        with self._cache_lock:
+            self._cache[key] = tuple(results)  # shared with the snapshots of the tasks, so it must be immutable
+            self._cache.move_to_end(key)
+            while len(self._cache) > self._cache_size:
+                self._cache.popitem(last=False)
+
+    def clear_cache(self) -> None:
+        """Forget all cached results."""
+        with self._cache_lock:
+            self._cache.clear()
+
+    def _join(self, query: str) -> '_Flight':
+        """Get the running backend search of the normalized query or start one, must be called on the event loop."""
+        key = self.normalizer.key(query)
+        flight = self._flights.get(key)
+        if flight is None:
+            flight = self._flights[key] = _Flight(key, self._on_search(query))
+            flight.runner.add_done_callback(lambda _: self._forget(flight))
+        else:
+            metrics.increment('search.coalesced', source=self.name)
+        flight.subscribers += 1
+        return flight
+
+    def _leave(self, flight: '_Flight') -> None:
+        """Unsubscribe from a backend search, which is cancelled once nobody waits for it anymore."""
+        flight.subscribers -= 1
+        if flight.subscribers <= 0 and not flight.runner.done():
+            flight.task.cancel()
+            self._forget(flight)
+
+    def _forget(self, flight: '_Flight') -> None:
+        if self._flights.get(flight.key) is flight:
+            del self._flights[flight.key]
+
+
+class _Flight:
+    """A backend search shared by all tasks waiting for the results of the same normalized query"""
+
+    def __init__(self, key: str, task: SearchTask):
+        self.key = key
+        self.task = task
+        self.subscribers = 0
+        self.reported = False
+        self.runner = asyncio.ensure_future(executors.run(task))
+
+    def report(self, breaker: CircuitBreaker, success: bool) -> None:
+        """Report the outcome to the circuit breaker once, regardless of the number of subscribers."""
+        if self.reported:
+            return
+        self.reported = True
+        if success:
+            breaker.record_success()
+        else:
+            breaker.record_failure()
+
+
+class ResilientSearchTask(SearchTask):
+    """Search task waiting for the backend search of its query under the control of a ResilientSearch."""
+
+    def __init__(self, search: ResilientSearch, query: str):
+        super().__init__(query=query)
+        self._search = search
+        self._flight: _Flight | None = None
+        self._stale = search.lookup(query)
+        self._fallback_used = False
+        self._probe = False
+        if self._stale is not None:
+            metrics.increment('search.stale_served', source=search.name)
+            self.set_elements(self._stale)
+
+    @property
+    def is_stale(self) -> bool:
+        """True if the published results are cached results instead of fresh ones."""
+        return self._stale is not None and (self._fallback_used or not self.is_done)
+
+    @property
+    def publishes_partial_results(self) -> bool:
+        return self._stale is not None  # cached results are shown until the fresh ones arrive
+
+    def cancel(self) -> None:
+        super().cancel()
+        self._leave_flight()
+        self._release_probe()
+
+    async def execute_async(self):
+        search = self._search
+        if not search.breaker.allow_request():
+            metrics.increment('search.rejected', source=search.name)
+            self._fall_back(CircuitOpenError(f'Circuit breaker of search source {search.name!r} is open'))
+            return
+        self._probe = search.breaker.state == CircuitBreaker.HALF_OPEN
+        try:
+            await self._wait_for_flight()
+        finally:
+            self._release_probe()
+
+    async def _wait_for_flight(self) -> None:
+        search = self._search
+        flight = self._flight = search._join(self._query)
+        try:
+            await asyncio.wait_for(asyncio.shield(flight.runner), self._search.deadline)
+        except TimeoutError:
+            if self.is_cancelled:
+                return
+            metrics.increment('search.timeouts', source=search.name)
+            flight.report(search.breaker, success=False)
+            self._fall_back(TimeoutError(f'Search source {search.name!r} exceeded its deadline of {search.deadline}s'))
+            return
+        finally:
+            self._leave_flight()
+        task = flight.task
+        if self.is_cancelled:
+            return
+        if task.has_error:
+            metrics.increment('search.errors', source=search.name)
+            flight.report(search.breaker, success=False)
+            self._fall_back(task.error)
+            return
+        flight.report(search.breaker, success=True)
+        results = task.elements
+        search.store(self._query, results)
+        self.total_elements = task.total_elements
+        self.set_elements(results)
+        self._more_elements = self._more_elements or task.more_elements
+
+    def _release_probe(self) -> None:
+        """A probe which was cancelled before reporting its outcome must not block the breaker"""
+        if self._probe:
+            self._probe = False
+            self._search.breaker.release_probe()
+
+    def _leave_flight(self) -> None:
+        flight, self._flight = self._flight, None
+        if flight is not None:
+            self._search._leave(flight)
+
+    def _fall_back(self, error: Exception) -> None:
+        """Keep the stale results if available, otherwise fail with the given error."""
+        if self._stale is None:
+            raise error
+        metrics.increment('search.fallbacks', source=self._search.name)
+        self._fallback_used = True
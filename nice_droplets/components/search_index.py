@@ -0,0 +1,275 @@
+"""Persisted, memory mapped search index for typeahead sources."""
+
+import json
+import mmap
+import os
+import struct
+import sys
+import time
+from array import array
+from collections.abc import Mapping
+from threading import Lock
+from typing import Any, Callable, Iterable
+
+from .cancellation_token import CancellationToken
+from .normalization import Normalizer, default_normalizer
+from .ranking import Ranker
+from .search_task import SearchTask
+
+
+class SearchIndexBuilder:
+    """Collects records and writes them as a single-file search index.
+
+    The file contains a sorted term dictionary, the postings (record ids) of each term and the
+    records themselves, serialized as JSON and addressed through an offset table.
+    """
+
+    def __init__(self, text_fn: Callable[[Any], str] | None = None, normalizer: Normalizer | None = None):
+        """Initialize the builder.
+
+        :param text_fn: Function returning the searchable text of a record. By default strings are used as they are
+            and the string values of dicts are joined.
+        :param normalizer: The normalizer producing the terms, the index has to be opened with the same one.
+        """
+        self._text_fn = text_fn or _default_text
+        self._normalizer = normalizer or default_normalizer
+        self._records: list[bytes] = []
+        self._postings: dict[str, list[int]] = {}
+
+    def add(self, record: Any) -> int:
+        """Add a record and return its id."""
+        record_id = len(self._records)
+        self._records.append(json.dumps(record, ensure_ascii=False).encode('utf-8'))
+        for term in set(self._normalizer.tokenize(self._text_fn(record))):
+            self._postings.setdefault(term, []).append(record_id)
+        return record_id
+
+    def add_all(self, records: Iterable[Any]) -> None:
+        """Add multiple records."""
+        for record in records:
+            self.add(record)
+
+    def write(self, path: str) -> None:
+        """Write the index to a file.
+
+        The file is written to a temporary path first and then atomically moved into place, so
+        processes using the previous version never see a partially written index.
+        """
+        terms = sorted((term.encode('utf-8'), ids) for term, ids in self._postings.items())
+        sections = [
+            _offsets_table([term for term, _ in terms]),
+            b''.join(term for term, _ in terms),
+            _offsets_table([ids for _, ids in terms], item_size=4),
+            b''.join(array('I', ids).tobytes() for _, ids in terms),
+            _offsets_table(self._records),
+            b''.join(self._records),
+        ]
+        position = SearchIndex.HEADER.size
+        section_offsets = []
+        for section in sections:
+            position += -position % 8
+            section_offsets.append(position)
+            position += len(section)
+        header = SearchIndex.HEADER.pack(SearchIndex.MAGIC, sys.byteorder == 'little', len(terms), len(self._records),
+                                         *section_offsets)
+        temp_path = f'{path}.{os.getpid()}.tmp'
+        with open(temp_path, 'wb') as f:
+            f.write(header)
+            for offset, section in zip(section_offsets, sections):
+                f.write(b'\0' * (offset - f.tell()))
+                f.write(section)
+        os.replace(temp_path, path)
+
+
+class SearchIndex:
+    """Read-only search index mapped from a file written by SearchIndexBuilder.
+
+    Opening an index only maps the file, no data is decoded until it is queried. As the mapping is read-only,
+    all worker processes opening the same file share its pages in the operating system's cache.
+    """
+
+    MAGIC = b'NDLSIX02'
+    HEADER = struct.Struct('<8sB7xQQ6Q')  # magic, byte order, term count, record count, section offsets
+
+    def __init__(self, path: str, normalizer: Normalizer | None = None):
+        """Map an index file.
+
+        :param path: The path of the index file.
+        :param normalizer: The normalizer applied to queries, must be the one the index was built with.
+        """
+        self.path = path
+        self.normalizer = normalizer or default_normalizer
+        with open(path, 'rb') as f:
+            stat = os.fstat(f.fileno())
+            self.signature = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, little_endian, self.term_count, self.record_count, *sections = self.HEADER.unpack_from(self._map)
+        if magic != self.MAGIC:
+            if magic.startswith(self.MAGIC[:6]):
+                raise ValueError(f'{path} was written by another version with different normalization, rebuild it')
+            raise ValueError(f'{path} is not a search index')
+        if little_endian != (sys.byteorder == 'little'):
+            raise ValueError(f'{path} was written on a platform with a different byte order')
+        term_offsets, term_blob, posting_offsets, postings, record_offsets, record_blob = sections
+        view = memoryview(self._map)
+        self._term_offsets = view[term_offsets:term_offsets + (self.term_count + 1) * 8].cast('Q')
+        self._term_blob = term_blob
+        self._posting_offsets = view[posting_offsets:posting_offsets + (self.term_count + 1) * 8].cast('Q')
+        self._postings = postings
+        self._record_offsets = view[record_offsets:record_offsets + (self.record_count + 1) * 8].cast('Q')
+        self._record_blob = record_blob
+        self._view = view
+
+    def __len__(self) -> int:
+        return self.record_count
+
+    def term(self, index: int) -> bytes:
+        """Get the term at the given position of the sorted term dictionary."""
+        return self._map[self._term_blob + self._term_offsets[index]:self._term_blob + self._term_offsets[index + 1]]
+
+    def postings(self, index: int) -> memoryview:
+        """Get the ids of the records containing the term at the given position."""
+        start = self._postings + self._posting_offsets[index]
+        end = self._postings + self._posting_offsets[index + 1]
+        return self._view[start:end].cast('I')
+
+    def record(self, record_id: int) -> Any:
+        """Decode a record."""
+        start = self._record_blob + self._record_offsets[record_id]
+        end = self._record_blob + self._record_offsets[record_id + 1]
+        return json.loads(self._map[start:end])
+
+    def term_range(self, prefix: str) -> range:
+        """Get the positions of all terms starting with the prefix."""
+        encoded = prefix.encode('utf-8')
+        low, high = 0, self.term_count
+        while low < high:
+            middle = (low + high) // 2
+            if self.term(middle) < encoded:
+                low = middle + 1
+            else:
+                high = middle
+        first = low
+        high = self.term_count
+        while low < high:
+            middle = (low + high) // 2
+            if self.term(middle).startswith(encoded):
+                low = middle + 1
+            else:
+                high = middle
+        return range(first, low)
+
+    def search_ids(self, query: str, token: CancellationToken | None = None, max_terms: int = 10000) -> list[int]:
+        """Find the ids of all records containing a term starting with each of the query's tokens.
+
+        :param query: The query string.
+        :param token: Optional token of the running task, the search stops once it is cancelled.
+        :param max_terms: The maximum number of dictionary terms expanded per query token.
+        """
+        result: set[int] | None = None
+        for query_token in self.normalizer.tokenize(query):
+            matches: set[int] = set()
+            for term_index in self.term_range(query_token)[:max_terms]:
+                if token is not None and token.is_cancelled:
+                    return []
+                matches.update(self.postings(term_index))
+            result = matches if result is None else result & matches
+            if not result:
+                return []
+        return sorted(result) if result else []
+
+    def search(self, query: str, token: CancellationToken | None = None, limit: int = -1) -> list[Any]:
+        """Find the records matching the query and decode them.
+
+        :param query: The query string.
+        :param token: Optional token of the running task, the search stops once it is cancelled.
+        :param limit: The maximum number of records to decode, -1 for all.
+        """
+        ids = self.search_ids(query, token)
+        if limit != -1:
+            ids = ids[:limit]
+        return [self.record(record_id) for record_id in ids]
+
+
+class SearchIndexSource:
+    """Search source backed by a persisted SearchIndex file.
+
+    The file is checked for replacements at most every reload_interval seconds. If a rebuilt index was
+    moved into place (e.g. by SearchIndexBuilder.write), it is swapped in without restarting the application.
+    Tasks still running on the previous index keep using it until they finish.
+    """
+
+    def __init__(self, path: str, *, max_elements: int = 50, reload_interval: float = 5.0,
+                 normalizer: Normalizer | None = None, ranker: Ranker | None = None, max_candidates: int = 1000):
+        """Initialize the source.
+
+        :param path: The path of the index file.
+        :param max_elements: The maximum number of records to return per query.
+        :param reload_interval: Minimum time in seconds between two checks for a replaced index file.
+        :param normalizer: The normalizer the index was built with.
+        :param ranker: Optional ranker returning the best instead of the first max_elements records. It ranks up to
+            max_candidates matching records, fit it with the indexed records once, otherwise the term statistics
+            are computed from the candidates of each query.
+        :param max_candidates: The maximum number of matching records decoded for the ranker.
+        """
+        self.path = path
+        self.normalizer = normalizer
+        self.max_elements = max_elements
+        self.reload_interval = reload_interval
+        self.ranker = ranker
+        self.max_candidates = max_candidates
+        self._lock = Lock()
+        self._index = SearchIndex(path, normalizer)
+        self._checked_at = time.monotonic()
+
+    def __call__(self, query: str) -> SearchTask:
+        return SearchTask(self.search, query, max_elements=self.max_elements, with_token=True, ranker=self.ranker)
+
+    @property
+    def index(self) -> SearchIndex:
+        """The current index, reloaded if the file was replaced."""
+        now = time.monotonic()
+        if now - self._checked_at >= self.reload_interval:
+            self._checked_at = now
+            self.reload()
+        return self._index
+
+    def reload(self, force: bool = False) -> bool:
+        """Swap in the index file if it was replaced.
+
+        :param force: Reload even if the file seems unchanged.
+        :return: True if a new index was loaded.
+        """
+        with self._lock:
+            try:
+                stat = os.stat(self.path)
+            except OSError:
+                return False
+            if not force and (stat.st_ino, stat.st_mtime_ns, stat.st_size) == self._index.signature:
+                return False
+            self._index = SearchIndex(self.path, self.normalizer)  # the previous mapping is released once no task uses it anymore
+            return True
+
+    def search(self, query: str, token: CancellationToken | None = None) -> list[Any]:
+        """Find the records matching the query."""
+        if self.max_elements == -1:
+            return self.index.search(query, token)
+        # a ranker has to see more than the first matches, the task keeps the best max_elements of them
+        limit = self.max_elements + 1 if self.ranker is None else max(self.max_elements + 1, self.max_candidates)
+        return self.index.search(query, token, limit=limit)
+
+
+def _default_text(record: Any) -> str:
+    if isinstance(record, Mapping):
+        return ' '.join(str(value) for value in record.values())
+    return str(record)
+
+
+def _offsets_table(entries: list[Any], item_size: int = 1) -> bytes:
+    """Build the table of start offsets of consecutive entries, followed by the total size."""
+    offsets = array('Q', [0])
+    total = 0
+    for entry in entries:
+        total += len(entry) * item_size
+        offsets.append(total)
+    return offsets.tobytes()
@@ -1,6 +1,6 @@
 """Search manager component for handling search tasks and polling."""
 
-from typing import Any, Callable, Protocol
+from typing import Any, Callable, Protocol, Sequence
 from nicegui import ui
 
 from .task_executor import TaskExecutor
@@ -18,8 +18,14 @@ class SearchResultHandler(Protocol):
         """Called when a search fails."""
         ...
 
-    def on_search_results(self, results: list[Any]) -> None:
-        """Called when search results are available."""
+    def on_search_results(self, results: Sequence[Any], view_models: list[Any] | None = None,
+                          fingerprint: str | None = None) -> None:
+        """Called when search results are available.
+
+        :param results: The search results, an immutable snapshot which is the same object until they change.
+        :param view_models: The view models prepared for the results in the worker, if any.
+        :param fingerprint: The hash of the final results computed in the worker, None for partial results.
+        """
         ...
 
     def on_search_completed(self) -> None:
@@ -36,7 +42,10 @@ class SearchManager:
         result_handler: SearchResultHandler | None = None,
         min_chars: int = 1,
         debounce: float = 0.1,
-        poll_interval: float = 0.1
+        poll_interval: float = 0.1,
+        view_model_fn: Callable[[list[Any]], list[Any]] | None = None,
+        fingerprint_fn: Callable[[Sequence[Any]], str] | None = None,
+        timer: Callable[..., ui.timer] | None = None
     ):
         """Initialize the search manager.
         
@@ -45,13 +54,22 @@ class SearchManager:
         :param min_chars: Minimum number of characters required to start a search.
         :param debounce: Time to wait before executing a search after input changes.
         :param poll_interval: Interval for checking search results.
+        :param view_model_fn: Optional pure function projecting results into view models.
+            It is executed in the same worker as the search task, so the event loop only needs to create the elements.
+        :param fingerprint_fn: Optional pure function hashing the final results, also executed in the worker.
+        :param timer: Factory of the debounce and poll timers with the signature of ui.timer, which is used by default,
+            e.g. to replay sessions without a NiceGUI client.
         """
         self._on_search = on_search
         self._result_handler = result_handler
         self._min_chars = min_chars
-        self._task_executor = TaskExecutor(debounce)
+        self._timer = timer or ui.timer
+        self._task_executor = TaskExecutor(debounce, timer=timer)
         self._poll_timer: ui.timer | None = None
         self._poll_interval = poll_interval
+        self._published_version = 0
+        self._view_model_fn = view_model_fn
+        self._fingerprint_fn = fingerprint_fn
 
     def handle_search(self, query: str) -> None:
         """Handle a new search query.
@@ -68,6 +86,10 @@ class SearchManager:
             return
 
         task = self._on_search(query)
+        if self._view_model_fn is not None:
+            task.view_model_fn = self._view_model_fn
+        if self._fingerprint_fn is not None:
+            task.fingerprint_fn = self._fingerprint_fn
         self._task_executor.schedule(task)
         
         if self._result_handler:
@@ -75,11 +97,23 @@ class SearchManager:
         
         if self._poll_timer:
             self._poll_timer.cancel()
-        self._poll_timer = ui.timer(
+        self._published_version = 0
+        self._poll_timer = self._timer(
             interval=self._poll_interval,
             callback=lambda: self._check_results(task),
             active=True
         )
+        self._check_results(task)  # publish results which are available immediately, e.g. from a cache
+
+    @property
+    def task_executor(self) -> TaskExecutor:
+        """The executor debouncing and running the search tasks."""
+        return self._task_executor
+
+    @property
+    def is_searching(self) -> bool:
+        """Check if the results of a search are still awaited."""
+        return self._poll_timer is not None
 
     def _check_results(self, task: SearchTask) -> None:
         """Check if results are available and notify handler.
@@ -89,6 +123,10 @@ class SearchManager:
         if task is None:
             return
         if not task.is_done:
+            if task.publishes_partial_results and task.version != self._published_version and not task.is_cancelled:
+                self._published_version = task.version
+                if self._result_handler:
+                    self._result_handler.on_search_results(task.partial_elements)
             return
 
         if self._poll_timer:
@@ -101,11 +139,29 @@ class SearchManager:
             return
 
         if self._result_handler:
-            self._result_handler.on_search_results(task.elements)
+            view_models = task.view_models
+            fingerprint = task.fingerprint
+            if fingerprint is not None:
+                self._result_handler.on_search_results(task.elements, view_models=view_models,
+                                                       fingerprint=fingerprint)
+            elif view_models is not None:
+                self._result_handler.on_search_results(task.elements, view_models=view_models)
+            elif not self._published_version or task.version != self._published_version:
+                # skipped if the last published partial results are already the final ones
+                self._result_handler.on_search_results(task.elements)
             self._result_handler.on_search_completed()
 
-    def cleanup(self) -> None:
-        """Clean up resources."""
+    def cleanup(self) -> dict[str, int]:
+        """Cancel running searches, stop all timers and drop the reference to the result handler.
+
+        :return: The number of cancelled tasks and stopped timers.
+        """
+        reclaimed = self._task_executor.cleanup()
         if self._poll_timer:
             self._poll_timer.cancel()
             self._poll_timer = None
+            reclaimed['timers'] += 1
+        self._result_handler = None
+        self._view_model_fn = None
+        self._fingerprint_fn = None
+        return reclaimed
@@ -1,11 +1,23 @@
-import time
-from typing import Any, Awaitable, Callable, TypeVar, Union
+from typing import Any, Awaitable, Callable, NamedTuple, Sequence
 from threading import RLock
 import asyncio
 
 from .task import Task
+from .cancellation_token import CancellationToken
+from .ranking import Ranker
 
-from pydantic import BaseModel, Field
+
+class ResultSnapshot(NamedTuple):
+    """Immutable state of the results of a search task.
+
+    :param elements: The results published so far.
+    :param generation: The number of times results were published, changes with every new snapshot.
+    """
+    elements: tuple[Any, ...]
+    generation: int
+
+
+_EMPTY = ResultSnapshot((), 0)
 
 
 class SearchTask(Task):
@@ -16,6 +28,9 @@ class SearchTask(Task):
 
     The search logic can be implemented as a function that takes a query string and returns a list of results,
     altenatively either the execute or execute_async method can be overridden to perform the search asynchronously.
+
+    Results are published as immutable snapshots, so readers need neither locks nor copies and can compare
+    generations to detect changes. Only writers are serialized.
     """
 
     def __init__(
@@ -24,6 +39,9 @@ class SearchTask(Task):
         query: str | None = None,
         max_elements: int = -1,
         first_element_index: int = 0,
+        with_token: bool = False,
+        ranker: Ranker | None = None,
+        executor: str | None = None,
     ):
         """Initialize the search task.        
 
@@ -35,39 +53,77 @@ class SearchTask(Task):
         :param search_fn: The search function to execute, can be sync or async.
         :param max_elements: The maximum number of elements to return from the search function.
         :param first_element_index: The index of the first element to return from the search function.
+        :param with_token: If True the search function is called with a CancellationToken as second argument,
+            allowing it to stop early once the task is superseded and to publish partial results.
+        :param ranker: Optional ranker ordering the results by relevance, so that max_elements keeps the best
+            instead of the first results. Unless it was fitted, it computes its term statistics from the
+            results of each task.
+        :param executor: The name of the executor running the task if it is sync, see ExecutorRegistry.
         """
         super().__init__()
         self.max_elements = max_elements
         self._data_lock = RLock()
         self._query: str | None = query
-        self._elements: list[Any] = []
+        self._snapshot = _EMPTY
+        self._unranked: list[Any] = []
         self._first_element_index: int = first_element_index
         self._total_elements: int = 0
         self._more_elements: bool = False
+        self._with_token = with_token
+        self._publishes_partial_results = False
+        self._token: CancellationToken | None = None
+        self.ranker = ranker
+        if executor is not None:
+            self.executor = executor
+        self.view_model_fn: Callable[[list[Any]], list[Any]] | None = None
+        self.fingerprint_fn: Callable[[Sequence[Any]], str] | None = None
+        self._prepared: tuple[int, list[Any] | None, str | None] | None = None
         self._search_fn: Callable[[str], list[Any]] | Callable[[str], Awaitable[list[Any]]] | None = search_fn  # type: ignore
 
-    def add_elements(self, elements: list[Any]):
-        """Add elements to the search results."""
+    def add_elements(self, elements: Sequence[Any]):
+        """Add elements to the search results.
+
+        With a ranker, the elements are shown in the order they were added while the task is running and ranked
+        once in post_process, so streaming sources do not rank all accumulated elements again on every batch.
+        """
         with self._data_lock:
-            if self.max_elements == -1:
-                self._elements.extend(elements)
-            else:
-                if len(self._elements) < self.max_elements:
-                    remaining_space = self.max_elements - len(self._elements)
-                    self._elements.extend(elements[:remaining_space])
-                    if len(elements) > remaining_space:
-                        self._more_elements = True
-                else:                    
+            current = self._snapshot.elements
+            if self.ranker is not None and self._query:
+                self._unranked.extend(elements)
+            if self.max_elements != -1:
+                remaining_space = max(0, self.max_elements - len(current))
+                if len(elements) > remaining_space:
                     self._more_elements = True
+                    elements = elements[:remaining_space]
+            if elements:
+                self._publish(current + tuple(elements))
 
-    def set_elements(self, elements: list[Any]):
+    def set_elements(self, elements: Sequence[Any]):
         """Set the search results."""
         with self._data_lock:
-            if self.max_elements == -1 or len(elements) <= self.max_elements:
-                self._elements = elements
+            self._unranked = []
+            if self.ranker is not None and self._query:
+                self._publish(self._ranked_elements(elements))
+            elif self.max_elements == -1 or len(elements) <= self.max_elements:
+                self._publish(tuple(elements))
             else:
-                self._elements = elements[: self.max_elements]
                 self._more_elements = True
+                self._publish(tuple(elements[: self.max_elements]))
+
+    def publish_partial(self, elements: Sequence[Any]):
+        """Publish the results found so far, they are shown while the search continues."""
+        self._publishes_partial_results = True
+        self.set_elements(elements)
+
+    def _ranked_elements(self, elements: Sequence[Any]) -> tuple[Any, ...]:
+        """Keep the best max_elements of the given elements, ordered by relevance."""
+        if self.max_elements != -1 and len(elements) > self.max_elements:
+            self._more_elements = True
+        return tuple(self.ranker.top_k(list(elements), self._query, self.max_elements))
+
+    def _publish(self, elements: tuple[Any, ...]) -> None:
+        """Replace the snapshot by a new generation, must be called with the data lock held."""
+        self._snapshot = ResultSnapshot(elements, self._snapshot.generation + 1)
 
     def execute(self):
         """Execute the search if not cancelled.
@@ -79,7 +135,7 @@ class SearchTask(Task):
         if self.is_async:
             raise NotImplementedError("Use execute_async for async search functions")
         if self._search_fn and self._query is not None:
-            result = self._search_fn(self._query)  # type: ignore
+            result = self._call_search_fn()
             self._total_elements = len(result)
             self.set_elements(result)
 
@@ -93,16 +149,94 @@ class SearchTask(Task):
         if not self.is_async:
             raise NotImplementedError("Use execute for sync search functions")
         if self._search_fn and self._query is not None:
-            result = await self._search_fn(self._query)  # type: ignore
+            result = await self._call_search_fn()
             self._total_elements = len(result)
             self.set_elements(result)
 
     @property
-    def elements(self) -> list[Any]:
-        """Get the search results if available, None otherwise."""
+    def requires_post_processing(self) -> bool:
+        return self.view_model_fn is not None or self.fingerprint_fn is not None or bool(self._unranked)
+
+    def post_process(self):
+        """Rank the elements added using add_elements, project the results into view models using view_model_fn
+        and hash them using fingerprint_fn, still within the worker."""
+        with self._data_lock:
+            if self._unranked:
+                self._publish(self._ranked_elements(self._unranked))
+                self._unranked = []
+        snapshot = self._snapshot
+        view_models = self.view_model_fn(snapshot.elements) if self.view_model_fn is not None else None
+        fingerprint = self.fingerprint_fn(snapshot.elements) if self.fingerprint_fn is not None else None
+        self._prepared = (snapshot.generation, view_models, fingerprint)
+
+    @property
+    def view_models(self) -> list[Any] | None:
+        """Get the view models prepared for the final results, None if they were not prepared."""
+        prepared = self._final_preparation()
+        return prepared[1] if prepared is not None else None
+
+    @property
+    def fingerprint(self) -> str | None:
+        """Get the fingerprint of the final results, None if it was not computed."""
+        prepared = self._final_preparation()
+        return prepared[2] if prepared is not None else None
+
+    def _final_preparation(self) -> tuple[int, list[Any] | None, str | None] | None:
+        if not self.is_done or self._prepared is None or self._prepared[0] != self._snapshot.generation:
+            return None
+        return self._prepared
+
+    def _call_search_fn(self) -> Any:
+        if self._with_token:
+            return self._search_fn(self._query, self.token)  # type: ignore
+        return self._search_fn(self._query)  # type: ignore
+
+    @property
+    def token(self) -> CancellationToken:
+        """Get the cancellation token of this task."""
+        if self._token is None:
+            self._token = CancellationToken(self)
+        return self._token
+
+    @property
+    def query(self) -> str | None:
+        """Get the query string passed to the search function."""
+        return self._query
+
+    @query.setter
+    def query(self, value: str | None):
+        self._query = value
+
+    @property
+    def elements(self) -> tuple[Any, ...]:
+        """Get the search results once the task is done, an empty tuple before."""
         if not self.is_done:
-            return []
-        return self._elements
+            return ()
+        return self._snapshot.elements
+
+    @property
+    def partial_elements(self) -> tuple[Any, ...]:
+        """Get the results published so far, also while the task is still running."""
+        return self._snapshot.elements
+
+    @property
+    def publishes_partial_results(self) -> bool:
+        """Check if results published while the task is running are shown.
+
+        Only tasks publishing partial results, e.g. using CancellationToken.publish, opt in. The results of other
+        tasks are shown once they are done, so their final results are not rendered twice.
+        """
+        return self._publishes_partial_results
+
+    @property
+    def snapshot(self) -> ResultSnapshot:
+        """Get the current results together with their generation."""
+        return self._snapshot
+
+    @property
+    def version(self) -> int:
+        """Get the generation of the results, allows detecting new partial results."""
+        return self._snapshot.generation
 
     @property
     def more_elements(self) -> bool:
@@ -0,0 +1,132 @@
+"""Recording of the keystroke timing of typeahead sessions for later replay."""
+
+import json
+import random
+import string
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from threading import Lock
+
+
+@dataclass
+class RecordedEvent:
+    """A value change or hotkey of a session.
+
+    :param time: The time in seconds since the start of the session.
+    :param kind: Either 'input' for value changes or 'key' for hotkeys.
+    :param value: The new (possibly anonymized) value or the name of the key.
+    """
+    time: float
+    kind: str
+    value: str
+
+
+@dataclass
+class RecordedSession:
+    """The events of a single typeahead session."""
+    events: list[RecordedEvent] = field(default_factory=list)
+
+    @property
+    def duration(self) -> float:
+        return self.events[-1].time if self.events else 0.0
+
+    @property
+    def queries(self) -> list[str]:
+        """The values of all input events."""
+        return [event.value for event in self.events if event.kind == 'input']
+
+
+class _Anonymizer:
+    """Substitutes letters and digits by a random permutation which is fixed per session.
+
+    Keeps the length of values, their prefix relations and repetitions, which drive debouncing and caching,
+    but not their text.
+    """
+
+    def __init__(self):
+        self._table = {}
+        for alphabet in (string.ascii_lowercase, string.ascii_uppercase, string.digits):
+            shuffled = random.sample(alphabet, len(alphabet))
+            self._table.update({ord(a): b for a, b in zip(alphabet, shuffled)})
+        self._others: dict[str, str] = {}
+
+    def __call__(self, value: str) -> str:
+        return ''.join(self._other(char) if char.isalnum() and ord(char) not in self._table else char
+                       for char in value.translate(self._table))
+
+    def _other(self, char: str) -> str:
+        """Map non ASCII letters to random lowercase letters"""
+        if char not in self._others:
+            self._others[char] = random.choice(string.ascii_lowercase)
+        return self._others[char]
+
+
+class SessionRecorder:
+    """Records the timing of value changes and hotkeys of typeahead sessions.
+
+    Pass a recorder to ``Typeahead(recorder=...)``, each typeahead instance records its own session.
+    Recordings are anonymized by default and can be saved as JSON lines, one session per line,
+    to be replayed with ReplayHarness.
+    """
+
+    def __init__(self, anonymize: bool = True, max_sessions: int = 1000):
+        """Initialize the recorder.
+
+        :param anonymize: Whether to substitute the characters of recorded values, see _Anonymizer.
+        :param max_sessions: The maximum number of sessions kept, older sessions are dropped.
+        """
+        self.anonymize = anonymize
+        self.max_sessions = max_sessions
+        self._sessions: list[RecordedSession] = []
+        self._lock = Lock()
+
+    @property
+    def sessions(self) -> list[RecordedSession]:
+        """The recorded sessions with at least one event."""
+        with self._lock:
+            return [session for session in self._sessions if session.events]
+
+    def start_session(self) -> 'SessionRecording':
+        """Start recording a new session."""
+        session = RecordedSession()
+        with self._lock:
+            self._sessions.append(session)
+            del self._sessions[:-self.max_sessions]
+        return SessionRecording(session, _Anonymizer() if self.anonymize else None)
+
+    def save(self, path: str | Path) -> None:
+        """Write all sessions to a JSON lines file."""
+        with open(path, 'w', encoding='utf-8') as file:
+            for session in self.sessions:
+                file.write(json.dumps([asdict(event) for event in session.events]) + '\n')
+
+    @staticmethod
+    def load(path: str | Path) -> list[RecordedSession]:
+        """Read sessions written by save."""
+        with open(path, encoding='utf-8') as file:
+            return [RecordedSession([RecordedEvent(**event) for event in json.loads(line)])
+                    for line in file if line.strip()]
+
+
+class SessionRecording:
+    """Records the events of one session, the time of the first event is the start of the session."""
+
+    def __init__(self, session: RecordedSession, anonymizer: _Anonymizer | None):
+        self._session = session
+        self._anonymizer = anonymizer
+        self._started: float | None = None
+
+    def record_input(self, value: str) -> None:
+        """Record a value change."""
+        self._record('input', self._anonymizer(value) if self._anonymizer else value)
+
+    def record_key(self, key: str) -> None:
+        """Record a hotkey such as ArrowDown, Enter or Escape."""
+        self._record('key', key)
+
+    def _record(self, kind: str, value: str) -> None:
+        now = time.monotonic()
+        if self._started is None:
+            self._started = now
+        self._session.events.append(RecordedEvent(time=now - self._started, kind=kind, value=value))
@@ -0,0 +1,238 @@
+"""Multi-process search over a dataset shared between the processes through shared memory."""
+
+import heapq
+import itertools
+import os
+import re
+from array import array
+from bisect import bisect_right
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from multiprocessing import resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+from threading import Lock
+from typing import Any, Callable, Iterable
+
+from .normalization import Normalizer, default_normalizer
+from .search_task import SearchTask
+
+_CANCEL_SLOTS = 256
+_worker_state: dict[str, Any] = {}
+
+
+def _attach(name: str) -> SharedMemory:
+    """Attach to an existing shared memory block owned by the parent process without tracking it.
+
+    Before Python 3.13, attaching registers the block with the resource tracker the workers share with the parent.
+    Unregistering it afterwards would drop the registration of the parent, so registering is skipped instead.
+    """
+    try:
+        return SharedMemory(name=name, track=False)  # Python 3.13+
+    except TypeError:
+        pass
+    register = resource_tracker.register
+    resource_tracker.register = lambda name, rtype: None  # the initializer runs before the worker uses threads
+    try:
+        return SharedMemory(name=name)
+    finally:
+        resource_tracker.register = register
+
+
+def _init_worker(data_name: str, offsets_name: str, board_name: str, record_count: int) -> None:
+    data = _attach(data_name)
+    offsets = _attach(offsets_name)
+    board = _attach(board_name)
+    _worker_state.update(
+        memories=(data, offsets, board),
+        data=data.buf,
+        offsets=offsets.buf[:(record_count + 1) * 8].cast('Q'),
+        board=board.buf[:_CANCEL_SLOTS * 8].cast('Q'),
+    )
+
+
+def _search_shard(needle: bytes, first: int, last: int, limit: int, slot: int, query_id: int,
+                  window_size: int) -> tuple[int, list[tuple[float, int]]]:
+    """Scan the records first..last-1 of the shared dataset.
+
+    :return: The number of matching records and the best (score, negated record id) pairs.
+    """
+    data = _worker_state['data']
+    offsets = _worker_state['offsets']
+    board = _worker_state['board']
+    pattern = re.compile(re.escape(needle))
+    position = offsets[first]
+    end = offsets[last]
+    scored: list[tuple[float, int]] = []
+    while position < end:
+        if board[slot] != query_id:
+            return 0, []  # the query was cancelled
+        # scan windows ending at a record boundary, a query can not span records so no match is missed
+        window_end = offsets[min(last, bisect_right(offsets, position + window_size, first, last + 1))]
+        while position < window_end:
+            match = pattern.search(data, position, window_end)
+            if match is None:
+                break
+            record_id = bisect_right(offsets, match.start(), first, last + 1) - 1
+            record_start = offsets[record_id]
+            record_end = offsets[record_id + 1] - 1  # without the line break
+            scored.append((score_match(data, record_start, record_end, match.start(), len(needle)), -record_id))
+            position = record_end + 1
+        position = window_end
+    return len(scored), heapq.nlargest(limit, scored)
+
+
+def score_match(data: Any, record_start: int, record_end: int, match_start: int, match_length: int) -> float:
+    """Score a substring match within UTF-8 encoded records: exact matches rank before prefixes, word starts and
+    plain substrings, shorter records rank before longer ones."""
+    if match_start == record_start:
+        score = 4.0 if record_end - record_start == match_length else 3.0
+    elif not _char_before(data, record_start, match_start).isalnum():
+        score = 2.0
+    else:
+        score = 1.0
+    return score + 1.0 / (1 + record_end - record_start)
+
+
+def _char_before(data: Any, record_start: int, position: int) -> str:
+    """Decode the character preceding a byte position, skipping back over UTF-8 continuation bytes"""
+    start = position - 1
+    while start > record_start and data[start] & 0xC0 == 0x80:
+        start -= 1
+    return bytes(data[start:position]).decode('utf-8', errors='replace')
+
+
+class ShardedSearch:
+    """Search engine partitioning a dataset across worker processes.
+
+    The searchable text of all records is copied once into a shared memory block the workers attach to,
+    so the data exists once regardless of the number of processes. Each query is split into one range of
+    records per shard, the per-shard top-k lists are merged by score.
+    Pass an instance as search task factory, e.g. ``Typeahead(on_search=ShardedSearch(records))``.
+    Call close() or use it as context manager to stop the workers and release the shared memory.
+    """
+
+    def __init__(
+        self,
+        records: list[Any],
+        *,
+        text_fn: Callable[[Any], str] | None = None,
+        shards: int | None = None,
+        max_elements: int = 50,
+        window_size: int = 1 << 20,
+        normalizer: Normalizer | None = None,
+    ):
+        """Initialize the engine and start the worker processes.
+
+        :param records: The records to search, the results contain the original objects.
+        :param text_fn: Function returning the searchable text of a record, by default str() is used.
+        :param shards: The number of shards and worker processes, defaults to the number of CPUs.
+        :param max_elements: The maximum number of results per query.
+        :param window_size: The number of bytes a shard scans between two cancellation checks.
+        :param normalizer: The normalizer applied to the records and queries, its normalized text is searched.
+        """
+        self.records = records
+        self.shards = max(1, shards or os.cpu_count() or 1)
+        self.max_elements = max_elements
+        self.window_size = window_size
+        self.normalizer = normalizer or default_normalizer
+        text_fn = text_fn or str
+        encoded = [self.normalizer.normalize(text_fn(record)).replace('\n', ' ').encode('utf-8') for record in records]
+        offsets = array('Q', [0])
+        offsets.extend(itertools.accumulate(len(text) + 1 for text in encoded))
+        self._data = SharedMemory(create=True, size=max(1, offsets[-1]))
+        position = 0
+        for text in encoded:
+            self._data.buf[position:position + len(text)] = text
+            self._data.buf[position + len(text)] = 10  # line break, a query can never match across records
+            position += len(text) + 1
+        self._offsets = SharedMemory(create=True, size=len(offsets) * 8)
+        self._offsets.buf[:len(offsets) * 8] = offsets.tobytes()
+        self._board = SharedMemory(create=True, size=_CANCEL_SLOTS * 8)
+        self._board_view = self._board.buf[:_CANCEL_SLOTS * 8].cast('Q')
+        self._query_ids = itertools.count(1)
+        self._lock = Lock()
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.shards,
+            initializer=_init_worker,
+            initargs=(self._data.name, self._offsets.name, self._board.name, len(records)),
+        )
+
+    def __call__(self, query: str) -> 'ShardedSearchTask':
+        return ShardedSearchTask(self, query, max_elements=self.max_elements)
+
+    def __enter__(self) -> 'ShardedSearch':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def shard_ranges(self) -> Iterable[tuple[int, int]]:
+        """Get the record ranges of all shards."""
+        count = len(self.records)
+        size = -(-count // self.shards) if count else 0
+        return [(first, min(first + size, count)) for first in range(0, count, size)] if size else []
+
+    def begin_query(self) -> tuple[int, int]:
+        """Reserve a cancellation slot for a new query."""
+        with self._lock:
+            query_id = next(self._query_ids)
+            slot = query_id % _CANCEL_SLOTS
+            self._board_view[slot] = query_id
+        return slot, query_id
+
+    def cancel_query(self, slot: int, query_id: int) -> None:
+        """Signal all shards working on the query to stop."""
+        with self._lock:
+            if self._board_view[slot] == query_id:
+                self._board_view[slot] = 0
+
+    def submit(self, query: str, slot: int, query_id: int, limit: int) -> list[Future]:
+        """Fan out a query to all shards."""
+        needle = self.normalizer.normalize(query).encode('utf-8')
+        return [self._executor.submit(_search_shard, needle, first, last, limit, slot, query_id, self.window_size)
+                for first, last in self.shard_ranges()]
+
+    def close(self) -> None:
+        """Stop the workers and release the shared memory."""
+        self._executor.shutdown(wait=True, cancel_futures=True)
+        self._board_view.release()
+        for memory in (self._data, self._offsets, self._board):
+            memory.close()
+            memory.unlink()
+
+
+class ShardedSearchTask(SearchTask):
+    """Search task fanning out its query to all shards of a ShardedSearch.
+
+    Cancelling the task, e.g. because the TaskExecutor superseded it, stops the scan in every shard.
+    """
+
+    def __init__(self, engine: ShardedSearch, query: str, max_elements: int = -1, poll_interval: float = 0.01):
+        super().__init__(query=query, max_elements=max_elements)
+        self._engine = engine
+        self._poll_interval = poll_interval
+        self._slot: tuple[int, int] | None = None
+
+    def cancel(self) -> None:
+        super().cancel()
+        if self._slot is not None:
+            self._engine.cancel_query(*self._slot)
+
+    def execute(self):
+        if not self._query:
+            return
+        engine = self._engine
+        limit = self.max_elements + 1 if self.max_elements != -1 else len(engine.records)
+        self._slot = engine.begin_query()
+        try:
+            pending = set(engine.submit(self._query, *self._slot, limit))
+            shard_results = []
+            while pending:
+                if self.is_cancelled:
+                    return
+                done, pending = wait(pending, timeout=self._poll_interval, return_when=FIRST_COMPLETED)
+                shard_results.extend(future.result() for future in done)
+            best = heapq.nlargest(limit, itertools.chain.from_iterable(top for _, top in shard_results))
+            self.total_elements = sum(count for count, _ in shard_results)
+            self.set_elements([engine.records[-negative_id] for _, negative_id in best])
+        finally:
+            engine.cancel_query(*self._slot)
@@ -1,7 +1,10 @@
+import asyncio
 from abc import ABC, abstractmethod
 from threading import Event
 from typing import Any, Generic, TypeVar
 
+from .task_profiler import profiler
+
 class Task:
     """Base class for asynchronous tasks.
     
@@ -10,6 +13,10 @@ class Task:
 
     You need to implement either execute or execute_async, depending on your needs.
     """
+
+    executor: str | None = None
+    """The name of the executor running the task if it is sync, see ExecutorRegistry. None selects it by type."""
+
     def __init__(self):
         self._cancel_event = Event()
         self._is_done = Event()
@@ -29,6 +36,18 @@ class Task:
         """
         raise NotImplementedError()
 
+    def post_process(self):
+        """Post-process the results in the worker after a successful execution, e.g. to prepare them for rendering.
+
+        Only called if requires_post_processing is True. Async tasks run it with their executor, see ExecutorRegistry.
+        """
+        pass
+
+    @property
+    def requires_post_processing(self) -> bool:
+        """Check if post_process needs to be called after the execution."""
+        return False
+
     @property
     def is_cancelled(self) -> bool:
         """Check if the task has been cancelled."""
@@ -53,6 +72,11 @@ class Task:
         """Request cancellation of the task."""
         self._cancel_event.set()
 
+    def reject(self, error: Exception) -> None:
+        """Complete the task with an error without executing it, e.g. because its executor is busy."""
+        self._error = error
+        self._is_done.set()
+
     @property
     def is_async(self) -> bool:
         """Check if the task is executed asynchronously."""
@@ -66,20 +90,31 @@ class Task:
     
     def run(self) -> None:
         """Run the task and store its result or error."""
+        profile = profiler.start(self)
         try:
             if not self.is_cancelled:
                 self.execute()
+                if self.requires_post_processing and not self.is_cancelled:
+                    self.post_process()
         except Exception as e:
             self._error = e
         finally:
             self._is_done.set()
+            if profile is not None:
+                profiler.finish(profile)
 
     async def run_async(self) -> None:
         """Run the task asynchronously and store its result or error."""
+        profile = profiler.start(self)
         try:
             if not self.is_cancelled:
                 await self.execute_async()
+                if self.requires_post_processing and not self.is_cancelled:
+                    from .executors import executors  # executors depends on this module
+                    await asyncio.wrap_future(executors.for_task(self).submit(self.post_process))
         except Exception as e:
             self._error = e
         finally:
             self._is_done.set()
+            if profile is not None:
+                profiler.finish(profile)
@@ -1,21 +1,33 @@
 import asyncio
-from typing import Generic, TypeVar
+from typing import Any, Callable, Generic, TypeVar
 from threading import Thread
-from nicegui import background_tasks, ui, run
+from nicegui import background_tasks, ui
 
+from nice_droplets.components.executors import executors
 from nice_droplets.components.task import Task
 
 class TaskExecutor:
     """Executes tasks with debouncing"""
 
-    def __init__(self, debounce: float = 0.3, max_pending_tasks: int = 2):
+    def __init__(self, debounce: float = 0.3, max_pending_tasks: int = 2,
+                 timer: Callable[..., ui.timer] | None = None):
+        """Initialize the executor.
+
+        :param debounce: The time in seconds a task waits for a newer one before it is executed.
+        :param max_pending_tasks: The number of superseded but still running tasks after which new tasks wait.
+        :param timer: Factory of the debounce timer with the signature of ui.timer, which is used by default.
+            Other timers run outside of NiceGUI, e.g. in headless replays, so async tasks are started with asyncio.
+        """
         self._debounce = debounce
         self._current_task: Task | None = None
         self._current_task_started = False
         self._previous_tasks: list[Task | None] = []
         self._max_pending_tasks = max_pending_tasks
         self._pending_tasks_sleep_interval = 0.02
-        self._timer = ui.timer(
+        self._executions = 0
+        self._headless = timer is not None
+        self._running: set[asyncio.Future] = set()
+        self._timer = (timer or ui.timer)(
             self._debounce,
             self._execute_current_task,
             active=False,
@@ -41,6 +53,8 @@ class TaskExecutor:
 
     async def _execute_current_task(self) -> None:
         """Start task in thread or run async based on implementation"""
+        self._timer.deactivate()  # the timer repeats, but each task is executed once
+        scheduled = self._current_task
         while len(self._previous_tasks) >= self._max_pending_tasks:
             # sleep and wait for more tasks to be executed
             await asyncio.sleep(self._pending_tasks_sleep_interval)
@@ -48,13 +62,36 @@ class TaskExecutor:
                 if task.is_done:
                     self._previous_tasks.remove(task)
                     break
-        if self._current_task:
+        if self._current_task is not None and self._current_task is scheduled:  # else superseded while waiting
             self._current_task_started = True
+            self._executions += 1
             # Check if execute_async is overridden
-            if self._current_task.is_async:
+            if self._current_task.is_async and self._headless:
+                runner = asyncio.ensure_future(self._current_task.run_async())
+                self._running.add(runner)
+                runner.add_done_callback(self._running.discard)
+            elif self._current_task.is_async:
                 background_tasks.create(self._current_task.run_async())
             else:
-                run.thread_pool.submit(self._current_task.run)
+                executors.run_task(self._current_task)
+
+    def cleanup(self) -> dict[str, int]:
+        """Cancel all tasks and stop the timer, e.g. once the client disconnected.
+
+        :return: The number of cancelled tasks and stopped timers.
+        """
+        tasks = [task for task in [self._current_task, *self._previous_tasks] if task is not None and not task.is_done]
+        for task in tasks:
+            task.cancel()
+        self._current_task = None
+        self._previous_tasks = []
+        self._timer.cancel()
+        return {'tasks': len(tasks), 'timers': 1}
+
+    @property
+    def executions(self) -> int:
+        """The number of tasks which were started, the others were superseded during the debounce time"""
+        return self._executions
 
     @property
     def current_task(self) -> Task | None:
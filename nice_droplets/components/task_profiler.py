@@ -0,0 +1,198 @@
+"""Opt-in profiling of individual task executions, e.g. of the searches for a slow query."""
+
+import cProfile
+import json
+import logging
+import os
+import random
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from types import FrameType
+from typing import Any, Callable
+
+from .metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+
+class ProfileSession:
+    """The profiling of a single task execution."""
+
+    def __init__(self, task: Any, frame: FrameType, mode: str):
+        self.task = task
+        self.frame = frame
+        self.mode = mode
+        self.thread_id = threading.get_ident()
+        self.started = time.monotonic()
+        self.stacks: Counter = Counter()
+        self.profile: cProfile.Profile | None = None
+
+
+class TaskProfiler:
+    """Profiles a fraction of the task executions, or those matching a predicate, and writes one file per execution.
+
+    In the 'pstats' mode sync tasks are profiled deterministically with cProfile and written as ``.prof`` file.
+    In the 'collapsed' mode, and for async tasks in general as cProfile would also record the callbacks interleaved
+    on the event loop, the stack of the task is sampled in the given interval and written in the collapsed stack
+    format (``.folded``) understood by flamegraph.pl and speedscope. Each file is accompanied by a ``.json`` file
+    with the task type, query, duration and outcome.
+
+    Profiling is disabled by default, enable it with e.g.
+    ``profiler.enable('profiles', predicate=lambda task: 'invoice' in (task.query or ''))``.
+    """
+
+    def __init__(self):
+        self.directory: Path | None = None
+        self.fraction = 0.0
+        self.predicate: Callable[[Any], bool] | None = None
+        self.mode = 'pstats'
+        self.interval = 0.001
+        self.min_duration = 0.0
+        self._sessions: dict[int, ProfileSession] = {}
+        self._lock = threading.Lock()
+        self._sampler: threading.Thread | None = None
+        self._counter = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.directory is not None
+
+    def enable(
+        self,
+        directory: str | Path,
+        *,
+        fraction: float = 0.0,
+        predicate: Callable[[Any], bool] | None = None,
+        mode: str = 'pstats',
+        interval: float = 0.001,
+        min_duration: float = 0.0,
+    ) -> None:
+        """Start profiling task executions.
+
+        :param directory: The directory the profiles are written to, created if missing.
+        :param fraction: The fraction (0-1) of all executions to profile.
+        :param predicate: Optional function receiving the task, executions for which it returns True are profiled
+            in addition to the fraction.
+        :param mode: Either 'pstats' or 'collapsed'.
+        :param interval: The sampling interval in seconds of the 'collapsed' mode.
+        :param min_duration: Profiles of executions faster than this number of seconds are discarded.
+        """
+        if mode not in ('pstats', 'collapsed'):
+            raise ValueError(f'Unknown profiling mode {mode!r}')
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.fraction = fraction
+        self.predicate = predicate
+        self.mode = mode
+        self.interval = interval
+        self.min_duration = min_duration
+
+    def disable(self) -> None:
+        """Stop profiling, executions already being profiled are still written."""
+        self.directory = None
+
+    def start(self, task: Any) -> ProfileSession | None:
+        """Start profiling the execution of a task if it is selected, called by Task.run and Task.run_async.
+
+        :return: The session to pass to finish, None if the task is not profiled.
+        """
+        if self.directory is None or not self._is_selected(task):
+            return None
+        mode = 'collapsed' if self.mode == 'collapsed' or task.is_async else 'pstats'
+        session = ProfileSession(task, sys._getframe(1), mode)
+        if mode == 'pstats':
+            session.profile = cProfile.Profile()
+            try:
+                session.profile.enable()
+            except ValueError:  # another profiler is already active in this thread
+                return None
+        else:
+            with self._lock:
+                self._sessions[id(session)] = session
+                if self._sampler is None:
+                    self._sampler = threading.Thread(target=self._sample, name='nd-task-profiler', daemon=True)
+                    self._sampler.start()
+        return session
+
+    def finish(self, session: ProfileSession) -> None:
+        """Stop profiling and write the profile, must be called in the thread which started the session."""
+        duration = time.monotonic() - session.started
+        if session.profile is not None:
+            session.profile.disable()
+        else:
+            with self._lock:
+                self._sessions.pop(id(session), None)
+        if duration < self.min_duration:
+            return
+        try:
+            self._write(session, duration)
+        except OSError:
+            logger.exception('Could not write the profile of %s', type(session.task).__name__)
+
+    def _is_selected(self, task: Any) -> bool:
+        if self.fraction and random.random() < self.fraction:
+            return True
+        if self.predicate is None:
+            return False
+        try:
+            return bool(self.predicate(task))
+        except Exception:
+            logger.exception('The profiling predicate failed')
+            return False
+
+    def _sample(self) -> None:
+        while True:
+            time.sleep(self.interval)
+            with self._lock:
+                if not self._sessions:
+                    self._sampler = None
+                    return
+                sessions = list(self._sessions.values())
+            frames = sys._current_frames()
+            for session in sessions:
+                stack = _task_stack(frames.get(session.thread_id), session.frame)
+                if stack:
+                    session.stacks[stack] += 1
+
+    def _write(self, session: ProfileSession, duration: float) -> None:
+        directory = self.directory or Path('.')
+        with self._lock:
+            self._counter += 1
+            name = f'{time.strftime("%Y%m%d-%H%M%S")}-{type(session.task).__name__}-{self._counter}'
+        if session.profile is not None:
+            session.profile.dump_stats(directory / f'{name}.prof')
+        else:
+            with open(directory / f'{name}.folded', 'w', encoding='utf-8') as file:
+                file.writelines(f'{stack} {count}\n' for stack, count in session.stacks.items())
+        task = session.task
+        info = {
+            'task': type(task).__name__,
+            'query': getattr(task, 'query', None),
+            'duration': duration,
+            'mode': session.mode,
+            'samples': sum(session.stacks.values()) if session.profile is None else None,
+            'cancelled': task.is_cancelled,
+            'error': repr(task.error) if task.error is not None else None,
+        }
+        with open(directory / f'{name}.json', 'w', encoding='utf-8') as file:
+            json.dump(info, file, indent=2)
+        metrics.increment('task_profiler.profiles', task=info['task'])
+
+
+def _task_stack(frame: FrameType | None, root: FrameType) -> str | None:
+    """Format the stack from root to frame in the collapsed format, None if root is not on the stack."""
+    names: list[str] = []
+    current = frame
+    while current is not None:
+        code = current.f_code
+        names.append(f'{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})')
+        if current is root:
+            return ';'.join(reversed(names))
+        current = current.f_back
+    return None
+
+
+profiler = TaskProfiler()
@@ -0,0 +1,189 @@
+"""Per client counters of the websocket messages and bytes caused by each keystroke."""
+
+import asyncio
+import json
+import logging
+import weakref
+from typing import Any, Callable
+
+from nicegui import Client, core
+
+from .metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+
+class TrafficMeter:
+    """Counts the messages and bytes exchanged with each client and relates them to the keystrokes of the user.
+
+    Install it for a client with ``traffic.install(client)``, components report keystrokes with
+    ``traffic.keystroke(client)``. The traffic between two keystrokes is attributed to the first one, its message
+    count and size are observed as ``typeahead.messages_per_keystroke`` and ``typeahead.bytes_per_keystroke``
+    and checked against the optional budget.
+
+    NiceGUI offers no public per-client message hook, so while at least one client is metered the emit method and
+    the event handler of NiceGUI's socket.io server are wrapped, see _SocketHooks. Messages of other clients pass
+    through unchanged and the originals are restored once the last metered client is uninstalled or deleted.
+    If the server can not be hooked, e.g. after an incompatible upgrade, a warning is logged and supported is False.
+    """
+
+    def __init__(self, max_messages: int | None = None, max_bytes: int | None = None):
+        """Initialize the meter.
+
+        :param max_messages: Optional budget of messages per keystroke, in both directions.
+        :param max_bytes: Optional budget of bytes per keystroke, in both directions.
+        """
+        self.max_messages = max_messages
+        self.max_bytes = max_bytes
+        self._statistics: weakref.WeakKeyDictionary[Client, dict[str, int]] = weakref.WeakKeyDictionary()
+        self._clients: weakref.WeakValueDictionary[str, Client] = weakref.WeakValueDictionary()
+        self._supported: bool | None = None
+
+    @property
+    def supported(self) -> bool | None:
+        """Whether the traffic can be counted, None until the first client was installed."""
+        return self._supported
+
+    def install(self, client: Client) -> None:
+        """Count the traffic of a client until it is deleted, installing twice has no effect."""
+        if client in self._statistics:
+            return
+        self._statistics[client] = {'keystrokes': 0, 'messages_in': 0, 'messages_out': 0, 'bytes_in': 0,
+                                    'bytes_out': 0, 'window_messages': 0, 'window_bytes': 0, 'over_budget': 0}
+        self._clients[client.id] = client
+        client.on_delete(lambda: self.uninstall(client))
+        self._supported = _socket_hooks.add(self)
+
+    def uninstall(self, client: Client) -> None:
+        """Stop counting the traffic of a client, the server is unhooked once no client is metered anymore."""
+        self._statistics.pop(client, None)
+        self._clients.pop(client.id, None)
+        if not self._clients:
+            _socket_hooks.remove(self)
+
+    def keystroke(self, client: Client) -> None:
+        """Report a keystroke, closing the traffic window of the previous one."""
+        statistics = self._statistics.get(client)
+        if statistics is None:
+            return
+        if statistics['keystrokes']:
+            self._close_window(statistics)
+        statistics['keystrokes'] += 1
+        statistics['window_messages'] = 0
+        statistics['window_bytes'] = 0
+
+    def statistics(self, client: Client) -> dict[str, float]:
+        """Get the totals of a client and the average messages and bytes per keystroke."""
+        statistics = self._statistics.get(client)
+        if statistics is None:
+            return {}
+        keystrokes = statistics['keystrokes'] or 1
+        messages = statistics['messages_in'] + statistics['messages_out']
+        size = statistics['bytes_in'] + statistics['bytes_out']
+        return {
+            **{key: value for key, value in statistics.items() if not key.startswith('window_')},
+            'messages_per_keystroke': messages / keystrokes,
+            'bytes_per_keystroke': size / keystrokes,
+        }
+
+    def _record(self, client_id: Any, direction: str, data: Any) -> None:
+        client = self._clients.get(client_id) if isinstance(client_id, str) else None
+        statistics = self._statistics.get(client) if client is not None else None
+        if statistics is None:
+            return  # not a metered client
+        size = len(json.dumps(data, default=str))
+        statistics[f'messages_{direction}'] += 1
+        statistics[f'bytes_{direction}'] += size
+        statistics['window_messages'] += 1
+        statistics['window_bytes'] += size
+
+    def _close_window(self, statistics: dict[str, int]) -> None:
+        messages, size = statistics['window_messages'], statistics['window_bytes']
+        metrics.observe('typeahead.messages_per_keystroke', messages)
+        metrics.observe('typeahead.bytes_per_keystroke', size)
+        if (self.max_messages is not None and messages > self.max_messages) or \
+                (self.max_bytes is not None and size > self.max_bytes):
+            statistics['over_budget'] += 1
+            metrics.increment('typeahead.keystrokes_over_budget')
+            logger.warning('keystroke caused %d messages with %d bytes, exceeding the budget', messages, size)
+
+
+class _SocketHooks:
+    """Wraps the emit method and the 'event' handler of NiceGUI's socket.io server while meters need them.
+
+    The handler is replaced using python-socketio's public on method, but reading the original one requires its
+    handlers registry, which is an implementation detail of python-socketio.
+    """
+
+    def __init__(self):
+        self._meters: set[TrafficMeter] = set()
+        self._sio: Any = None
+        self._emit: Callable[..., Any] | None = None
+        self._emit_was_patched = False
+        self._handle_event: Callable[..., Any] | None = None
+        self._counting_handler: Callable[..., Any] | None = None
+        self._unsupported = False
+
+    def add(self, meter: TrafficMeter) -> bool:
+        """Hook the server for a meter, return False if it can not be hooked."""
+        if self._unsupported or (self._sio is None and not self._hook()):
+            return False
+        self._meters.add(meter)
+        return True
+
+    def remove(self, meter: TrafficMeter) -> None:
+        """Restore the original emit method and handler once no meter needs them anymore."""
+        self._meters.discard(meter)
+        if self._meters or self._sio is None:
+            return
+        sio = self._sio
+        if sio.emit == self._counting_emit:  # else it was wrapped again by someone else, which keeps our wrapper
+            if self._emit_was_patched:
+                sio.emit = self._emit
+            else:
+                del sio.emit
+        if sio.handlers.get('/', {}).get('event') == self._counting_handler:
+            sio.on('event', self._handle_event)
+        self._sio = self._emit = self._handle_event = self._counting_handler = None
+
+    def _hook(self) -> bool:
+        sio = getattr(core, 'sio', None)
+        handle_event = getattr(sio, 'handlers', {}).get('/', {}).get('event')
+        if sio is None or handle_event is None or not hasattr(sio, 'on'):
+            logger.warning('the websocket traffic can not be counted with this NiceGUI version')
+            metrics.increment('typeahead.traffic_unsupported')
+            self._unsupported = True
+            return False
+        self._sio = sio
+        self._emit = sio.emit
+        self._emit_was_patched = 'emit' in vars(sio)
+        self._handle_event = handle_event
+        # python-socketio only awaits handlers which are coroutine functions
+        self._counting_handler = self._counting_handle_event_async if asyncio.iscoroutinefunction(handle_event) \
+            else self._counting_handle_event
+        sio.emit = self._counting_emit
+        sio.on('event', self._counting_handler)
+        return True
+
+    async def _counting_emit(self, event: str, data: Any = None, *args: Any, **kwargs: Any) -> Any:
+        for meter in tuple(self._meters):
+            meter._record(kwargs.get('room', kwargs.get('to')), 'out', data)
+        return await self._emit(event, data, *args, **kwargs)
+
+    def _counting_handle_event(self, sid: str, message: Any, *args: Any) -> Any:
+        self._record_event(message)
+        return self._handle_event(sid, message, *args)
+
+    async def _counting_handle_event_async(self, sid: str, message: Any, *args: Any) -> Any:
+        self._record_event(message)
+        return await self._handle_event(sid, message, *args)
+
+    def _record_event(self, message: Any) -> None:
+        client_id = message.get('client_id') if isinstance(message, dict) else None
+        for meter in tuple(self._meters):
+            meter._record(client_id, 'in', message)
+
+
+_socket_hooks = _SocketHooks()
+
+traffic = TrafficMeter()
@@ -5,6 +5,7 @@ from .elements.list import List as list
 from .elements.popover import Popover as popover
 from .elements.typeahead import Typeahead as typeahead
 from .elements.flex_list import FlexList as flex_list
+from .elements.local_list import LocalList as local_list
 
 __all__ = [
     "item",
@@ -14,4 +15,5 @@ __all__ = [
     "popover",
     "typeahead",
     "flex_list",
+    "local_list",
 ]
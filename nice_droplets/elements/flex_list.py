@@ -5,8 +5,9 @@ from nicegui import ui
 from nicegui.events import UiEventArguments, Handler, handle_event, GenericEventArguments
 from nicegui.dataclasses import KWONLY_SLOTS
 
-from nice_droplets.factories import FlexListFactory, FlexDefaultFactory
+from nice_droplets.factories import FlexListFactory, FlexDefaultFactory, FlexAdaptiveFactory
 from nice_droplets.components.hot_key_handler import HotKeyHandler
+from nice_droplets.components.metrics import metrics
 from nice_droplets.events import SearchListContentUpdateEventArguments, FlexListItemClickedArguments, FlexFactoryItemClickedArguments
 
 
@@ -16,6 +17,9 @@ class FlexList(ui.element):
                  factory: Optional[FlexListFactory] = None,
                  on_content_update: Handler[SearchListContentUpdateEventArguments] | None = None,
                  on_select: Handler[FlexListItemClickedArguments] | None = None,
+                 first_paint: int | None = None,
+                 batch_size: int = 50,
+                 modes: list[tuple[int | None, FlexListFactory]] | None = None,
                  ):
         """FlexList
 
@@ -25,13 +29,20 @@ class FlexList(ui.element):
         :param factory: Factory to use for creating the flex views.
         :param on_content_update: Handler for content update events.
         :param on_select: Handler for select events.
+        :param first_paint: If provided, only this many items are created immediately and the remaining ones
+            in batches during the following event loop ticks (see FlexListFactory.progressive).
+        :param batch_size: The number of items created per batch in progressive mode.
+        :param modes: If provided instead of a factory, pairs of the maximum number of items and the factory
+            rendering them, so the rendering switches with the result size (see FlexAdaptiveFactory).
         """
         super().__init__()
         self._content_update_handlers = [on_content_update] if on_content_update else []
         self._select_handlers = [on_select] if on_select else []
         self._items: list[Any] = items or []
-        self._view_factory = factory or FlexDefaultFactory()
+        self._view_factory = factory or (FlexAdaptiveFactory(modes) if modes else FlexDefaultFactory())
         self._view_factory.on_click(self._handle_item_click)
+        if first_paint is not None:
+            self._view_factory.progressive(first_paint, batch_size)
         self._container = self._view_factory.create_container()
         self._props['container_id'] = self._container.id
         
@@ -53,6 +64,11 @@ class FlexList(ui.element):
         if items:
             self.update_items(items)
 
+    @property
+    def factory(self) -> FlexListFactory:
+        """The factory rendering the items"""
+        return self._view_factory
+
     @property
     def items(self) -> list[Any]:
         return self._items
@@ -111,23 +127,54 @@ class FlexList(ui.element):
 
     def _confirm_current(self) -> None:
         """Select the currently highlighted item."""
-        if 0 <= self._view_factory.index < len(self._items):
-            element = self._view_factory._item_elements[self._view_factory.index] if self._view_factory._item_elements else None
-            self._handle_item_click(FlexFactoryItemClickedArguments(sender=self, item=self._items[self._view_factory.index], index=self._view_factory.index, element=element))
+        index = self._view_factory.index
+        if 0 <= index < len(self._items):
+            # None while rendering progressively or if the factory does not create an element per item
+            element = self._view_factory.element_at(index)
+            self._handle_item_click(FlexFactoryItemClickedArguments(sender=self, item=self._items[index], index=index, element=element))
 
     def _handle_item_click(self, e: FlexFactoryItemClickedArguments) -> None:
         """Handle item click events."""
+        if self._view_factory.is_item_disabled(e.item):
+            return
         for handler in self._select_handlers:
             handle_event(handler, FlexListItemClickedArguments(sender=self, client=self.client, item=e.item, index=e.index, element=e.element))
 
-    def update_items(self, items: list[Any]) -> None:
-        """Update the list of items"""
+    def update_items(self, items: list[Any], view_models: list[Any] | None = None) -> None:
+        """Update the list of items
+
+        :param items: The items to display.
+        :param view_models: The view models of the items if they were already prepared by the factory's prepare_items.
+        """
         self._items = items
         self._current_index = -1
-        self._view_factory.update_items(items)
+        if view_models is not None:
+            self._view_factory.update_items(items, view_models=view_models)
+        else:
+            self._view_factory.update_items(items)
+        self._notify_content_update(items)
+
+    def _notify_content_update(self, items: list[Any]) -> None:
         for handler in self._content_update_handlers:
             handle_event(handler, SearchListContentUpdateEventArguments(sender=self, client=self.client, items=items))
 
+    def cleanup(self) -> dict[str, int]:
+        """Release the items, elements and handlers held by the list.
+
+        :return: The number of released resources by kind.
+        """
+        reclaimed = {'elements': self._view_factory.release()}
+        self._items = []
+        self._content_update_handlers = []
+        self._select_handlers = []
+        return reclaimed
+
+    def _handle_delete(self) -> None:
+        # one sample per deleted list, so the distribution shows how much each session left behind
+        for kind, count in self.cleanup().items():
+            metrics.observe('session.reclaimed_resources', count, kind=kind)
+        super()._handle_delete()
+
     def clear_selection(self) -> None:
         """Clear the current selection."""
         self._view_factory.index = -1
@@ -137,5 +184,4 @@ class FlexList(ui.element):
         self._items = []
         self._current_index = -1
         self._view_factory.update_items([])        
-        for handler in self._content_update_handlers:
-            handle_event(handler, SearchListContentUpdateEventArguments(sender=self, client=self.client, items=[]))
+        self._notify_content_update([])
@@ -0,0 +1,194 @@
+export default {
+    template: `
+        <div class="flex flex-col min-w-[200px]">
+            <div
+                v-for="(result, position) in results"
+                :key="result"
+                :class="rowClasses(result, position)"
+                @mousedown.prevent
+                @click="confirm(position)"
+                v-html="highlight(records[result][0])"
+            ></div>
+        </div>
+    `,
+    props: {
+        datasetKey: String,
+        maxElements: Number,
+        popoverId: Number,
+    },
+    data() {
+        return {
+            records: [],
+            results: [],
+            index: -1,
+            listeners: {},
+            tokens: [],
+            activeTarget: null,
+            shown: false,
+        }
+    },
+    mounted() {
+        this.loadRecords();
+    },
+    beforeUnmount() {
+        Object.keys(this.listeners).forEach(key => this.detach(key));
+    },
+    watch: {
+        datasetKey() {
+            this.loadRecords();
+        }
+    },
+    methods: {
+        loadRecords() {
+            let cached = null;
+            try {
+                cached = localStorage.getItem('ndLocalList:' + this.datasetKey);
+            } catch (e) {
+            }
+            if (cached) {
+                this.records = JSON.parse(cached);
+            } else {
+                this.records = [];
+                this.$emit('_request_records', {key: this.datasetKey});
+            }
+        },
+        setRecords(records, key) {
+            if (key !== this.datasetKey) {
+                return;
+            }
+            this.records = records;
+            try {
+                localStorage.setItem('ndLocalList:' + key, JSON.stringify(records));
+            } catch (e) {
+                // quota exceeded, the records are requested again after the next page load
+            }
+        },
+        attach(elementId) {
+            const element = getHtmlElement(elementId);
+            if (!element) {
+                return;
+            }
+            const inputHandler = event => {
+                this.activeTarget = elementId;
+                this.filter(event.target.value || '');
+            };
+            const keyHandler = event => this.handleKey(event);
+            element.addEventListener('input', inputHandler);
+            element.addEventListener('keydown', keyHandler);
+            this.listeners[elementId] = {input: inputHandler, keydown: keyHandler};
+        },
+        detach(elementId) {
+            const element = getHtmlElement(elementId);
+            const handlers = this.listeners[elementId];
+            if (element && handlers) {
+                for (const eventName in handlers) {
+                    element.removeEventListener(eventName, handlers[eventName]);
+                }
+            }
+            delete this.listeners[elementId];
+        },
+        normalize(text) {
+            // mirrors the default Normalizer of the server which normalized the record texts
+            return text.normalize('NFKD').replace(/\p{M}/gu, '').normalize('NFC').toLowerCase().replace(/ß/g, 'ss');
+        },
+        filter(query) {
+            const normalized = this.normalize(query.trim());
+            this.tokens = normalized.split(/[^\p{L}\p{N}_]+/u).filter(token => token);
+            this.index = -1;
+            if (!this.tokens.length) {
+                this.results = [];
+                this.updatePopover();
+                return;
+            }
+            const scored = [];
+            for (let i = 0; i < this.records.length; i++) {
+                const text = this.records[i][1];
+                const score = this.score(text, normalized);
+                if (score >= 0) {
+                    scored.push([score, i]);
+                }
+            }
+            scored.sort((a, b) => a[0] - b[0] || a[1] - b[1]);
+            this.results = scored.slice(0, this.maxElements).map(pair => pair[1]);
+            this.updatePopover();
+        },
+        score(text, query) {
+            if (text === query) {
+                return 0;
+            }
+            if (text.startsWith(query)) {
+                return 1;
+            }
+            const words = text.split(/[^\p{L}\p{N}_]+/u);
+            let score = 2;
+            for (const token of this.tokens) {
+                if (words.some(word => word.startsWith(token))) {
+                    continue;
+                }
+                if (!text.includes(token)) {
+                    return -1;
+                }
+                score = 3;
+            }
+            return score;
+        },
+        highlight(label) {
+            let escaped = label.replace(/[&<>"']/g, c => ({'&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;', "'": '&#39;'})[c]);
+            if (!this.tokens.length) {
+                return escaped;
+            }
+            const pattern = this.tokens.map(token => token.replace(/[.*+?^${}()|[\]\\]/g, '\\$&')).join('|');
+            return escaped.replace(new RegExp(`(${pattern})`, 'gi'), '<mark>$1</mark>');
+        },
+        rowClasses(result, position) {
+            if (this.records[result][2]) {
+                return 'px-3 py-1 cursor-not-allowed opacity-50';
+            }
+            return position === this.index ? 'px-3 py-1 cursor-pointer bg-primary text-white'
+                : 'px-3 py-1 cursor-pointer hover:bg-gray-100';
+        },
+        handleKey(event) {
+            if (!this.results.length) {
+                return;
+            }
+            if (event.key === 'ArrowDown') {
+                this.index = (this.index + 1) % this.results.length;
+            } else if (event.key === 'ArrowUp') {
+                this.index = this.index <= 0 ? this.results.length - 1 : this.index - 1;
+            } else if (event.key === 'Enter') {
+                this.confirm(this.index);
+            } else if (event.key === 'Escape') {
+                this.results = [];
+                this.updatePopover();
+            } else {
+                return;
+            }
+            event.preventDefault();
+        },
+        confirm(position) {
+            if (position < 0 || position >= this.results.length) {
+                return;
+            }
+            const result = this.results[position];
+            if (this.records[result][2]) {
+                return;
+            }
+            this.results = [];
+            this.tokens = [];
+            this.updatePopover();
+            this.$emit('select', {index: result});
+        },
+        updatePopover() {
+            const popover = this.popoverId === undefined ? null : getElement(this.popoverId);
+            const shown = this.results.length > 0;
+            if (!popover || shown === this.shown) {
+                return;
+            }
+            this.shown = shown;
+            popover.setKeepHidden(!shown);
+            if (shown && this.activeTarget !== null) {
+                popover.showAt(this.activeTarget);
+            }
+        },
+    }
+};
@@ -0,0 +1,99 @@
+import hashlib
+import json
+from typing import Any, Callable
+
+from nicegui.element import Element
+from nicegui.events import Handler, handle_event, GenericEventArguments
+
+from nice_droplets.components.metrics import metrics
+from nice_droplets.components.normalization import default_normalizer
+from nice_droplets.events import FlexListItemClickedArguments
+
+
+class LocalList(Element, component='local_list.js'):
+    """List filtering a small dataset entirely in the browser.
+
+    The searchable projection of the items is sent to the browser once and cached in its local storage, keyed by
+    a hash of the projection, so later page loads of the same dataset do not transfer it again. Filtering, ranking,
+    highlighting and keyboard navigation run in the browser, the server is only contacted once an item is selected.
+    """
+
+    def __init__(self,
+                 items: list[Any],
+                 *,
+                 to_string: Callable[[Any], str] | None = None,
+                 text_fn: Callable[[Any], str] | None = None,
+                 is_disabled: Callable[[Any], bool] | None = None,
+                 max_elements: int = 50,
+                 on_select: Handler[FlexListItemClickedArguments] | None = None,
+                 popover: Element | None = None,
+                 ):
+        """Initialize the local list.
+
+        :param items: The items to filter.
+        :param to_string: Function converting an item into the displayed label, by default str() is used.
+        :param text_fn: Function returning the searchable text of an item, by default the label.
+        :param is_disabled: Function checking if an item can not be selected.
+        :param max_elements: The maximum number of results shown.
+        :param on_select: Handler for select events.
+        :param popover: Optional popover which is kept hidden while there are no results.
+        """
+        super().__init__()
+        self._to_string = to_string or str
+        self._text_fn = text_fn
+        self._is_disabled = is_disabled or (lambda item: False)
+        self._select_handlers = [on_select] if on_select else []
+        self._items: list[Any] = []
+        self._records: list[list[Any]] = []
+        self._props['maxElements'] = max_elements
+        if popover is not None:
+            self._props['popoverId'] = popover.id
+        self.set_items(items)
+        self.on('_request_records', self._handle_request_records)
+        self.on('select', self._handle_select)
+
+    @property
+    def items(self) -> list[Any]:
+        return self._items
+
+    def set_items(self, items: list[Any]) -> None:
+        """Replace the dataset, the browser requests it once the key of the projection changed."""
+        self._items = list(items)
+        self._records = []
+        for item in self._items:
+            label = self._to_string(item)
+            text = self._text_fn(item) if self._text_fn else label
+            self._records.append([label, default_normalizer.normalize(text), bool(self._is_disabled(item))])
+        payload = json.dumps(self._records, separators=(',', ':'))
+        self._props['datasetKey'] = hashlib.sha1(payload.encode()).hexdigest()
+        self.update()
+
+    def get_item_string(self, item: Any) -> str:
+        return self._to_string(item)
+
+    def on_select(self, handler: Handler[FlexListItemClickedArguments]) -> None:
+        """Add select handler"""
+        self._select_handlers.append(handler)
+
+    def attach(self, element: Element) -> None:
+        """Filter the list by the input events of an element."""
+        self.run_method('attach', element.id)
+
+    def detach(self, element: Element) -> None:
+        """Stop filtering the list by the input events of an element."""
+        self.run_method('detach', element.id)
+
+    def _handle_request_records(self, e: GenericEventArguments) -> None:
+        if e.args.get('key') != self._props['datasetKey']:
+            return
+        metrics.increment('local_list.datasets_sent')
+        metrics.observe('local_list.dataset_bytes', len(json.dumps(self._records, separators=(',', ':'))))
+        self.run_method('setRecords', self._records, self._props['datasetKey'])
+
+    def _handle_select(self, e: GenericEventArguments) -> None:
+        index = e.args['index']
+        if not 0 <= index < len(self._items):
+            return
+        for handler in self._select_handlers:
+            handle_event(handler, FlexListItemClickedArguments(sender=self, client=self.client, item=self._items[index],
+                                                               index=index))
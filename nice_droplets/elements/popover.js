@@ -13,7 +13,8 @@ export default {
             listeners: {},
             observer: null,
             _currentTarget: null,
-            _keepHidden: False
+            _keepHidden: false,
+            emittedTarget: null
         }
     },
     props: {
@@ -187,6 +188,10 @@ export default {
             }
             this._currentTarget = targetElement
             this.moveToElement(targetElement);
+            if (this.emittedTarget === elementId) {
+                return;  // the server already knows the popover is shown at this target
+            }
+            this.emittedTarget = elementId
             this.$emit('_show', {
                 target: elementId
             })
@@ -194,8 +199,17 @@ export default {
         hide() {
             this._setVisible(false)
             this._currentTarget = null
+            if (this.emittedTarget === null) {
+                return;
+            }
+            this.emittedTarget = null
             this.$emit('_hide', {})
         },
+        runBatch(calls) {
+            for (const [name, args] of calls) {
+                this[name](...args);
+            }
+        },
         setKeepHidden(keepHidden) {
             this._keepHidden = keepHidden
             if(keepHidden) {
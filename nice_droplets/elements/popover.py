@@ -1,4 +1,5 @@
-from typing import Self
+import asyncio
+from typing import Any, Self
 import uuid
 
 from docutils.parsers.rst.states import state_classes
@@ -47,6 +48,8 @@ class Popover(Element, component='popover.js'):
         self._hide_handlers = [on_hide] if on_hide else []
         self._targets: dict[int, Element] = {}
         self._keepHidden = False
+        self._pending_calls: list[tuple[str, tuple[Any, ...]]] = []
+        self._flush_scheduled = False
         if observe_parent:
             self.observe(ui.context.slot.parent)
         self.on('_show', self._handle_show)
@@ -64,11 +67,11 @@ class Popover(Element, component='popover.js'):
 
     def show_at(self, target: Element):
         """Show the popover at the given target."""
-        self.run_method('showAt', target.id)
+        self._queue_method('showAt', target.id)
 
     def hide(self):
         """Hide the popover."""
-        self.run_method('hide')
+        self._queue_method('hide')
 
     @property
     def keep_hidden(self):
@@ -79,11 +82,11 @@ class Popover(Element, component='popover.js'):
         if state == self._keepHidden:
             return
         self._keepHidden = state
-        self.run_method('setKeepHidden', state)
+        self._queue_method('setKeepHidden', state)
 
     def observe(self, element: Element):
         """Observe an element for popover events."""
-        self.run_method('attachElement', element.id)
+        self._queue_method('attachElement', element.id)
         self._targets[element.id] = element
 
     def unobserve(self, element: Element):
@@ -91,7 +94,41 @@ class Popover(Element, component='popover.js'):
         if element.id not in self._targets:
             return
         del self._targets[element.id]
-        self.run_method('detachElement', element.id)
+        self._queue_method('detachElement', element.id)
+
+    def _queue_method(self, name: str, *args: Any) -> None:
+        """Call a method of the client component, batching all calls made during the same event loop tick.
+
+        Consecutive setKeepHidden calls are merged into the last one, calls in between keep their order.
+        """
+        if name == 'setKeepHidden' and self._pending_calls and self._pending_calls[-1][0] == name:
+            self._pending_calls[-1] = (name, args)
+        else:
+            self._pending_calls.append((name, args))
+        if self._flush_scheduled:
+            return
+        try:
+            asyncio.get_running_loop().call_soon(self._flush_calls)
+            self._flush_scheduled = True
+        except RuntimeError:
+            self._flush_calls()
+
+    def _flush_calls(self) -> None:
+        self._flush_scheduled = False
+        calls, self._pending_calls = self._pending_calls, []
+        if self.is_deleted or not calls:
+            return
+        if len(calls) == 1:
+            self.run_method(calls[0][0], *calls[0][1])
+        else:
+            self.run_method('runBatch', [[name, list(args)] for name, args in calls])
+
+    def _handle_delete(self) -> None:
+        self._pending_calls = []
+        self._targets.clear()
+        self._show_handlers = []
+        self._hide_handlers = []
+        super()._handle_delete()
 
     def _handle_show(self, e: GenericEventArguments) -> None:
         target = self._targets.get(e.args['target'], None)
@@ -0,0 +1,86 @@
+export default {
+    template: `<span style="display: none"></span>`,
+    props: {
+        containerId: Number,
+        capacity: Number,
+    },
+    data() {
+        return {
+            entries: new Map(),
+            listeners: {},
+            overlay: null,
+        }
+    },
+    beforeUnmount() {
+        Object.keys(this.listeners).forEach(key => this.detach(key));
+        this.removeOverlay();
+    },
+    methods: {
+        attach(elementId) {
+            const element = getHtmlElement(elementId);
+            if (!element) {
+                return;
+            }
+            const inputHandler = event => this.paint(event.target.value || '');
+            element.addEventListener('input', inputHandler);
+            this.listeners[elementId] = inputHandler;
+        },
+        detach(elementId) {
+            const element = getHtmlElement(elementId);
+            if (element && this.listeners[elementId]) {
+                element.removeEventListener('input', this.listeners[elementId]);
+            }
+            delete this.listeners[elementId];
+        },
+        paint(query) {
+            // show the cached results of a query until the server settled the results of it
+            const entry = this.entries.get(query);
+            const container = getHtmlElement(this.containerId);
+            if (!entry || !container) {
+                this.removeOverlay();
+                return;
+            }
+            this.entries.delete(query);
+            this.entries.set(query, entry);
+            if (!this.overlay) {
+                this.overlay = document.createElement('div');
+                container.after(this.overlay);
+            }
+            this.overlay.className = container.className;
+            this.overlay.innerHTML = entry.html;
+            this.overlay.querySelectorAll('[id]').forEach(node => node.removeAttribute('id'));
+            container.style.display = 'none';
+        },
+        settle(query, fingerprint) {
+            // the rendered results match the query now, so they replace the cached copy
+            this.removeOverlay();
+            const entry = this.entries.get(query);
+            if (entry && entry.fingerprint === fingerprint) {
+                this.entries.delete(query);
+                this.entries.set(query, entry);
+                return;
+            }
+            requestAnimationFrame(() => {
+                const container = getHtmlElement(this.containerId);
+                if (!container || !container.children.length) {
+                    return;
+                }
+                this.entries.delete(query);
+                this.entries.set(query, {html: container.innerHTML, fingerprint: fingerprint});
+                while (this.entries.size > this.capacity) {
+                    this.entries.delete(this.entries.keys().next().value);
+                }
+            });
+        },
+        removeOverlay() {
+            const container = getHtmlElement(this.containerId);
+            if (container) {
+                container.style.display = '';
+            }
+            if (this.overlay) {
+                this.overlay.remove();
+                this.overlay = null;
+            }
+        },
+    }
+};
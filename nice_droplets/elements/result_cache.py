@@ -0,0 +1,33 @@
+from nicegui.element import Element
+
+
+class ResultCache(Element, component='result_cache.js'):
+    """Browser side LRU cache of the rendered results of recent queries.
+
+    When the user returns to a cached query, e.g. by pressing backspace, the browser immediately shows a copy of
+    the results rendered for it before, until the server settled the actual results. The search list keeps the
+    final results of the same queries, so the server shows them again without searching and confirms their
+    fingerprint, which keeps the browser's copy without reading it again.
+    """
+
+    def __init__(self, container: Element, *, capacity: int = 20):
+        """Initialize the cache.
+
+        :param container: The element containing the rendered results.
+        :param capacity: The maximum number of cached queries.
+        """
+        super().__init__()
+        self._props['containerId'] = container.id
+        self._props['capacity'] = capacity
+
+    def attach(self, element: Element) -> None:
+        """Show cached results on the input events of an element."""
+        self.run_method('attach', element.id)
+
+    def detach(self, element: Element) -> None:
+        """Stop showing cached results on the input events of an element."""
+        self.run_method('detach', element.id)
+
+    def settle(self, query: str, fingerprint: str) -> None:
+        """Notify the browser that the container shows the results of a query."""
+        self.run_method('settle', query, fingerprint)
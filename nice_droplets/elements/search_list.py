@@ -1,7 +1,11 @@
-from typing import Any, Callable
+import hashlib
+from collections import OrderedDict
+from typing import Any, Callable, Sequence
 from nicegui.events import ValueChangeEventArguments, Handler
 
 from nice_droplets.components import SearchTask
+from nice_droplets.components.metrics import metrics
+from nice_droplets.components.normalization import default_normalizer
 from nice_droplets.components.search_manager import SearchManager, SearchResultHandler
 from nice_droplets.events import SearchListContentUpdateEventArguments
 from nice_droplets.factories import FlexListFactory
@@ -20,28 +24,55 @@ class SearchList(FlexList, SearchResultHandler):
                  on_select: Callable[[Any], None] | None = None,
                  on_content_update: Handler[SearchListContentUpdateEventArguments] | None = None,
                  poll_interval: float = 0.1,
-                 factory: FlexListFactory | None = None
+                 factory: FlexListFactory | None = None,
+                 first_paint: int | None = None,
+                 batch_size: int = 50,
+                 modes: list[tuple[int | None, FlexListFactory]] | None = None,
+                 cache_size: int = 0
                  ):
+        """Initialize the search list.
+
+        :param cache_size: The number of recent queries whose final results are kept. Returning to one of them,
+            e.g. by pressing backspace, shows its results immediately while they are searched again. They are only
+            rendered again if the fresh results differ. 0 disables the cache.
+        """
         super().__init__(
             on_select=on_select,
             on_content_update=on_content_update,
-            factory=factory
+            factory=factory,
+            first_paint=first_paint,
+            batch_size=batch_size,
+            modes=modes
         )
         self._on_search = on_search
-            
+        self._query = ''
+        self._fingerprint: str | None = _EMPTY_FINGERPRINT
+        self._cache_size = cache_size
+        self._cache: OrderedDict[str, tuple[Sequence[Any], list[Any] | None, str]] = OrderedDict()
+        self._revalidating = False
+
         self._search_manager = SearchManager(
             on_search=self._on_search,
             result_handler=self,
             min_chars=min_chars,
             debounce=debounce,
-            poll_interval=poll_interval
+            poll_interval=poll_interval,
+            view_model_fn=self._view_factory.prepare_items if self._view_factory.prepares_view_models else None,
+            fingerprint_fn=result_fingerprint
         )
 
     def set_search_query(self, query: str) -> None:
         """Handle input changes"""
+        self._query = query
+        self._revalidating = False
         if len(query) < self._search_manager._min_chars:
             self.items = []
             return
+        cached = self._cache.get(default_normalizer.key(query))
+        if cached is not None:
+            metrics.increment('search_list.cache_hits')
+            self.on_search_results(*cached)
+            self._revalidating = True  # the cached results stay visible until the fresh final ones arrive
         self._search_manager.handle_search(query)
 
     def on_search_started(self) -> None:
@@ -50,13 +81,71 @@ class SearchList(FlexList, SearchResultHandler):
 
     def on_search_error(self, error: Exception) -> None:
         """Called when a search fails."""
+        self._revalidating = False
         self.clear()
 
-    def on_search_results(self, results: list[Any]) -> None:
-        """Called when search results are available."""
-        self.update_items(results)
+    def on_search_results(self, results: Sequence[Any], view_models: list[Any] | None = None,
+                          fingerprint: str | None = None) -> None:
+        """Called when search results are available.
+
+        Final results equal to the rendered ones are not rendered again. The fingerprints of final results are
+        computed in the worker, partial results are rendered without comparing them, unless cached results
+        of the query are shown while it is searched again.
+        """
+        if fingerprint is None and self._revalidating:
+            return
+        self._revalidating = False
+        if fingerprint is not None and self._cache_size > 0:
+            key = default_normalizer.key(self._query)
+            self._cache[key] = (results, view_models, fingerprint)
+            self._cache.move_to_end(key)
+            while len(self._cache) > self._cache_size:
+                self._cache.popitem(last=False)
+        if results is self._items or (fingerprint is not None and fingerprint == self._fingerprint):
+            # the same immutable snapshot or equal final results
+            if fingerprint is not None:
+                self._fingerprint = fingerprint
+            metrics.increment('search_list.skipped_renders')
+            self._notify_content_update(self._items)
+            return
+        self._fingerprint = fingerprint
+        super().update_items(results, view_models=view_models)
+
+    def update_items(self, items: list[Any], view_models: list[Any] | None = None) -> None:
+        self._fingerprint = None if items else _EMPTY_FINGERPRINT
+        super().update_items(items, view_models=view_models)
+
+    def clear(self) -> None:
+        self._fingerprint = _EMPTY_FINGERPRINT
+        super().clear()
+
+    @property
+    def query(self) -> str:
+        """The query of the current results"""
+        return self._query
+
+    @property
+    def fingerprint(self) -> str | None:
+        """Hash of the rendered results, equal for equal result lists, None while they are partial"""
+        return self._fingerprint
+
+    def cleanup(self) -> dict[str, int]:
+        """Cancel running searches, stop timers and release the rendered results.
+
+        Called automatically once the list is deleted, e.g. because its client disconnected.
+
+        :return: The number of released resources by kind.
+        """
+        reclaimed = super().cleanup()
+        reclaimed.update(self._search_manager.cleanup())
+        self._cache.clear()
+        self._on_search = None
+        return reclaimed
+
+
+def result_fingerprint(results: Sequence[Any]) -> str:
+    """Hash a result list, so clients and caches can check if results changed without comparing them"""
+    return hashlib.sha1(repr(list(results)).encode()).hexdigest()[:16]
+
 
-    def cleanup(self) -> None:
-        """Clean up resources."""
-        super().cleanup()
-        self._search_manager.cleanup()
+_EMPTY_FINGERPRINT = result_fingerprint([])
@@ -1,3 +1,5 @@
+from functools import partial
+from operator import itemgetter
 from typing import Any, Callable
 from nicegui import ui
 from nicegui.element import Element
@@ -5,9 +7,13 @@ from nicegui.elements.mixins.value_element import ValueElement
 from nicegui.events import ValueChangeEventArguments, GenericEventArguments
 
 from nice_droplets.elements.popover import Popover
+from nice_droplets.elements.local_list import LocalList
+from nice_droplets.elements.result_cache import ResultCache
 from nice_droplets.elements.search_list import SearchList
-from nice_droplets.components import EventHandlerTracker, SearchTask
+from nice_droplets.components import CancellationToken, EventHandlerTracker, Ranker, SearchTask, chunked_scan, traffic
+from nice_droplets.components.normalization import default_normalizer
 from nice_droplets.components.hot_key_handler import HotKeyHandler
+from nice_droplets.components.session_recorder import SessionRecorder
 from nice_droplets.events import SearchListContentUpdateEventArguments
 from nice_droplets.factories import FlexListFactory
 
@@ -26,7 +32,13 @@ class Typeahead(Popover):
                  debounce: int = 0.1,
                  on_select: Callable[[Any], None] | None = None,
                  observe_parent: bool = True,     
-                 factory: FlexListFactory | None = None            
+                 factory: FlexListFactory | None = None,
+                 items: list[Any] | None = None,
+                 local_threshold: int = 2000,
+                 max_elements: int = 50,
+                 client_cache_size: int = 20,
+                 measure_traffic: bool = False,
+                 recorder: SessionRecorder | None = None,
                  ):
         """Initialize the typeahead component.
         
@@ -36,14 +48,30 @@ class Typeahead(Popover):
         :param on_select: Function to call when an item is selected.
         :param observe_parent: Whether to observe the parent element for focus events.
         :param factory: The factory to use for creating the flex list.
+        :param items: Optional static dataset to search instead of calling on_search. Datasets of up to
+            local_threshold items are sent to the browser once and filtered there without server round trips,
+            larger ones are searched on the server, using on_search if provided.
+        :param local_threshold: The maximum number of items filtered in the browser.
+        :param max_elements: The maximum number of suggestions when searching items.
+        :param client_cache_size: The number of recent queries whose results the browser caches, so they are shown
+            without waiting for the server when returning to them, 0 to disable the cache. The server keeps their
+            final results as well and shows them while searching again, see SearchList.
+        :param measure_traffic: Whether to count the websocket messages and bytes per keystroke of the client,
+            see TrafficMeter.
+        :param recorder: Optional recorder capturing the timing of the value changes and hotkeys of this typeahead,
+            e.g. to replay them with ReplayHarness.
         """
+        local = items is not None and len(items) <= local_threshold
         super().__init__(
-            show_events=['focus', 'input'],
+            show_events=['focus'] if local else ['focus', 'input'],
             hide_events=['blur'],
             docking_side='bottom left',
             observe_parent=False,
             default_style=True,            
         )
+        if measure_traffic:
+            traffic.install(self.client)
+        self._recording = recorder.start_session() if recorder else None
         self.keep_hidden = True
         self._current_target: ValueElement | None = None
         self._event_helper: EventHandlerTracker | None = None
@@ -60,15 +88,37 @@ class Typeahead(Popover):
             }
         })
 
+        self._search_list: SearchList | None = None
+        self._local_list: LocalList | None = None
+        self._result_cache: ResultCache | None = None
         with self:
-            self._search_list = SearchList(
-                on_search=on_search,
-                min_chars=min_chars,
-                debounce=debounce,
-                on_select=lambda item: self._handle_item_select(item),
-                on_content_update=self._handle_content_update,
-                factory=factory
-            )
+            if local:
+                self._local_list = LocalList(
+                    items,
+                    to_string=factory.get_item_string if factory else None,
+                    is_disabled=factory.is_item_disabled if factory else None,
+                    max_elements=max_elements,
+                    on_select=lambda item: self._handle_item_select(item),
+                    popover=self,
+                )
+            else:
+                if items is not None and on_search is None:
+                    to_string = factory.get_item_string if factory else str
+                    search_fn = partial(_filter_items, [(item, default_normalizer.normalize(to_string(item)))
+                                                        for item in items])
+                    on_search = lambda query: SearchTask(search_fn, query, max_elements=max_elements,
+                                                         with_token=True, ranker=Ranker())
+                self._search_list = SearchList(
+                    on_search=on_search,
+                    min_chars=min_chars,
+                    debounce=debounce,
+                    on_select=lambda item: self._handle_item_select(item),
+                    on_content_update=self._handle_content_update,
+                    factory=factory,
+                    cache_size=client_cache_size
+                )
+                if client_cache_size > 0:
+                    self._result_cache = ResultCache(self._search_list._container, capacity=client_cache_size)
 
         if observe_parent:
             parent = ui.context.slot.parent
@@ -77,13 +127,22 @@ class Typeahead(Popover):
     def observe(self, element: Element):
         """Observe an element for focus events to show typeahead suggestions."""
         super().observe(element)
-        if isinstance(element, ValueElement):
+        if self._local_list is not None:
+            self._local_list.attach(element)
+        elif isinstance(element, ValueElement):
+            if self._result_cache is not None:
+                self._result_cache.attach(element)
             element.on('keydown', self._handle_key)
+        if isinstance(element, ValueElement):
             element.on_value_change(self._handle_input_change)
 
     def unobserve(self, element: Element):
         """Stop observing an element for focus events."""
         super().unobserve(element)
+        if self._local_list is not None:
+            self._local_list.detach(element)
+        if self._result_cache is not None:
+            self._result_cache.detach(element)
         if self._current_target and self._current_target.id == element.id:
             self._remove_current_target()
 
@@ -93,15 +152,21 @@ class Typeahead(Popover):
             return
             
         if self._hot_key_handler.verify('showSuggestions', e):
+            self._record_key(e)
             self.show_at(e.sender)
             return
 
         if self._hot_key_handler.verify('cancel', e):
+            self._record_key(e)
             self.hide()
             return
 
         if self._search_list._handle_key(e):
-            pass
+            self._record_key(e)
+
+    def _record_key(self, e: GenericEventArguments) -> None:
+        if self._recording is not None:
+            self._recording.record_key(e.args.get('key', ''))
 
     def _handle_show(self, e: GenericEventArguments) -> None:
         super()._handle_show(e)
@@ -111,7 +176,8 @@ class Typeahead(Popover):
         self._remove_current_target()
         self._current_target = self._targets.get(e.args['target'], None)
         self._event_helper = EventHandlerTracker(self._current_target)
-        self._search_list.set_search_query(self._current_target.value)
+        if self._search_list is not None:
+            self._search_list.set_search_query(self._current_target.value)
 
     def _remove_current_target(self) -> None:
         if self._current_target:
@@ -119,13 +185,20 @@ class Typeahead(Popover):
             self._event_helper.remove()
             self._event_helper = None
 
+    def _handle_delete(self) -> None:
+        self._remove_current_target()
+        super()._handle_delete()
+
     def _handle_hide(self, e: GenericEventArguments) -> None:
         self._remove_current_target()
         return super()._handle_hide(e)
 
     def _handle_input_change(self, e: ValueChangeEventArguments) -> None:
         """Handle input value changes."""
-        if e.sender != self._current_target:
+        traffic.keystroke(self.client)
+        if self._recording is not None and e.sender == self._current_target:
+            self._recording.record_input(e.value or '')
+        if e.sender != self._current_target or self._search_list is None:
             return
         if self._selected_value == e.value:  # catch once
             self._selected_value = None
@@ -136,13 +209,27 @@ class Typeahead(Popover):
         """Handle when a suggestion item is selected."""
         if not self._current_target:
             return
-        value = self._search_list._view_factory._to_string(e.item) if e.item else ''
+        if self._local_list is not None:
+            value = self._local_list.get_item_string(e.item) if e.item else ''
+        else:
+            value = self._search_list._view_factory._to_string(e.item) if e.item else ''
         if isinstance(value, str):
             self._selected_value = value
             self._current_target.set_value(value)
-            self._search_list.set_search_query('')
+            if self._search_list is not None:
+                self._search_list.set_search_query('')
         self.hide()
 
     def _handle_content_update(self, e: SearchListContentUpdateEventArguments) -> None:
         """Handle when the search list content is updated."""
         self.keep_hidden = len(self._search_list.items) == 0 or not self._current_target
+        if self._result_cache is not None and self._search_list.fingerprint is not None:  # final results only
+            self._result_cache.settle(self._search_list.query, self._search_list.fingerprint)
+
+
+def _filter_items(items: list[tuple[Any, str]], query: str, token: CancellationToken) -> list[Any]:
+    """Find the items whose normalized text contains all tokens of the query,
+    used for datasets too large to filter in the browser"""
+    tokens = default_normalizer.key(query).split()
+    return chunked_scan(items, lambda pair: all(part in pair[1] for part in tokens), token,
+                        result_fn=itemgetter(0))
@@ -5,16 +5,22 @@ Available factories:
 - FlexLabelFactory: Simple list with label-based items
 - FlexItemListFactory: List with advanced item features (title, subtitle, avatar)
 - FlexTableFactory: Table-based list for structured data
+- FlexCompactFactory: Medium sized lists rendered as rows of a single element
+- FlexAdaptiveFactory: Switches between other factories depending on the number of items
 """
 
 from .flex_list_factory import FlexListFactory
 from .flex_default_factory import FlexDefaultFactory
 from .flex_item_list_factory import FlexItemListFactory
 from .flex_table_factory import FlexTableFactory
+from .flex_compact_factory import FlexCompactFactory
+from .flex_adaptive_factory import FlexAdaptiveFactory
 
 __all__ = [
     'FlexListFactory',
     'FlexDefaultFactory',
     'FlexItemListFactory',
     'FlexTableFactory',
+    'FlexCompactFactory',
+    'FlexAdaptiveFactory',
 ]
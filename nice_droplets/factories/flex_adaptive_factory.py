@@ -0,0 +1,186 @@
+import json
+from typing import Any, Callable, Optional
+
+from nicegui import ui
+from nicegui.events import handle_event
+
+from nice_droplets.components.metrics import metrics
+from nice_droplets.events import FlexFactoryItemClickedArguments
+
+from .flex_list_factory import FlexListFactory
+
+
+class _ModeViewModels(list):
+    """View models prepared by the factory of a specific mode"""
+
+    def __init__(self, mode: int, view_models: list[Any]):
+        super().__init__(view_models)
+        self.mode = mode
+
+
+class FlexAdaptiveFactory(FlexListFactory):
+    """Factory switching between other factories depending on the number of items.
+
+    Typical policies use rich item elements for a few results, a compact single element renderer for medium sized
+    lists and a virtualized table for everything above, e.g.
+    ``FlexAdaptiveFactory([(20, FlexItemListFactory()), (500, FlexCompactFactory()),
+    (None, FlexTableFactory(virtual_scroll_height='400px'))])``.
+    The mode is chosen on every update, the container of the inactive modes is hidden and emptied.
+    """
+
+    def __init__(self, modes: list[tuple[int | None, FlexListFactory]], *,
+                 measure: bool = False,
+                 to_string: Optional[Callable[[Any], str]] = None):
+        """Initialize the adaptive factory.
+
+        :param modes: Pairs of the maximum number of items and the factory rendering them, ordered by the maximum.
+            The maximum of the last mode should be None, so it accepts any number of items.
+        :param measure: Whether to measure the number of elements and the payload size of every update,
+            see mode_statistics. Serializes the rendered elements once more, so it is meant for tuning thresholds.
+        :param to_string: Optional callback function that converts a selected item to a string.
+                       If not provided, the conversion of the factory of the active mode is used.
+        """
+        super().__init__(to_string=to_string)
+        if not modes:
+            raise ValueError('at least one mode is required')
+        self._modes = modes
+        self._measure = measure
+        self._active: FlexListFactory | None = None
+        self._mode_statistics: dict[str, dict[str, int]] = {}
+        for factory in self._factories:
+            factory.on_click(self._handle_mode_click)
+        if to_string is None:
+            self._to_string = lambda item: (self._active or self._modes[0][1]).get_item_string(item)
+
+    @property
+    def _factories(self) -> list[FlexListFactory]:
+        return [factory for _, factory in self._modes]
+
+    @property
+    def active_factory(self) -> FlexListFactory | None:
+        """The factory which rendered the current items."""
+        return self._active
+
+    @property
+    def mode_statistics(self) -> dict[str, dict[str, int]]:
+        """The number of updates, and of the last update the number of items, elements and the payload size
+        in bytes, per mode. Elements and payload are only measured if enabled."""
+        return {name: dict(values) for name, values in self._mode_statistics.items()}
+
+    def mode_name(self, factory: FlexListFactory) -> str:
+        """Get the name of a mode as used in the statistics and metrics."""
+        return type(factory).__name__
+
+    def mode_for(self, count: int) -> int:
+        """Get the index of the mode rendering the given number of items."""
+        for mode, (maximum, _) in enumerate(self._modes):
+            if maximum is None or count <= maximum:
+                return mode
+        return len(self._modes) - 1
+
+    def create_container(self) -> ui.element:
+        self._container = ui.element('div')
+        with self._container:
+            for factory in self._factories:
+                factory.create_container().set_visibility(False)
+        return self._container
+
+    def progressive(self, first_paint: int | None = 20, batch_size: int = 50, batch_interval: float = 0.02):
+        for factory in self._factories:
+            factory.progressive(first_paint, batch_size, batch_interval)
+        return super().progressive(first_paint, batch_size, batch_interval)
+
+    def recycle(self, max_pool_size: int = 100):
+        for factory in self._factories:
+            factory.recycle(max_pool_size)
+        return super().recycle(max_pool_size)
+
+    @property
+    def prepares_view_models(self) -> bool:
+        return any(factory.prepares_view_models for factory in self._factories)
+
+    def prepare_items(self, items: list[Any]) -> list[Any]:
+        mode = self.mode_for(len(items))
+        factory = self._modes[mode][1]
+        return _ModeViewModels(mode, factory.prepare_items(items) if factory.prepares_view_models else [])
+
+    @property
+    def index(self) -> int:
+        return self._active.index if self._active else -1
+
+    @index.setter
+    def index(self, value: int) -> None:
+        if self._active:
+            self._active.index = value
+
+    @property
+    def is_rendering(self) -> bool:
+        return self._active.is_rendering if self._active else False
+
+    def is_item_disabled(self, item: Any) -> bool:
+        return (self._active or self._modes[0][1]).is_item_disabled(item)
+
+    def create_item(self, data: Any) -> ui.element:
+        raise NotImplementedError('FlexAdaptiveFactory creates the items with the factory of the active mode')
+
+    def element_at(self, index: int) -> ui.element | None:
+        return self._active.element_at(index) if self._active else None
+
+    def select_item(self, index: int) -> None:
+        pass  # handled by the factory of the active mode
+
+    def deselect_item(self, index: int) -> None:
+        pass  # handled by the factory of the active mode
+
+    def release(self) -> int:
+        released = sum(factory.release() for factory in self._factories)
+        self._active = None
+        self._items = []
+        self._container = None
+        return released
+
+    def clear(self) -> None:
+        for factory in self._factories:
+            factory.clear()
+        self._items = []
+
+    def update_items(self, items: list[Any], view_models: list[Any] | None = None) -> None:
+        """Update displayed items using the factory of the mode matching their number"""
+        mode = self.mode_for(len(items))
+        factory = self._modes[mode][1]
+        if not isinstance(view_models, _ModeViewModels) or view_models.mode != mode:
+            view_models = None
+        elif not factory.prepares_view_models:
+            view_models = None
+        if factory is not self._active:
+            if self._active is not None:
+                self._active.update_items([])
+                self._active.container.set_visibility(False)
+            factory.container.set_visibility(True)
+            self._active = factory
+        if view_models is not None:
+            factory.update_items(items, view_models=list(view_models))
+        else:
+            factory.update_items(items)
+        self._items = factory.items
+        self._record(factory, len(items))
+
+    def _record(self, factory: FlexListFactory, count: int) -> None:
+        name = self.mode_name(factory)
+        statistics = self._mode_statistics.setdefault(name, {'updates': 0, 'items': 0, 'elements': 0, 'payload': 0})
+        statistics['updates'] += 1
+        statistics['items'] = count
+        metrics.increment('flex_list.mode_updates', mode=name)
+        if not self._measure:
+            return
+        elements = list(factory.container.descendants())
+        payload = sum(len(json.dumps(element._to_dict(), default=str)) for element in elements)
+        statistics['elements'] = len(elements)
+        statistics['payload'] = payload
+        metrics.observe('flex_list.mode_elements', len(elements), mode=name)
+        metrics.observe('flex_list.mode_payload_bytes', payload, mode=name)
+
+    def _handle_mode_click(self, e: FlexFactoryItemClickedArguments) -> None:
+        for handler in self._click_handler:
+            handle_event(handler, FlexFactoryItemClickedArguments(sender=self, element=e.element, index=e.index,
+                                                                  item=e.item))
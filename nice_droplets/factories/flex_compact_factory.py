@@ -0,0 +1,108 @@
+import json
+from html import escape
+from typing import Any
+
+from nicegui import ui
+from nicegui.events import GenericEventArguments
+
+from .flex_default_factory import label_view_model
+from .flex_list_factory import FlexListFactory
+
+
+class FlexCompactFactory(FlexListFactory):
+    """Factory rendering all items as rows of a single HTML element.
+
+    Creates one element regardless of the number of items, which makes it suitable for medium sized lists
+    which would need hundreds of elements with the item based factories.
+    """
+
+    ROW_CLASSES = 'px-3 py-1 cursor-pointer hover:bg-gray-100'
+    SELECTED_CLASSES = 'px-3 py-1 cursor-pointer bg-primary text-white'
+    DISABLED_CLASSES = 'px-3 py-1 cursor-not-allowed opacity-50'
+
+    def __init__(self, **kwargs: Any):
+        super().__init__(**kwargs)
+        self._html: ui.html | None = None
+        self._view_models: list[dict[str, Any]] = []
+
+    def create_container(self) -> ui.element:
+        self._container = ui.element('div').classes('min-w-[200px]')
+        with self._container:
+            self._html = ui.html('').classes('flex flex-col')
+            self._html.on('click', self._handle_click, js_handler='''(e) => {
+                const row = e.target.closest("[data-index]");
+                if (row) emit(Number(row.dataset.index));
+            }''')
+        return self._container
+
+    def prepare_item(self, data: Any) -> dict[str, Any]:
+        # the view models of the default factory, so both can render the results prepared for the other
+        return label_view_model(data, self.is_item_disabled(data))
+
+    def create_item(self, data: Any, view_model: dict[str, Any] | None = None) -> ui.element:
+        raise NotImplementedError('FlexCompactFactory renders all items as rows of a single element')
+
+    def update_items(self, items: list[Any], view_models: list[Any] | None = None) -> None:
+        """Update displayed items as rows of the HTML element"""
+        self.deselect_item(self._index)  # the client keeps the restyled row if the markup does not change
+        self._reset()
+        self._items = items
+        self._view_models = view_models if view_models is not None else self.prepare_items(items)
+        self._render()
+
+    def clear(self) -> None:
+        self._reset()
+        self._render()
+
+    def _reset(self) -> None:
+        self._render_generation += 1
+        self._items = []
+        self._view_models = []
+        self._item_elements = []
+        self._index = -1
+        self._previous_index = -1
+
+    def release(self) -> int:
+        released = 1 if self._html is not None else 0
+        self._html = None
+        self._view_models = []
+        return released + super().release()
+
+    def select_item(self, index: int) -> None:
+        self._set_row_classes(index, self.SELECTED_CLASSES)
+
+    def deselect_item(self, index: int) -> None:
+        self._set_row_classes(index, self.ROW_CLASSES)
+
+    def enable_item(self, index: int) -> None:
+        pass  # the state is part of the row markup
+
+    def disable_item(self, index: int) -> None:
+        pass  # the state is part of the row markup
+
+    def _render(self) -> None:
+        if self._html is None:
+            return
+        rows = []
+        for index, view_model in enumerate(self._view_models):
+            if view_model['disabled']:
+                classes = self.DISABLED_CLASSES
+            elif index == self._index:
+                classes = self.SELECTED_CLASSES
+            else:
+                classes = self.ROW_CLASSES
+            rows.append(f'<div data-index="{index}" class="{classes}">{escape(view_model["label"])}</div>')
+        self._html.set_content(''.join(rows))
+
+    def _set_row_classes(self, index: int, classes: str) -> None:
+        """Restyle a single row on the client instead of sending the markup of all rows again"""
+        if self._html is None or not 0 <= index < len(self._view_models) or self._view_models[index]['disabled']:
+            return
+        self._html.client.run_javascript(
+            f'getHtmlElement({self._html.id})?.querySelector(\'[data-index="{index}"]\')'
+            f'?.setAttribute("class", {json.dumps(classes)})')
+
+    def _handle_click(self, e: GenericEventArguments) -> None:
+        index = e.args if isinstance(e.args, int) else e.args[0]
+        if 0 <= index < len(self._items) and not self._view_models[index]['disabled']:
+            self.handle_item_click(index)
@@ -1,28 +1,58 @@
+from collections.abc import Mapping
 from typing import Any
 
 from nicegui import ui
 
 from .flex_list_factory import FlexListFactory
 
+
+def label_view_model(data: Any, disabled: bool) -> dict[str, Any]:
+    """Get the view model of an item rendered as a single label, shared by the label based factories"""
+    label = str(data) if not isinstance(data, Mapping) else str(data.get('label', ''))
+    return {'label': label, 'disabled': disabled}
+
+
 class FlexDefaultFactory(FlexListFactory):
     """Factory for creating simple label-based list items"""
     def __init__(self):
         super().__init__()
+        self._labels: dict[int, ui.label] = {}
         
     def create_container(self) -> ui.element:
         self._container = ui.element('div').classes('flex flex-col gap-1 min-w-[200px]')
         return self._container
     
-    def create_item(self, data: Any) -> ui.element:
-        label = str(data) if not isinstance(data, dict) else str(data.get('label', ''))
+    def prepare_item(self, data: Any) -> dict[str, Any]:
+        return label_view_model(data, self.is_item_disabled(data))
+
+    def create_item(self, data: Any, view_model: dict[str, Any] | None = None) -> ui.element:
+        label = (view_model or self.prepare_item(data))['label']
         item = ui.element('div').classes(
             'w-full px-3 py-2 cursor-pointer hover:bg-gray-100 transition-colors'
         )
         with item:
-            ui.label(label).classes('w-full text-left')
+            self._labels[item.id] = ui.label(label).classes('w-full text-left')
             item.on('click', lambda _: self.handle_item_click(item))
         return item
 
+    def rebind_key(self, view_model: dict[str, Any]) -> Any:
+        return 'label'
+
+    def rebind_item(self, element: ui.element, view_model: dict[str, Any]) -> None:
+        self._labels[element.id].set_text(view_model['label'])
+
+    def clear(self) -> None:
+        super().clear()
+        self._labels.clear()
+
+    def release(self) -> int:
+        self._labels.clear()
+        return super().release()
+
+    def _discard_element(self, element: ui.element) -> None:
+        self._labels.pop(element.id, None)
+        super()._discard_element(element)
+
     def select_item(self, index: int) -> None:
         """Apply selection styling to an item at the given index"""
         if 0 <= index < len(self._item_elements):
@@ -1,3 +1,4 @@
+from collections.abc import Mapping
 from typing import Any
 
 from nicegui import ui
@@ -13,14 +14,15 @@ class FlexItemListFactory(FlexListFactory):
     def __init__(self, **kwargs: dict[str, Any]):
         super().__init__()
         self._list_kwargs = kwargs
+        self._item_parts: dict[int, dict[str, ui.element]] = {}
 
     def create_container(self) -> ui.element:
         """Create and return the container element"""
         self._container = List(**self._list_kwargs)
         return self._container
 
-    def setup_item(self, item: Item, data: Any) -> ui.element:
-        # Extract basic properties
+    def prepare_item(self, data: Any) -> dict[str, Any]:
+        """Extract title, subtitle and avatar of an item"""
         title = None
         subtitle = None
         avatar = None
@@ -28,7 +30,7 @@ class FlexItemListFactory(FlexListFactory):
 
         if isinstance(data, str):
             title = data
-        elif isinstance(data, dict):
+        elif isinstance(data, Mapping):
             title = data.get('title', data.get('label', ''))
             subtitle = data.get('subtitle', data.get('caption', ''))
             avatar = data.get('avatar', data.get('icon', ''))
@@ -36,33 +38,91 @@ class FlexItemListFactory(FlexListFactory):
         else:
             title = str(data)
 
+        return {
+            'title': title,
+            'subtitle': subtitle,
+            'avatar': avatar,
+            'avatar_round': avatar_round,
+            'disabled': self.is_item_disabled(data),
+        }
+
+    def setup_item(self, item: Item, data: Any) -> ui.element:
+        """Add the content of an item, overwrite to customize it"""
+        return self.render_view_model(item, self.prepare_item(data))
+
+    def render_view_model(self, item: Item, view_model: dict[str, Any]) -> ui.element:
+        """Add the content described by a view model of prepare_item to an item"""
+        avatar = view_model['avatar']
+        parts: dict[str, ui.element] = {}
         with item:
             # Add avatar if provided
             if avatar:
                 with ItemSection(avatar=True):
                     if avatar.startswith(('http://', 'https://')):
-                        ui.image(avatar).classes(f'w-8 h-8{"rounded-full" if avatar_round else ""}')
+                        parts['image'] = ui.image(avatar).classes(f'w-8 h-8{"rounded-full" if view_model["avatar_round"] else ""}')
                     else:
-                        ui.icon(avatar).classes('text-2xl')
+                        parts['icon'] = ui.icon(avatar).classes('text-2xl')
 
             # Add text content
             with ItemSection():
-                if title:
-                    ui.label(title).classes('text-body1')
-                if subtitle:
-                    ui.label(subtitle).classes('text-caption text-grey-7')        
+                if view_model['title']:
+                    parts['title'] = ui.label(view_model['title']).classes('text-body1')
+                if view_model['subtitle']:
+                    parts['subtitle'] = ui.label(view_model['subtitle']).classes('text-caption text-grey-7')        
 
+        self._item_parts[item.id] = parts
         return item
 
-    def create_item(self, data: Any) -> ui.element:
-        # Create the item
-        item = Item(
-            clickable=not self.is_item_disabled(data),
-            disable=self.is_item_disabled(data),
+    def rebind_key(self, view_model: dict[str, Any]) -> Any:
+        if type(self).setup_item is not FlexItemListFactory.setup_item:
+            return None  # the structure of customized items is unknown
+        avatar = view_model['avatar']
+        return (
+            'image' if avatar and avatar.startswith(('http://', 'https://')) else 'icon' if avatar else None,
+            bool(avatar) and view_model['avatar_round'],
+            bool(view_model['title']),
+            bool(view_model['subtitle']),
         )
 
+    def rebind_item(self, element: ui.element, view_model: dict[str, Any]) -> None:
+        parts = self._item_parts[element.id]
+        if 'image' in parts:
+            parts['image'].set_source(view_model['avatar'])
+        if 'icon' in parts:
+            parts['icon'].set_name(view_model['avatar'])
+        if 'title' in parts:
+            parts['title'].set_text(view_model['title'])
+        if 'subtitle' in parts:
+            parts['subtitle'].set_text(view_model['subtitle'])
+        # pooled elements are shared between enabled and disabled rows, e.g. group headers
+        element.set_enabled(not view_model['disabled'])
+        if view_model['disabled']:
+            element.props(remove='clickable')
+        else:
+            element.props('clickable')
+
+    def clear(self) -> None:
+        super().clear()
+        self._item_parts.clear()
+
+    def release(self) -> int:
+        self._item_parts.clear()
+        return super().release()
+
+    def _discard_element(self, element: ui.element) -> None:
+        self._item_parts.pop(element.id, None)
+        super()._discard_element(element)
+
+    def create_item(self, data: Any, view_model: dict[str, Any] | None = None) -> ui.element:
         """Create and return an item element for the given data"""
-        self.setup_item(item, data)
+        view_model = view_model or self.prepare_item(data)
+        item = Item(clickable=not view_model['disabled'])
+        item.set_enabled(not view_model['disabled'])
+
+        if type(self).setup_item is FlexItemListFactory.setup_item:
+            self.render_view_model(item, view_model)
+        else:  # customized content
+            self.setup_item(item, data)
         # Add click handler
         item.on('click', lambda _: self.handle_item_click(item))
                     
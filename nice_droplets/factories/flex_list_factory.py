@@ -1,8 +1,13 @@
-from typing import Any, Callable, Optional, TypeVar
+import asyncio
+import inspect
+from collections.abc import Mapping
+from functools import cached_property
+from typing import Any, Callable, Optional, Self, TypeVar
 
-from nicegui import ui
+from nicegui import background_tasks, ui
 from nicegui.events import handle_event
 
+from nice_droplets.components.metrics import metrics
 from nice_droplets.events import FlexFactoryItemClickedArguments
 
 T = TypeVar('T')
@@ -24,15 +29,63 @@ class FlexListFactory:
         self._item_elements: list[ui.element] = []
         self._click_handler: list[Callable[[FlexFactoryItemClickedArguments], None]] = [on_item_click] if on_item_click else []
         self._to_string = to_string or str
+        self._first_paint: int | None = None
+        self._batch_size = 50
+        self._batch_interval = 0.02
+        self._render_generation = 0
+        self._max_pool_size = 0
+        self._pool: dict[Any, list[ui.element]] = {}
+        self._element_keys: dict[int, Any] = {}
+        self._pool_statistics = {'created': 0, 'recycled': 0, 'discarded': 0}
         
     def create_container(self) -> ui.element:
         """Create and return the container element"""
         raise NotImplementedError()
     
     def create_item(self, data: Any) -> ui.element:
-        """Create and return an item element for the given data"""
+        """Create and return an item element for the given data.
+
+        If the method accepts a keyword argument view_model, it receives the view model prepared by prepare_item.
+        """
         raise NotImplementedError()    
+
+    def prepare_item(self, data: Any) -> Any:
+        """Project an item into a compact view model which create_item turns into elements.
+
+        This method has to be pure and thread-safe, as search lists call it in the worker executing the search
+        task, so the event loop only needs to create the elements. Returns None by default, meaning
+        that the factory does not use view models.
+        """
+        return None
+
+    def prepare_items(self, items: list[Any]) -> list[Any]:
+        """Project all items into view models, see prepare_item."""
+        return [self.prepare_item(item) for item in items]
+
+    @property
+    def prepares_view_models(self) -> bool:
+        """Check if the factory implements the view model projection."""
+        return (type(self).prepare_item is not FlexListFactory.prepare_item
+                or type(self).prepare_items is not FlexListFactory.prepare_items)
     
+    @property
+    def container(self) -> ui.element | None:
+        """The container element created by create_container, None before it was created or once released."""
+        return self._container
+
+    @property
+    def items(self) -> list[Any]:
+        """The currently displayed items."""
+        return self._items
+
+    def element_at(self, index: int) -> ui.element | None:
+        """Get the element of the item at the given index.
+
+        Returns None if the element was not created yet, e.g. while rendering progressively, or if the factory
+        does not create an element per item.
+        """
+        return self._item_elements[index] if 0 <= index < len(self._item_elements) else None
+
     @property
     def index(self) -> int:
         return self._index
@@ -63,7 +116,7 @@ class FlexListFactory:
 
     def is_item_disabled(self, item: Any) -> bool:
         """Check if an item is disabled based on its data"""
-        if isinstance(item, dict):
+        if isinstance(item, Mapping):
             return item.get('disabled', False)
         elif hasattr(item, 'disabled'):
             return bool(item.disabled)
@@ -79,22 +132,162 @@ class FlexListFactory:
             self._item_elements[index].classes('cursor-not-allowed opacity-50', 
                                               remove='cursor-pointer hover:bg-gray-100')
 
-    def _update_item_state(self, index: int, data: Any) -> None:
+    def _update_item_state(self, index: int, data: Any, view_model: Any = None) -> None:
         """Update item's visual state based on its disabled status"""
-        if self.is_item_disabled(data):
+        if isinstance(view_model, dict) and 'disabled' in view_model:
+            disabled = view_model['disabled']
+        else:
+            disabled = self.is_item_disabled(data)
+        if disabled:
             self.disable_item(index)
         else:
             self.enable_item(index)
 
+    def progressive(self, first_paint: int | None = 20, batch_size: int = 50, batch_interval: float = 0.02) -> Self:
+        """Enable progressive rendering of large item lists.
+
+        The first items are created immediately, the remaining ones in small batches during later event loop ticks,
+        so the user sees the top of the list without waiting for all elements. Pending batches are dropped
+        once the items are updated again.
+
+        :param first_paint: The number of items created immediately, None to disable progressive rendering.
+        :param batch_size: The number of items created per later batch.
+        :param batch_interval: The time in seconds between two batches.
+        """
+        self._first_paint = first_paint
+        self._batch_size = max(1, batch_size)
+        self._batch_interval = batch_interval
+        return self
+
+    def recycle(self, max_pool_size: int = 100) -> Self:
+        """Enable recycling of item elements.
+
+        Instead of deleting the elements of the previous items on every update, they are hidden and kept in a pool.
+        New items reuse pooled elements of the same structure (see rebind_key) by updating their texts, props and
+        classes, which is much cheaper than creating and deleting element subtrees at typing speed.
+        Only works for factories implementing prepare_item, rebind_key and rebind_item.
+
+        :param max_pool_size: The maximum number of hidden elements kept, 0 to disable recycling.
+        """
+        self._max_pool_size = max_pool_size
+        return self
+
+    def rebind_key(self, view_model: Any) -> Any:
+        """Get the key of the element structure required by a view model, None if it can not be recycled.
+
+        Pooled elements are only reused for view models with the same key.
+        """
+        return None
+
+    def rebind_item(self, element: ui.element, view_model: Any) -> None:
+        """Update a pooled element created for another item so that it shows the given view model."""
+        raise NotImplementedError()
+
+    @property
+    def pool_size(self) -> int:
+        """The number of hidden elements currently available for recycling."""
+        return sum(len(elements) for elements in self._pool.values())
+
+    @property
+    def pool_statistics(self) -> dict[str, int]:
+        """The number of created, recycled and discarded elements and the current pool size."""
+        return {**self._pool_statistics, 'pooled': self.pool_size}
+
+    @property
+    def is_rendering(self) -> bool:
+        """Check if items of a progressive update are still being created."""
+        return len(self._item_elements) < len(self._items)
+
     def clear(self) -> None:
         """Clear all items"""
+        self._render_generation += 1
         if self._container:
             self._container.clear()
+        self._pool.clear()
+        self._element_keys.clear()
+        self._items = []
+        self._item_elements = []
+        self._index = -1
+        self._previous_index = -1
+
+    def release(self) -> int:
+        """Drop all references to items and elements without modifying the elements, e.g. once they were deleted
+        together with their client. Pending progressive batches are stopped.
+
+        :return: The number of released elements.
+        """
+        released = len(self._item_elements) + self.pool_size
+        self._render_generation += 1
+        self._pool.clear()
+        self._element_keys.clear()
+        self._items = []
+        self._item_elements = []
+        self._index = -1
+        self._previous_index = -1
+        self._container = None
+        return released
+
+    def _release_items(self) -> None:
+        """Hide the current item elements and move them into the recycling pool"""
+        self._render_generation += 1
+        if 0 <= self._index < len(self._item_elements):
+            self.deselect_item(self._index)
+        for element in self._item_elements:
+            key = self._element_keys.get(element.id)
+            if key is None:
+                self._discard_element(element)
+            else:
+                element.set_visibility(False)
+                self._pool.setdefault(key, []).append(element)
+        overflow = self.pool_size - self._max_pool_size
+        for elements in self._pool.values():
+            while overflow > 0 and elements:
+                self._discard_element(elements.pop())
+                overflow -= 1
         self._items = []
         self._item_elements = []
         self._index = -1
         self._previous_index = -1
 
+    def _discard_element(self, element: ui.element) -> None:
+        self._element_keys.pop(element.id, None)
+        if self._container and not element.is_deleted:
+            self._container.remove(element)
+        self._pool_statistics['discarded'] += 1
+        metrics.increment('flex_list.discarded_elements', factory=type(self).__name__)
+
+    def _obtain_item(self, index: int, data: Any, view_model: Any) -> ui.element:
+        """Take an element from the recycling pool or create a new one"""
+        key = self.rebind_key(view_model) if self._max_pool_size and view_model is not None else None
+        pooled = self._pool.get(key) if key is not None else None
+        if pooled:
+            element = pooled.pop(0)
+            self.rebind_item(element, view_model)
+            element.set_visibility(True)
+            self._pool_statistics['recycled'] += 1
+            metrics.increment('flex_list.recycled_elements', factory=type(self).__name__)
+        else:
+            if view_model is None or not self._create_item_accepts_view_model:
+                element = self.create_item(data)
+            else:
+                element = self.create_item(data, view_model=view_model)
+            if key is not None:
+                self._element_keys[element.id] = key
+            self._pool_statistics['created'] += 1
+            metrics.increment('flex_list.created_elements', factory=type(self).__name__)
+        if self._max_pool_size:
+            children = self._container.default_slot.children
+            if index >= len(children) or children[index] is not element:
+                element.move(target_index=index)
+        return element
+
+    @cached_property
+    def _create_item_accepts_view_model(self) -> bool:
+        """Check if create_item accepts the view model, subclasses may override it with the plain signature"""
+        parameters = inspect.signature(self.create_item).parameters.values()
+        return any(parameter.name == 'view_model' or parameter.kind == inspect.Parameter.VAR_KEYWORD
+                   for parameter in parameters)
+
     def get_item_string(self, item: Any) -> str:
         """Convert an item to its string representation using the to_string callback."""
         return self._to_string(item)
@@ -105,18 +298,51 @@ class FlexListFactory:
         else:
             index = element
 
-        element = self._item_elements[index] if index < len(self._item_elements) else None        
-        item = self._items[index] if index < len(self._items) else None        
+        element = self.element_at(index)
+        item = self._items[index] if index < len(self._items) else None
         for handler in self._click_handler:
             handle_event(handler, FlexFactoryItemClickedArguments(sender=self, element=element, index=index, item=item))
 
-    def update_items(self, items: list[Any]) -> None:
-        """Update displayed items"""
-        self.clear()
+    def update_items(self, items: list[Any], view_models: list[Any] | None = None) -> None:
+        """Update displayed items
+
+        :param items: The items to display.
+        :param view_models: The view models of the items if they were already prepared by prepare_items.
+        """
+        if self._max_pool_size:
+            self._release_items()
+        else:
+            self.clear()
         self._items = items
-        if self._container:
-            with self._container:
-                for i, item_data in enumerate(items):
-                    item_element = self.create_item(item_data)
-                    self._update_item_state(i, item_data)
-                    self._item_elements.append(item_element)
+        if view_models is None and self.prepares_view_models:
+            view_models = self.prepare_items(items)
+        if not self._container:
+            return
+        if self._first_paint is None or len(items) <= self._first_paint:
+            self._create_items(items, view_models, 0, len(items))
+            return
+        self._create_items(items, view_models, 0, self._first_paint)
+        background_tasks.create(self._create_remaining_items(items, view_models, self._render_generation),
+                                name='progressive item rendering')
+
+    def _create_items(self, items: list[Any], view_models: list[Any] | None, start: int, end: int) -> None:
+        """Create the elements of the items start..end-1"""
+        with self._container:
+            for i in range(start, end):
+                item_data = items[i]
+                view_model = view_models[i] if view_models is not None else None
+                self._item_elements.append(self._obtain_item(i, item_data, view_model))
+                self._update_item_state(i, item_data, view_model)
+
+    async def _create_remaining_items(self, items: list[Any], view_models: list[Any] | None, generation: int) -> None:
+        """Create the items following the first paint in batches, stopping once a newer update started"""
+        position = len(self._item_elements)
+        while position < len(items):
+            await asyncio.sleep(self._batch_interval)
+            if generation != self._render_generation or self._container is None or self._container.is_deleted:
+                return
+            end = min(position + self._batch_size, len(items))
+            self._create_items(items, view_models, position, end)
+            if 0 <= self._index < end and self._index >= position:
+                self.select_item(self._index)
+            position = end
@@ -9,17 +9,24 @@ class FlexTableFactory(FlexListFactory):
     
     def __init__(self, *, 
     value_column: Optional[str] = None,
-    to_string: Optional[Callable[[Any], str]] = None):
+    to_string: Optional[Callable[[Any], str]] = None,
+    rows_per_page: Optional[int] = None,
+    virtual_scroll_height: Optional[str] = None):
         """Initialize the table factory.
         
         :param value_column: If provided, use this column to convert items to strings
         :param to_string: Optional callback function that converts a selected item to a string.
                        If not provided, str() will be used on the item.        
+        :param rows_per_page: If provided, the table is paginated with this many rows per page.
+        :param virtual_scroll_height: If provided, e.g. '400px', the table is limited to this height and only
+                       renders the rows scrolled into view, which keeps large result lists responsive.
         """
         super().__init__(to_string=to_string)
         if value_column and not to_string:
             self._to_string = lambda item: str(self.item_to_dict(item)[value_column])
         self._table = None
+        self._rows_per_page = rows_per_page
+        self._virtual_scroll_height = virtual_scroll_height
         
     def create_container(self) -> ui.element:
         self._container = ui.element('div').classes('flex flex-col gap-1 min-w-[200px]')
@@ -34,7 +41,7 @@ class FlexTableFactory(FlexListFactory):
             if self._index < 0:
                 self._table.selected = []
             else:
-                self._table.selected = [self._items[self._index]]
+                self._table.selected = [self._table.rows[self._index]]
     
     def deselect_item(self, index: int) -> None:
         if self._table:
@@ -45,15 +52,24 @@ class FlexTableFactory(FlexListFactory):
         self._container.clear()
         self._table = None
 
+    def release(self) -> int:
+        released = 1 if self._table is not None else 0
+        self._table = None
+        return released + super().release()
+
     def item_to_dict(self, item: Any) -> dict:
         if isinstance(item, dict):
             return item
         elif hasattr(item, 'to_dict'):
             return item.to_dict()
         else:
-            raise TypeError('item must be a dict or dataclass object')
+            raise TypeError('item must be a dict, a record view or dataclass object')
             
-    def update_items(self, items: list[Any]) -> None:
+    def prepare_item(self, data: Any) -> dict:
+        """Convert an item into a table row"""
+        return dict(self.item_to_dict(data))
+
+    def update_items(self, items: list[Any], view_models: list[Any] | None = None) -> None:
         """Update displayed items in table format"""
         self.clear()
         self._items = items
@@ -61,22 +77,12 @@ class FlexTableFactory(FlexListFactory):
         if not items:
             return
             
-        # Extract columns from the first item
-        sample_item = items[0]
-        if isinstance(sample_item, dict):
-            columns = [
-                {'name': key, 'label': key.title(), 'field': key}
-                for key in sample_item.keys()
-            ]
-            rows = [item.copy() for item in items]
-        else:
-            # For dataclass objects, convert to dict
-            data_dict = sample_item.to_dict()
-            columns = [
-                {'name': key, 'label': key.title(), 'field': key}
-                for key in data_dict.keys()
-            ]
-            rows = [item.to_dict() for item in items]
+        rows = view_models if view_models is not None else self.prepare_items(items)
+        # Extract columns from the first row
+        columns = [
+            {'name': key, 'label': key.title(), 'field': key}
+            for key in rows[0].keys()
+        ]
 
         # add invisible key column to every row
         for index, row in enumerate(rows):
@@ -87,7 +93,10 @@ class FlexTableFactory(FlexListFactory):
             self._table = ui.table(
                 columns=columns,
                 rows=rows,                
+                pagination=0 if self._virtual_scroll_height else self._rows_per_page,
             )
+            if self._virtual_scroll_height:
+                self._table.props('virtual-scroll').style(f'max-height: {self._virtual_scroll_height}')
             
         # Handle row clicks
         def on_row_click(e: Any) -> None:
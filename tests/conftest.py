@@ -0,0 +1 @@
+pytest_plugins = ['nicegui.testing.user_plugin']
@@ -0,0 +1,83 @@
+from threading import Event, Thread
+
+from nice_droplets.components.cancellation_token import CancellationToken, cancellable, chunked_scan
+from nice_droplets.components.search_task import SearchTask
+
+
+def test_search_functions_receive_the_token():
+    tokens = []
+
+    def search(query: str, token: CancellationToken) -> list[str]:
+        tokens.append(token)
+        token.publish([query])
+        assert task.partial_elements == (query,)
+        return [query, query.upper()]
+
+    task = SearchTask(search, 'apple', with_token=True)
+    task.run()
+    assert tokens == [task.token]
+    assert task.publishes_partial_results
+    assert task.elements == ('apple', 'APPLE')
+
+
+def test_cancellable_stops_and_reports_progress():
+    task = SearchTask(query='apple')
+    token = task.token
+    seen = []
+    for record in cancellable(range(10), token, check_every=3):
+        seen.append(record)
+        if record == 4:
+            assert token.progress == (3, 10)
+            task.cancel()
+    assert seen == [0, 1, 2, 3, 4, 5]  # stops at the next check
+    assert token.is_cancelled
+
+    finished = SearchTask(query='apple').token
+    assert list(cancellable(iter(range(5)), finished)) == [0, 1, 2, 3, 4]
+    assert finished.progress == (0, 0)  # the total of iterators is unknown
+
+
+def test_chunked_scan_collects_maps_and_limits_matches():
+    token = SearchTask(query='apple').token
+    records = [{'name': f'apple {index}' if index % 2 else f'pear {index}'} for index in range(10)]
+    matches = chunked_scan(records, lambda record: 'apple' in record['name'], token, chunk_size=4,
+                           result_fn=lambda record: record['name'])
+    assert matches == ['apple 1', 'apple 3', 'apple 5', 'apple 7', 'apple 9']
+    assert token.progress == (10, 10)
+    assert chunked_scan(records, lambda record: 'apple' in record['name'], token, limit=2) == records[1:4:2]
+
+
+def test_chunked_scan_publishes_partial_results():
+    task = SearchTask(query='apple')
+    published = []
+    task.publish_partial = lambda elements: published.append(list(elements))
+    chunked_scan(range(10), lambda record: record % 3 == 0, task.token, chunk_size=2, publish_interval=0)
+    assert published == [[0], [0, 3], [0, 3, 6], [0, 3, 6, 9]]
+
+    published.clear()
+    chunked_scan(range(10), lambda record: True, task.token, chunk_size=2, publish_interval=None)
+    assert published == []
+
+
+def test_chunked_scan_stops_once_the_task_is_cancelled():
+    started = Event()
+
+    def records():
+        index = 0
+        while True:
+            if index == 100:
+                started.set()
+            yield index
+            index += 1
+
+    def search(query: str, token: CancellationToken) -> list[int]:
+        return chunked_scan(records(), lambda record: record % 10 == 0, token, chunk_size=100)
+
+    task = SearchTask(search, 'apple', with_token=True)
+    worker = Thread(target=task.run)
+    worker.start()
+    assert started.wait(5)
+    task.cancel()
+    worker.join(5)
+    assert not worker.is_alive()
+    assert task.is_done and task.error is None
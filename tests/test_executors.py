@@ -0,0 +1,107 @@
+import asyncio
+from concurrent.futures import CancelledError
+from threading import Event
+
+import pytest
+
+from nice_droplets.components.executors import ExecutorBusyError, ExecutorRegistry, SearchExecutor
+from nice_droplets.components.metrics import metrics
+from nice_droplets.components.search_task import SearchTask
+
+
+def blocked_executor(name: str, max_queue: int | None = None) -> tuple[SearchExecutor, Event]:
+    """Create an executor with a single worker which is busy until the returned event is set."""
+    executor = SearchExecutor(name, max_workers=1, max_queue=max_queue)
+    release = Event()
+    started = Event()
+    executor.submit(lambda: (started.set(), release.wait()))
+    started.wait(5)
+    return executor, release
+
+
+def test_queue_depth_and_wait_time():
+    executor, release = blocked_executor('depth')
+    futures = [executor.submit(lambda value=value: value * 2) for value in range(3)]
+    assert executor.queue_depth == 3
+    assert metrics.gauge('executor.queue_depth', executor='depth') == 3
+    release.set()
+    assert [future.result(5) for future in futures] == [0, 2, 4]
+    assert executor.queue_depth == 0
+    assert metrics.percentile('executor.wait_time', 50, executor='depth') is not None
+    executor.shutdown()
+
+
+def test_full_queue_rejects_tasks():
+    executor, release = blocked_executor('busy', max_queue=1)
+    executor.submit(lambda: None)
+    with pytest.raises(ExecutorBusyError):
+        executor.submit(lambda: None)
+    assert metrics.counter('executor.rejected', executor='busy') == 1
+
+    task = SearchTask(lambda query: [query], 'apple')
+    executor.run_task(task).result(5)
+    assert task.is_done
+    assert isinstance(task.error, ExecutorBusyError)
+    release.set()
+    executor.shutdown(wait=True)
+
+
+def test_shutdown_completes_queued_tasks():
+    executor, release = blocked_executor('dropped')
+    task = SearchTask(lambda query: [query], 'apple')
+    executor.run_task(task)
+    executor.shutdown()
+    release.set()
+    assert task.is_done
+    assert isinstance(task.error, CancelledError)
+    assert executor.queue_depth == 0
+
+
+def test_submitting_to_a_shut_down_executor_keeps_the_queue_depth():
+    executor = SearchExecutor('closed', max_workers=1, max_queue=1)
+    executor.shutdown()
+    for _ in range(2):
+        with pytest.raises(RuntimeError):
+            executor.submit(lambda: None)
+    assert executor.queue_depth == 0
+    assert metrics.gauge('executor.queue_depth', executor='closed') == 0
+
+    task = SearchTask(lambda query: [query], 'apple')
+    executor.run_task(task)
+    assert task.is_done
+    assert isinstance(task.error, RuntimeError)
+
+
+def test_registry_selects_executors_by_name_and_type():
+    class DatabaseTask(SearchTask):
+        pass
+
+    registry = ExecutorRegistry()
+    database = registry.register('database', max_workers=1)
+    registry.assign(DatabaseTask, 'database')
+    assert registry.for_task(DatabaseTask(lambda query: [], 'a')) is database
+    assert registry.for_task(SearchTask(lambda query: [], 'a', executor='database')) is database
+    assert registry.for_task(SearchTask(lambda query: [], 'a')) is registry.get(ExecutorRegistry.DEFAULT)
+    with pytest.raises(KeyError):
+        registry.get('unknown')
+
+    replacement = registry.register('database', max_workers=2)
+    assert registry.get('database') is replacement
+    with pytest.raises(RuntimeError):
+        database.submit(lambda: None)
+    registry.shutdown()
+
+
+def test_registry_runs_sync_and_async_tasks():
+    async def search(query: str) -> list[str]:
+        return [query.upper()]
+
+    async def main():
+        registry = ExecutorRegistry()
+        sync_task = SearchTask(lambda query: [query], 'apple')
+        async_task = SearchTask(search, 'pear')
+        await asyncio.gather(registry.run(sync_task), registry.run(async_task))
+        assert sync_task.elements == ('apple',)
+        assert async_task.elements == ('PEAR',)
+        registry.shutdown()
+    asyncio.run(main())
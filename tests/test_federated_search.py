@@ -0,0 +1,98 @@
+import asyncio
+
+from nice_droplets.components.federated_search import FederatedSearch, GroupHeader
+from nice_droplets.components.metrics import metrics
+from nice_droplets.components.search_task import SearchTask
+
+
+def source(results: list, delay: float = 0.0, error: Exception | None = None):
+    """Create an async search task factory returning the given results after a delay."""
+    async def search(query: str) -> list:
+        await asyncio.sleep(delay)
+        if error is not None:
+            raise error
+        return results
+
+    return lambda query: SearchTask(search, query)
+
+
+def test_groups_are_merged_in_source_order_without_duplicates():
+    async def main():
+        search = FederatedSearch({
+            'Recent': source(['apple', 'apricot'], delay=0.05),
+            'Catalog': source(['apple', 'avocado', 'apricot']),
+        })
+        task = search('a')
+        await task.run_async()
+        assert task.error is None
+        assert task.elements == (GroupHeader('Recent', 'Recent'), 'apple', 'apricot',
+                                 GroupHeader('Catalog', 'Catalog'), 'avocado')
+        assert task.total_elements == 3
+        assert task.groups == {'Recent': ('apple', 'apricot'), 'Catalog': ('apple', 'avocado', 'apricot')}
+    asyncio.run(main())
+
+
+def test_fast_sources_are_published_while_slow_ones_run():
+    async def main():
+        search = FederatedSearch({'Slow': source(['slow'], delay=0.2), 'Fast': source(['fast'])},
+                                 group_labels=False)
+        task = search('a')
+        assert task.publishes_partial_results
+        runner = asyncio.ensure_future(task.run_async())
+        await asyncio.sleep(0.1)
+        assert task.partial_elements == ('fast',)
+        await runner
+        assert task.elements == ('slow', 'fast')
+    asyncio.run(main())
+
+
+def test_slow_and_failing_sources_are_skipped():
+    async def main():
+        search = FederatedSearch({
+            'Slow': source(['slow'], delay=5),
+            'Broken': source([], error=ConnectionError('down')),
+            'Fast': source(['fast']),
+        }, timeout={'Slow': 0.05}, group_labels=False)
+        timeouts = metrics.counter('search.timeouts', source='Slow')
+        errors = metrics.counter('search.errors', source='Broken')
+        task = search('a')
+        await task.run_async()
+        assert task.error is None
+        assert task.elements == ('fast',)
+        assert metrics.counter('search.timeouts', source='Slow') == timeouts + 1
+        assert metrics.counter('search.errors', source='Broken') == errors + 1
+
+        failing = FederatedSearch({'Broken': source([], error=ConnectionError('down'))})('a')
+        await failing.run_async()
+        assert isinstance(failing.error, ConnectionError)
+    asyncio.run(main())
+
+
+def test_max_elements_does_not_count_headers():
+    async def main():
+        search = FederatedSearch({'First': source([{'name': 'a'}, {'name': 'b'}]), 'Second': source([{'name': 'a'},
+                                 {'name': 'c'}, {'name': 'd'}])}, max_elements=3)
+        task = search('a')
+        await task.run_async()
+        assert task.elements == (GroupHeader('First', 'First'), {'name': 'a'}, {'name': 'b'},
+                                 GroupHeader('Second', 'Second'), {'name': 'c'})  # dicts are compared as strings
+        assert task.more_elements
+    asyncio.run(main())
+
+
+def test_cancelling_cancels_all_sources():
+    async def main():
+        tasks = []
+
+        def tracked(query: str) -> SearchTask:
+            tasks.append(source(['slow'], delay=5)(query))
+            return tasks[-1]
+
+        task = FederatedSearch({'First': tracked, 'Second': tracked})('a')
+        runner = asyncio.ensure_future(task.run_async())
+        await asyncio.sleep(0.05)
+        task.cancel()
+        assert all(source_task.is_cancelled for source_task in tasks)
+        runner.cancel()
+        await asyncio.gather(runner, return_exceptions=True)
+    asyncio.run(main())
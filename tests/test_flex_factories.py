@@ -0,0 +1,172 @@
+import asyncio
+
+import pytest
+from nicegui import ui
+from nicegui.events import GenericEventArguments
+from nicegui.testing import User
+
+from nice_droplets.elements.flex_list import FlexList
+from nice_droplets.factories import (FlexAdaptiveFactory, FlexCompactFactory, FlexDefaultFactory, FlexItemListFactory,
+                                    FlexTableFactory)
+
+
+async def open_flex_list(user: User, **kwargs) -> FlexList:
+    lists: list[FlexList] = []
+
+    @ui.page('/')
+    def page():
+        lists.append(FlexList(**kwargs))
+
+    await user.open('/')
+    return lists[0]
+
+
+def press(flex_list: FlexList, key: str) -> None:
+    flex_list._handle_key(GenericEventArguments(sender=flex_list, client=flex_list.client, args={'key': key}))
+
+
+def words(count: int) -> list[dict[str, str]]:
+    return [{'label': f'word {index}'} for index in range(count)]
+
+
+async def test_adaptive_factory_switches_the_mode_by_result_size(user: User):
+    default, compact, table = FlexDefaultFactory(), FlexCompactFactory(), FlexTableFactory()
+    flex_list = await open_flex_list(user, modes=[(2, default), (5, compact), (None, table)])
+    factory = flex_list.factory
+    assert isinstance(factory, FlexAdaptiveFactory)
+
+    flex_list.update_items(words(2))
+    assert factory.active_factory is default
+    assert default.container.visible and not compact.container.visible
+    assert factory.element_at(1) is default.element_at(1) is not None
+
+    flex_list.update_items(words(4))
+    assert factory.active_factory is compact
+    assert compact.container.visible and not default.container.visible
+    assert factory.items == compact.items
+    assert factory.element_at(1) is None  # all rows are part of a single element
+    assert default.items == []
+
+    flex_list.update_items(words(6))
+    assert factory.active_factory is table
+    assert factory.mode_statistics['FlexCompactFactory']['items'] == 4
+    assert factory.mode_statistics['FlexTableFactory']['updates'] == 1
+
+
+async def test_adaptive_factory_reuses_view_models_of_the_same_mode(user: User):
+    compact = FlexCompactFactory()
+    flex_list = await open_flex_list(user, modes=[(1, FlexDefaultFactory()), (None, compact)])
+    items = words(3)
+    view_models = flex_list.factory.prepare_items(items)
+    view_models[0] = {'label': 'prepared', 'disabled': False}
+    flex_list.update_items(items, view_models=view_models)
+    assert 'prepared' in compact.container.default_slot.children[0].content
+
+    flex_list.update_items(items[:1], view_models=view_models)  # prepared for another mode, so ignored
+    assert flex_list.factory.element_at(0).default_slot.children[0].text == 'word 0'
+
+
+async def test_compact_factory_renders_rows_of_a_single_element(user: User):
+    clicked = []
+    compact = FlexCompactFactory(on_item_click=lambda e: clicked.append(e.index))
+    flex_list = await open_flex_list(user, factory=compact)
+    flex_list.update_items([{'label': '<b>bold</b>'}, {'label': 'off', 'disabled': True}, 'plain'])
+    html = compact.container.default_slot.children[0]
+    assert html.content.count('data-index') == 3
+    assert '&lt;b&gt;bold&lt;/b&gt;' in html.content
+    assert FlexCompactFactory.DISABLED_CLASSES in html.content
+    assert compact.prepare_item('plain') == FlexDefaultFactory().prepare_item('plain')
+
+    compact.handle_item_click(2)
+    assert clicked == [2]
+    with pytest.raises(NotImplementedError):
+        compact.create_item('plain')
+
+
+@pytest.mark.parametrize('factory_class', [FlexDefaultFactory, FlexCompactFactory])
+async def test_confirming_the_selection_passes_the_item_element(user: User, factory_class: type):
+    selected = []
+    factory = factory_class()
+    flex_list = await open_flex_list(user, factory=factory, on_select=lambda e: selected.append(e))
+    flex_list.update_items(words(3))
+    press(flex_list, 'ArrowDown')
+    press(flex_list, 'ArrowDown')
+    press(flex_list, 'Enter')
+    assert [(e.index, e.item) for e in selected] == [(1, {'label': 'word 1'})]
+    assert selected[0].element is factory.element_at(1)
+    assert (selected[0].element is None) == (factory_class is FlexCompactFactory)
+
+
+async def test_deleted_list_releases_its_elements(user: User):
+    factory = FlexDefaultFactory().recycle()
+    flex_list = await open_flex_list(user, factory=factory)
+    flex_list.update_items(words(3))
+    flex_list.update_items(words(2))  # pools the previous elements
+    assert factory.pool_size == 1
+    flex_list.delete()
+    assert factory.items == [] and factory.container is None
+    assert factory.element_at(0) is None and factory.pool_size == 0
+    assert flex_list.items == []
+
+
+async def test_progressive_rendering_creates_the_first_items_immediately(user: User):
+    factory = FlexDefaultFactory().progressive(first_paint=2, batch_size=2, batch_interval=0.01)
+    flex_list = await open_flex_list(user, factory=factory)
+    flex_list.update_items(words(7))
+    assert len(factory.container.default_slot.children) == 2
+    assert factory.is_rendering and factory.element_at(1) is not None and factory.element_at(2) is None
+    for _ in range(100):
+        if not factory.is_rendering:
+            break
+        await asyncio.sleep(0.01)
+    assert [child.default_slot.children[0].text for child in factory.container.default_slot.children] == \
+        [f'word {index}' for index in range(7)]
+
+
+async def test_progressive_batches_stop_once_the_items_change(user: User):
+    selected = []
+    factory = FlexDefaultFactory().progressive(first_paint=1, batch_size=1, batch_interval=0.05)
+    flex_list = await open_flex_list(user, factory=factory, on_select=lambda e: selected.append(e))
+    flex_list.update_items(words(5))
+    press(flex_list, 'ArrowUp')  # selects the last item, which is not rendered yet
+    press(flex_list, 'Enter')
+    assert [(e.index, e.element) for e in selected] == [(4, None)]
+
+    flex_list.update_items(words(2))
+    await asyncio.sleep(0.3)
+    assert len(factory.container.default_slot.children) == 2
+    assert not factory.is_rendering
+
+
+async def test_default_factory_recycles_pooled_elements(user: User):
+    factory = FlexDefaultFactory().recycle(max_pool_size=2)
+    flex_list = await open_flex_list(user, factory=factory)
+    flex_list.update_items(words(3))
+    first = [factory.element_at(index) for index in range(3)]
+    flex_list.update_items([{'label': 'pear'}, {'label': 'plum', 'disabled': True}])
+    assert [factory.element_at(index) for index in range(2)] == first[:2]
+    assert first[0].default_slot.children[0].text == 'pear'
+    assert 'opacity-50' in first[1].classes
+    assert first[2].is_deleted  # the pool holds at most two elements
+    assert factory.pool_statistics == {'created': 3, 'recycled': 2, 'discarded': 1, 'pooled': 0}
+
+    flex_list.update_items([{'label': 'apple'}, {'label': 'plum'}])
+    assert factory.element_at(1) is first[1]
+    assert 'opacity-50' not in first[1].classes  # the disabled state is not kept in the pool
+    flex_list.update_items([{'label': 'apple'}])
+    assert factory.pool_statistics == {'created': 3, 'recycled': 5, 'discarded': 1, 'pooled': 1}
+    assert first[1].visible is False
+
+
+async def test_item_list_factory_recycles_items_of_the_same_structure(user: User):
+    factory = FlexItemListFactory().recycle()
+    flex_list = await open_flex_list(user, factory=factory)
+    flex_list.update_items([{'title': 'apple', 'subtitle': 'fruit'}, {'title': 'pear', 'icon': 'star'}])
+    apple, pear = factory.element_at(0), factory.element_at(1)
+    flex_list.update_items([{'title': 'plum', 'icon': 'home'}, {'title': 'fig', 'subtitle': 'dried'}])
+    assert factory.element_at(0) is pear and factory.element_at(1) is apple
+    assert factory.pool_statistics['recycled'] == 2
+    with apple:
+        await user.should_see('dried')
+    await user.should_see('plum')
+    await user.should_not_see('pear')
@@ -0,0 +1,41 @@
+from nice_droplets.components.fuzzy_search import FuzzySource, SymSpellDictionary, deletes, edit_distance
+
+
+def test_edit_distance():
+    assert edit_distance('macbook', 'macbook', 2) == 0
+    assert edit_distance('macbok', 'macbook', 2) == 1
+    assert edit_distance('acbd', 'abcd', 2) == 1  # transposition
+    assert edit_distance('kitten', 'sitting', 2) == 3  # exceeds the maximum
+
+
+def test_deletes():
+    assert deletes('abc', 1) == {'abc', 'bc', 'ac', 'ab'}
+
+
+def test_dictionary_lookup():
+    dictionary = SymSpellDictionary(max_distance=2)
+    for term in ['apple', 'apply', 'ample', 'banana']:
+        dictionary.add(term)
+    assert len(dictionary) == 4
+    assert 'apple' in dictionary
+    assert dictionary.lookup('appel') == [('apple', 1), ('ample', 2), ('apply', 2)]
+    assert dictionary.lookup('appel', 0) == []
+    assert dictionary.prefixed('app') == ['apple', 'apply']
+
+
+def test_source_tolerates_typos():
+    records = ['Apple MacBook Pro', 'Apple iPhone', 'Samsung Galaxy']
+    source = FuzzySource(records)
+    assert source.search('macbok') == ['Apple MacBook Pro']
+    assert source.search('aple iphone') == ['Apple iPhone']
+
+
+def test_last_token_matches_prefixes():
+    source = FuzzySource(['Samsung Galaxy', 'Samsung TV'])
+    assert source.search('samsung gal') == ['Samsung Galaxy']
+    assert source.search('') == []
+
+
+def test_records_are_ordered_by_distance():
+    source = FuzzySource([{'name': 'tablet'}, {'name': 'table'}], text_fn=lambda record: record['name'])
+    assert source.search('tabel') == [{'name': 'table'}, {'name': 'tablet'}]
@@ -0,0 +1,132 @@
+import asyncio
+import json
+import time
+from urllib.parse import parse_qs
+
+import httpx
+
+from nice_droplets.components.http_search_task import HttpSearchTask
+
+
+class StandInServer:
+    """Local HTTP server streaming newline delimited JSON in chunks, one chunk per record.
+
+    /search streams three records, /slow waits after each record and /hang keeps the response open after them.
+    """
+
+    def __init__(self):
+        self.requests: list[str] = []
+        self._server: asyncio.Server | None = None
+        self._handlers: set[asyncio.Task] = set()
+
+    async def __aenter__(self) -> 'StandInServer':
+        self._server = await asyncio.start_server(self._handle, '127.0.0.1', 0)
+        return self
+
+    async def __aexit__(self, *_) -> None:
+        self._server.close()
+        for handler in self._handlers:
+            handler.cancel()
+        await asyncio.gather(*self._handlers, return_exceptions=True)
+        await self._server.wait_closed()
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.sockets[0].getsockname()[:2]
+        return f'http://{host}:{port}'
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self._handlers.add(asyncio.current_task())
+        try:
+            while True:
+                request = await reader.readuntil(b'\r\n\r\n')
+                target = request.split(b' ')[1].decode()
+                self.requests.append(target)
+                path, _, parameters = target.partition('?')
+                query = parse_qs(parameters)['q'][0]
+                if path == '/error':
+                    writer.write(b'HTTP/1.1 500 Internal Server Error\r\nContent-Length: 0\r\n\r\n')
+                    await writer.drain()
+                    continue
+                writer.write(b'HTTP/1.1 200 OK\r\nContent-Type: application/x-ndjson\r\n'
+                             b'Transfer-Encoding: chunked\r\n\r\n')
+                for index in range(3):
+                    line = json.dumps({'name': f'{query} {index}'}).encode() + b'\n'
+                    writer.write(b'%x\r\n%s\r\n' % (len(line), line))
+                    await writer.drain()
+                    if path == '/slow':
+                        await asyncio.sleep(10)
+                if path == '/hang':
+                    await asyncio.sleep(10)
+                writer.write(b'0\r\n\r\n')
+                await writer.drain()
+        except (asyncio.IncompleteReadError, asyncio.CancelledError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+
+def test_streamed_results():
+    async def main():
+        async with StandInServer() as server, httpx.AsyncClient() as client:
+            task = HttpSearchTask(f'{server.url}/search', 'apple', client=client, transform=lambda r: r['name'])
+            await task.run_async()
+            assert task.error is None
+            assert task.elements == ('apple 0', 'apple 1', 'apple 2')
+            assert task.total_elements == 3
+            assert not task.more_elements
+            assert task.publishes_partial_results
+
+            second = HttpSearchTask(f'{server.url}/search', 'pear & plum', client=client, params={'lang': 'en'})
+            await second.run_async()
+            assert second.elements == tuple({'name': f'pear & plum {index}'} for index in range(3))
+            assert server.requests == ['/search?q=apple', '/search?lang=en&q=pear+%26+plum']
+    asyncio.run(main())
+
+
+def test_request_is_closed_once_max_elements_are_received():
+    async def main():
+        async with StandInServer() as server, httpx.AsyncClient() as client:
+            task = HttpSearchTask(f'{server.url}/hang', 'apple', client=client, max_elements=2, limit_param='limit')
+            start = time.monotonic()
+            await task.run_async()
+            assert time.monotonic() - start < 5
+            assert task.error is None
+            assert task.elements == ({'name': 'apple 0'}, {'name': 'apple 1'})
+            assert task.more_elements
+            assert server.requests == ['/hang?limit=2&q=apple']
+    asyncio.run(main())
+
+
+def test_cancellation_aborts_the_request():
+    async def main():
+        async with StandInServer() as server, httpx.AsyncClient() as client:
+            task = HttpSearchTask(f'{server.url}/slow', 'apple', client=client)
+            runner = asyncio.ensure_future(task.run_async())
+            while not task.partial_elements:
+                await asyncio.sleep(0.01)
+            assert task.partial_elements == ({'name': 'apple 0'},)
+            task.cancel()
+            await asyncio.wait_for(runner, 5)  # the server would send the next record after 10 seconds
+            assert task.is_done
+            assert task.error is None
+    asyncio.run(main())
+
+
+def test_server_errors_are_reported():
+    async def main():
+        async with StandInServer() as server, httpx.AsyncClient() as client:
+            task = HttpSearchTask(f'{server.url}/error', 'apple', client=client)
+            await task.run_async()
+            assert isinstance(task.error, httpx.HTTPStatusError)
+            assert task.elements == ()
+    asyncio.run(main())
+
+
+def test_timeout_is_reported():
+    async def main():
+        async with StandInServer() as server, httpx.AsyncClient() as client:
+            task = HttpSearchTask(f'{server.url}/slow', 'apple', client=client, timeout=0.2)
+            await task.run_async()
+            assert isinstance(task.error, TimeoutError)
+    asyncio.run(main())
@@ -0,0 +1,39 @@
+import pytest
+
+from nice_droplets.components.json_stream_decoder import JsonStreamDecoder
+
+
+def test_newline_delimited_values():
+    decoder = JsonStreamDecoder()
+    assert decoder.feed('{"a": 1}\n{"b"') == [{'a': 1}]
+    assert decoder.feed(': 2}\n') == [{'b': 2}]
+    assert decoder.close() == []
+    assert not decoder.is_array
+
+
+def test_array_elements_are_emitted_while_receiving():
+    decoder = JsonStreamDecoder()
+    assert decoder.feed('[{"id": 1}, {"i') == [{'id': 1}]
+    assert decoder.is_array
+    assert decoder.feed('d": 2}') == [{'id': 2}]
+    assert decoder.feed(']') == []
+    assert decoder.close() == []
+
+
+def test_trailing_number_waits_for_more_data():
+    decoder = JsonStreamDecoder()
+    assert decoder.feed('[1, 2') == [1]
+    assert decoder.feed('3, 4]') == [23, 4]
+
+
+def test_trailing_number_is_flushed_on_close():
+    decoder = JsonStreamDecoder()
+    assert decoder.feed('42') == []
+    assert decoder.close() == [42]
+
+
+def test_incomplete_value_raises_on_close():
+    decoder = JsonStreamDecoder()
+    decoder.feed('{"a": ')
+    with pytest.raises(ValueError):
+        decoder.close()
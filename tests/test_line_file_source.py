@@ -0,0 +1,121 @@
+import os
+
+import pytest
+
+from nice_droplets.components.line_file_source import LineFileIndex, LineFileSource
+
+
+@pytest.fixture
+def lines_path(tmp_path):
+    path = tmp_path / 'lines.txt'
+    path.write_bytes('apple\r\nbanana\nAPRICOT\ncherry\nÄpfel\n'.encode())
+    return str(path)
+
+
+def test_index_lines(lines_path):
+    index = LineFileIndex(lines_path)
+    try:
+        assert len(index) == 5
+        assert [index.line(line) for line in range(len(index))] == ['apple', 'banana', 'APRICOT', 'cherry', 'Äpfel']
+        assert index.line_at(0) == 0
+        assert index.line_at(8) == 1
+    finally:
+        index.close()
+
+
+def test_index_is_persisted_and_reused(lines_path):
+    LineFileIndex(lines_path).close()
+    assert os.path.exists(lines_path + '.idx')
+    index = LineFileIndex(lines_path)
+    try:
+        assert index._index_map is not None
+        assert index.line(3) == 'cherry'
+    finally:
+        index.close()
+
+
+def test_outdated_index_is_rebuilt(lines_path):
+    LineFileIndex(lines_path).close()
+    with open(lines_path, 'ab') as f:
+        f.write(b'date\n')
+    index = LineFileIndex(lines_path)
+    try:
+        assert len(index) == 6
+        assert index.line(5) == 'date'
+    finally:
+        index.close()
+
+
+def test_contains_search(lines_path):
+    source = LineFileSource(lines_path)
+    try:
+        assert source.search('ap') == ['apple', 'APRICOT']
+        assert source.search('an') == ['banana']
+        assert source.search('') == []
+    finally:
+        source.close()
+
+
+def test_small_windows_find_the_same_lines(lines_path):
+    source = LineFileSource(lines_path, window_size=1, case_sensitive=True)
+    try:
+        assert source.search('r') == ['cherry']
+        assert source.search('Äp') == ['Äpfel']
+    finally:
+        source.close()
+
+
+def test_max_elements(lines_path):
+    source = LineFileSource(lines_path, max_elements=1)
+    try:
+        task = source('a')
+        task.run()
+        assert task.elements == ('apple',)
+        assert task.more_elements
+        task = source('cherry')
+        task.run()
+        assert task.elements == ('cherry',)
+        assert not task.more_elements
+    finally:
+        source.close()
+
+
+def test_non_ascii_case_insensitive_search(lines_path):
+    source = LineFileSource(lines_path)
+    try:
+        assert source.search('äPF') == ['Äpfel']
+        assert source.search('ÄPFEL') == ['Äpfel']
+    finally:
+        source.close()
+    source = LineFileSource(lines_path, case_sensitive=True)
+    try:
+        assert source.search('äpfel') == []
+    finally:
+        source.close()
+
+
+def test_prefix_search(tmp_path):
+    path = tmp_path / 'sorted.txt'
+    path.write_text('SKU-1\nSKU-10\nSKU-2\nTOOL-1\n')
+    source = LineFileSource(str(path), mode='prefix')
+    try:
+        assert source.search('SKU-1') == ['SKU-1', 'SKU-10']
+        assert source.search('TOOL') == ['TOOL-1']
+        assert source.search('X') == []
+    finally:
+        source.close()
+
+
+def test_unknown_mode(lines_path):
+    with pytest.raises(ValueError):
+        LineFileSource(lines_path, mode='regex')
+
+
+def test_empty_file(tmp_path):
+    path = tmp_path / 'empty.txt'
+    path.write_bytes(b'')
+    source = LineFileSource(str(path))
+    try:
+        assert source.search('a') == []
+    finally:
+        source.close()
@@ -0,0 +1,48 @@
+import asyncio
+import importlib.util
+from pathlib import Path
+
+spec = importlib.util.spec_from_file_location(
+    'load_test', Path(__file__).parent.parent / 'examples' / 'load_test' / 'load_test.py')
+load_test = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(load_test)
+
+
+def simulated_user() -> 'load_test.SimulatedUser':
+    user = load_test.SimulatedUser('http://127.0.0.1:8090', 0, cadence=0.1, think_time=1.0)
+    user._session = {'client_id': 'client', 'input_id': 1, 'popover_id': 2, 'rendered_query_id': 3}
+    return user
+
+
+def test_event_types_match_regardless_of_their_case():
+    assert load_test._normalized_event_type('update:modelValue') == \
+        load_test._normalized_event_type('update:model-value')
+    assert load_test._normalized_event_type('_show') == '_show'
+
+
+def test_percentiles():
+    assert load_test.percentiles([]) == {'p50': None, 'p90': None, 'p99': None}
+    assert load_test.percentiles([float(value) for value in range(100, 0, -1)]) == \
+        {'p50': 51.0, 'p90': 91.0, 'p99': 100.0}
+
+
+def test_updates_announce_listeners_and_rendered_queries():
+    async def main():
+        user = simulated_user()
+        await user._handle_message('update', {
+            '1': {'events': [{'type': 'update:modelValue', 'listener_id': 'input-listener'}]},
+            '2': {'events': [{'type': '_show', 'listener_id': 'show-listener'}]},
+        })
+        assert user._listeners_received.is_set()
+        assert user._listener(1, 'update:model-value') == 'input-listener'
+        assert user._listener(2, '_show') == 'show-listener'
+
+        user._pending = [('a', 0.0), ('ap', 0.0), ('app', 0.0)]
+        await user._handle_message('update', {'3': {'text': 'ap'}})
+        assert user.renders == 1 and user.superseded == 1
+        assert user._pending == [('app', 0.0)]
+        await user._handle_message('update', {'3': {'text': 'pear'}})  # results of an unknown query
+        await user._handle_message('notify', {'message': 'hello'})
+        assert user.renders == 1 and user.messages == 4
+        assert len(user.latencies) == 1 and user.latencies[0] > 0
+    asyncio.run(main())
@@ -0,0 +1,69 @@
+from nicegui import ui
+from nicegui.events import GenericEventArguments
+from nicegui.testing import User
+
+from nice_droplets.components.metrics import metrics
+from nice_droplets.components.search_task import SearchTask
+from nice_droplets.elements.local_list import LocalList
+from nice_droplets.elements.typeahead import Typeahead, _filter_items
+
+FRUITS = [{'label': 'Äpfel'}, {'label': 'Apple pie'}, {'label': 'Pear', 'disabled': True}]
+
+
+async def open_page(user: User, create) -> list:
+    elements = []
+
+    @ui.page('/')
+    def page():
+        elements.append(create())
+
+    await user.open('/')
+    return elements
+
+
+def event(element, args) -> GenericEventArguments:
+    return GenericEventArguments(sender=element, client=element.client, args=args)
+
+
+async def test_the_projection_is_sent_once_per_dataset(user: User):
+    selected = []
+    local_list, = await open_page(user, lambda: LocalList(FRUITS, to_string=lambda item: item['label'],
+                                                          is_disabled=lambda item: item.get('disabled', False),
+                                                          on_select=selected.append))
+    key = local_list.props['datasetKey']
+    sent = []
+    local_list.run_method = lambda name, *args: sent.append((name, *args))
+    datasets = metrics.counter('local_list.datasets_sent')
+
+    local_list._handle_request_records(event(local_list, {'key': 'outdated'}))
+    assert sent == []
+    local_list._handle_request_records(event(local_list, {'key': key}))
+    assert sent == [('setRecords', [['Äpfel', 'apfel', False], ['Apple pie', 'apple pie', False],
+                                    ['Pear', 'pear', True]], key)]
+    assert metrics.counter('local_list.datasets_sent') == datasets + 1
+
+    local_list.set_items(FRUITS[::-1])
+    assert local_list.props['datasetKey'] != key
+    local_list.set_items(FRUITS)
+    assert local_list.props['datasetKey'] == key
+
+    local_list._handle_select(event(local_list, {'index': 1}))
+    local_list._handle_select(event(local_list, {'index': 3}))
+    assert [(e.index, e.item) for e in selected] == [(1, FRUITS[1])]
+
+
+async def test_typeahead_filters_small_datasets_in_the_browser(user: User):
+    def create():
+        with ui.input():
+            return Typeahead(items=FRUITS, local_threshold=3), Typeahead(items=FRUITS, local_threshold=2)
+
+    (local, remote), = await open_page(user, create)
+    assert local._local_list is not None and local._search_list is None
+    assert remote._local_list is None and remote._search_list is not None
+
+
+def test_large_datasets_are_filtered_by_all_query_tokens():
+    items = [(item['label'], text) for item, text in zip(FRUITS, ['apfel', 'apple pie', 'pear'])]
+    task = SearchTask(lambda query, token: _filter_items(items, query, token), 'PIE  apple', with_token=True)
+    task.run()
+    assert task.elements == ('Apple pie',)
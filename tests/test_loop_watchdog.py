@@ -0,0 +1,52 @@
+import asyncio
+import sys
+import time
+
+from nice_droplets.components.loop_watchdog import LoopWatchdog, culprit_of
+from nice_droplets.components.metrics import metrics
+from nice_droplets.components.search_task import SearchTask
+from nice_droplets.factories import FlexDefaultFactory
+
+
+class FrameTask(SearchTask):
+    def execute(self):
+        self.frame = sys._getframe()
+
+
+class FrameFactory(FlexDefaultFactory):
+    def prepare_item(self, data):
+        return sys._getframe()
+
+
+def test_culprits_are_the_innermost_task_factory_or_application_function():
+    task = FrameTask(query='apple')
+    task.execute()
+    assert culprit_of(task.frame) == 'task:FrameTask'
+    assert culprit_of(FrameFactory().prepare_item('apple')) == 'factory:FrameFactory'
+
+    frame = sys._getframe()
+    assert culprit_of(frame) == f'handler:{frame.f_code.co_name} (test_loop_watchdog.py:{frame.f_lineno})'
+
+
+def test_blocking_code_is_reported_as_stall():
+    def blocking_handler():
+        time.sleep(0.4)
+
+    culprit = f'handler:blocking_handler (test_loop_watchdog.py:{blocking_handler.__code__.co_firstlineno + 1})'
+
+    async def main():
+        watchdog = LoopWatchdog(interval=0.02, threshold=0.1)
+        stalls = metrics.counter('event_loop.stalls', culprit=culprit)
+        watchdog.start()
+        await asyncio.sleep(0.1)
+        blocking_handler()
+        await asyncio.sleep(0.2)
+        watchdog.stop()
+        assert len(watchdog.stalls) == 1
+        stall = watchdog.stalls[0]
+        assert stall.culprit == culprit
+        assert 0.3 < stall.duration < 0.5
+        assert stall.samples and 'time.sleep(0.4)' in stall.samples[0]
+        assert metrics.counter('event_loop.stalls', culprit=culprit) == stalls + 1
+        assert metrics.percentile('event_loop.lag', 100) >= 0.3
+    asyncio.run(main())
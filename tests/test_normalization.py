@@ -0,0 +1,29 @@
+from nice_droplets.components.normalization import Normalizer, default_normalizer, tokenize
+
+
+def test_ascii_is_lowercased():
+    assert default_normalizer.normalize('MacBook Pro') == 'macbook pro'
+
+
+def test_case_and_diacritics_are_folded():
+    assert default_normalizer.normalize('Größe') == default_normalizer.normalize('GROSSE') == 'grosse'
+    assert default_normalizer.normalize('Café') == 'cafe'
+
+
+def test_compatibility_forms_are_normalized():
+    assert default_normalizer.normalize('ﬁle') == 'file'
+
+
+def test_options_can_be_disabled():
+    normalizer = Normalizer(casefold=False, strip_diacritics=False)
+    assert normalizer.normalize('Café') == 'Café'
+    assert normalizer.normalize('ABC') == 'ABC'
+
+
+def test_tokenize():
+    assert tokenize('Crème brûlée, 2 Stück') == ['creme', 'brulee', '2', 'stuck']
+    assert Normalizer(token_pattern=r'[^ ]+').tokenize('a-b c') == ['a-b', 'c']
+
+
+def test_key_collapses_whitespace():
+    assert default_normalizer.key('  New   YORK ') == 'new york'
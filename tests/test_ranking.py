@@ -0,0 +1,54 @@
+from dataclasses import dataclass
+
+from nice_droplets.components.ranking import Ranker
+
+RECORDS = [
+    {'title': 'Apple pie recipe', 'description': 'apple'},
+    {'title': 'Pineapple', 'description': 'tropical fruit'},
+    {'title': 'Apple', 'description': 'fruit'},
+    {'title': 'Banana bread', 'description': 'with apple sauce'},
+]
+
+
+def test_exact_match_ranks_first():
+    assert Ranker({'title': 1.0}).top_k(RECORDS, 'apple', 2) == [RECORDS[2], RECORDS[0]]
+
+
+def test_field_weights():
+    assert Ranker({'title': 1.0, 'description': 5.0}).top_k(RECORDS, 'apple', 1) == [RECORDS[0]]
+
+
+def test_top_k_equals_sorting_all():
+    ranker = Ranker().fit(RECORDS)
+    assert ranker.top_k(RECORDS, 'apple', 3) == ranker.top_k(RECORDS, 'apple')[:3]
+
+
+def test_empty_query_keeps_the_order():
+    ranker = Ranker()
+    assert ranker.top_k(RECORDS, '', 2) == RECORDS[:2]
+    assert ranker.top_k(RECORDS, None) == RECORDS
+    assert ranker.score(RECORDS[0], ' ') == 0.0
+
+
+def test_ties_keep_the_order_of_the_source():
+    assert Ranker().top_k(['b item', 'a item', 'c item'], 'item') == ['b item', 'a item', 'c item']
+
+
+def test_queries_are_normalized():
+    assert Ranker().top_k(['Strasse', 'Straße und Weg', 'Weg'], 'STRASSE') == ['Strasse', 'Straße und Weg', 'Weg']
+
+
+def test_fit_normalizes_records_once():
+    ranker = Ranker().fit(RECORDS)
+    assert ranker.normalized_fields(RECORDS[2]) is ranker.normalized_fields(RECORDS[2])
+    assert ranker.normalized_fields({'title': 'new'}) == {'title': ('new', ['new'])}
+
+
+def test_object_records_use_their_attributes():
+    @dataclass
+    class Product:
+        name: str
+        sku: str
+
+    products = [Product('Cable', 'mouse-1'), Product('Mouse', 'M-2')]
+    assert Ranker({'name': 1.0}).top_k(products, 'mouse', 1) == [products[1]]
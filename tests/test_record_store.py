@@ -0,0 +1,61 @@
+from array import array
+
+import pytest
+
+from nice_droplets.components.record_store import RecordStore, RecordView
+
+RECORDS = [
+    {'name': 'Apple', 'category': 'fruit', 'price': 1.5, 'stock': 10},
+    {'name': 'Carrot', 'category': 'vegetable', 'price': 0.5, 'stock': 3},
+    {'name': 'Banana', 'category': 'fruit', 'price': 1.0, 'stock': 7},
+]
+
+
+def test_views_read_the_rows():
+    store = RecordStore.from_dicts(RECORDS)
+    assert len(store) == 3
+    assert store.columns == ['name', 'category', 'price', 'stock']
+    assert store[1]['name'] == 'Carrot'
+    assert store[-1].stock == 7
+    assert [view.to_dict() for view in store] == RECORDS
+    assert dict(store[0]) == RECORDS[0]
+
+
+def test_numeric_columns_are_compacted_to_arrays():
+    store = RecordStore.from_dicts(RECORDS)
+    assert isinstance(store.column('price'), array)
+    assert isinstance(store.column('stock'), array)
+    assert isinstance(store.column('name'), list)
+
+
+def test_interned_strings_are_shared():
+    store = RecordStore.from_dicts([dict(record) for record in RECORDS], intern=['category'])
+    categories = store.column('category')
+    assert categories[0] is categories[2]
+
+
+def test_missing_keys_are_not_part_of_the_view():
+    store = RecordStore.from_dicts([{'a': 1, 'b': None}, {'a': 2}])
+    assert store[0].to_dict() == {'a': 1, 'b': None}
+    assert store[1].to_dict() == {'a': 2}
+    with pytest.raises(KeyError):
+        store[1]['b']
+    with pytest.raises(AttributeError):
+        store[1].b
+
+
+def test_array_column_falls_back_to_list():
+    store = RecordStore.from_dicts([{'value': 1}, {'value': 2}])
+    store.append({'value': 'many'})
+    assert list(store.column('value')) == [1, 2, 'many']
+
+
+def test_views_compare_by_store_and_row():
+    store = RecordStore.from_dicts(RECORDS)
+    assert store[0] == store[0]
+    assert hash(store[0]) == hash(store[0])
+    assert store[0] != store[1]
+    assert store.views([2, 0]) == [store[2], store[0]]
+    assert isinstance(store[0:2][1], RecordView)
+    with pytest.raises(IndexError):
+        store[3]
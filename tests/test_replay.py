@@ -0,0 +1,62 @@
+from nice_droplets.components.replay import ReplayHarness
+from nice_droplets.components.search_task import SearchTask
+from nice_droplets.components.session_recorder import RecordedEvent, RecordedSession, SessionRecorder
+
+
+def typed(*values: str, interval: float = 0.01) -> RecordedSession:
+    return RecordedSession([RecordedEvent(index * interval, 'input', value) for index, value in enumerate(values)])
+
+
+def test_anonymized_sessions_keep_lengths_prefixes_and_repetitions():
+    recorder = SessionRecorder()
+    recording = recorder.start_session()
+    for value in ('Ab1', 'Ab12', 'Ab1', 'Äpfel', 'typeahead sessions'):
+        recording.record_input(value)
+    recording.record_key('Enter')
+    recorder.start_session()  # without events
+
+    session, = recorder.sessions
+    first, second, third, umlaut, text = session.queries
+    assert len(first) == 3 and first[0].isupper() and first[1].islower() and first[2].isdigit()
+    assert second.startswith(first) and third == first
+    assert len(umlaut) == 5 and umlaut.isascii()
+    assert text != 'typeahead sessions' and text[9] == ' '
+    assert session.events[-1].kind == 'key' and session.events[-1].value == 'Enter'
+    assert session.events[0].time == 0.0 and session.duration >= 0.0
+
+
+def test_sessions_are_saved_as_json_lines(tmp_path):
+    recorder = SessionRecorder(anonymize=False, max_sessions=2)
+    for query in ('apple', 'pear', 'plum'):
+        recorder.start_session().record_input(query)
+    path = tmp_path / 'sessions.jsonl'
+    recorder.save(path)
+    assert [session.queries for session in SessionRecorder.load(path)] == [['pear'], ['plum']]
+
+
+def test_replay_debounces_keystrokes_through_the_search_manager():
+    queries = []
+
+    def search(query: str) -> list[str]:
+        queries.append(query)
+        return [query]
+
+    harness = ReplayHarness(lambda query: SearchTask(search, query), debounce=0.05, poll_interval=0.01)
+    report = harness.run([typed('a', 'ap', 'app', 'appl', 'apple'), typed('p', 'pe', interval=0.1)])
+    assert queries == ['apple', 'p', 'pe']
+    assert (report.sessions, report.keystrokes, report.executions) == (2, 7, 3)
+    assert report.calls_saved == 4
+    assert report.completed == 3 and report.wasted == 0 and report.errors == 0
+    assert 0.05 <= report.percentile(50) < 1
+    assert report.summary()['latency_p50'] == report.percentile(50)
+
+
+def test_replay_counts_errors_and_short_queries():
+    def search(query: str) -> list[str]:
+        raise ConnectionError('down')
+
+    harness = ReplayHarness(lambda query: SearchTask(search, query), debounce=0.01, poll_interval=0.01, min_chars=2,
+                            speed=2)
+    report = harness.run([typed('a', 'ap', interval=0.1)])
+    assert report.keystrokes == 2 and report.executions == 1
+    assert report.errors == 1 and report.completed == 0
@@ -0,0 +1,154 @@
+import asyncio
+
+from nice_droplets.components.resilient_search import CircuitBreaker, CircuitOpenError, ResilientSearch
+from nice_droplets.components.search_task import SearchTask
+
+
+class Backend:
+    """Async search backend whose searches can be held back, fail or answer immediately."""
+
+    def __init__(self):
+        self.calls: list[str] = []
+        self.fail = False
+        self.release = asyncio.Event()
+        self.release.set()
+
+    async def search(self, query: str) -> list[str]:
+        self.calls.append(query)
+        await self.release.wait()
+        if self.fail:
+            raise ConnectionError('backend down')
+        return [f'{query} result']
+
+    def __call__(self, query: str) -> SearchTask:
+        return SearchTask(self.search, query)
+
+
+def test_breaker_opens_after_consecutive_failures():
+    breaker = CircuitBreaker('test', failure_threshold=2, reset_timeout=60)
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.CLOSED
+    breaker.record_success()
+    breaker.record_failure()
+    assert breaker.allow_request()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.allow_request()
+
+
+def test_half_open_breaker_lets_a_single_probe_through():
+    breaker = CircuitBreaker('test', failure_threshold=1, reset_timeout=0)
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert breaker.allow_request()
+    assert not breaker.allow_request()
+    breaker.record_failure()
+    assert breaker.allow_request()  # the reset timeout of 0 elapsed again
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.allow_request() and breaker.allow_request()
+
+
+def test_released_probe_keeps_the_state():
+    breaker = CircuitBreaker('test', failure_threshold=1, reset_timeout=0)
+    breaker.record_failure()
+    assert breaker.allow_request()
+    breaker.release_probe()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert breaker.allow_request()
+
+
+def test_cancelled_probe_does_not_block_the_breaker():
+    async def main():
+        backend = Backend()
+        search = ResilientSearch(backend, name='probe', failure_threshold=1, reset_timeout=0)
+        search.breaker.record_failure()
+        backend.release.clear()
+        probe = search('apple')
+        runner = asyncio.ensure_future(probe.run_async())
+        await asyncio.sleep(0.01)
+        assert backend.calls == ['apple']
+        assert not search.breaker.allow_request()  # the probe is running
+        probe.cancel()  # superseded by the next keystroke
+        assert search.breaker.state == CircuitBreaker.HALF_OPEN
+        backend.release.set()
+        await runner
+
+        task = search('apples')
+        await task.run_async()
+        assert task.error is None
+        assert task.elements == ('apples result',)
+        assert search.breaker.state == CircuitBreaker.CLOSED
+    asyncio.run(main())
+
+
+def test_open_breaker_rejects_searches():
+    async def main():
+        backend = Backend()
+        search = ResilientSearch(backend, name='open', failure_threshold=1, reset_timeout=60)
+        backend.fail = True
+        failing = search('apple')
+        await failing.run_async()
+        assert isinstance(failing.error, ConnectionError)
+        rejected = search('pear')
+        await rejected.run_async()
+        assert isinstance(rejected.error, CircuitOpenError)
+        assert backend.calls == ['apple']
+    asyncio.run(main())
+
+
+def test_stale_results_are_served_while_revalidating():
+    async def main():
+        backend = Backend()
+        search = ResilientSearch(backend, name='stale')
+        await search('apple').run_async()
+
+        backend.release.clear()
+        task = search('Apple ')  # the same normalized query
+        assert task.partial_elements == ('apple result',)
+        assert task.publishes_partial_results
+        runner = asyncio.ensure_future(task.run_async())
+        await asyncio.sleep(0.01)
+        assert task.is_stale
+        backend.release.set()
+        await runner
+        assert task.elements == ('Apple  result',)
+        assert not task.is_stale
+
+        assert search('apple pie').partial_elements == ('Apple  result',)  # the nearest cached prefix
+        assert search('pear').partial_elements == ()
+    asyncio.run(main())
+
+
+def test_stale_results_are_kept_if_the_backend_fails():
+    async def main():
+        backend = Backend()
+        search = ResilientSearch(backend, name='fallback', deadline=0.05)
+        await search('apple').run_async()
+        backend.release.clear()
+        task = search('apple')
+        await task.run_async()
+        assert task.error is None
+        assert task.is_stale
+        assert task.elements == ('apple result',)
+
+        uncached = search('pear')
+        await uncached.run_async()
+        assert isinstance(uncached.error, TimeoutError)
+        backend.release.set()
+    asyncio.run(main())
+
+
+def test_equal_queries_share_a_backend_search():
+    async def main():
+        backend = Backend()
+        search = ResilientSearch(backend, name='coalesce')
+        backend.release.clear()
+        first, second = search('apple'), search(' APPLE')
+        runners = [asyncio.ensure_future(first.run_async()), asyncio.ensure_future(second.run_async())]
+        await asyncio.sleep(0.01)
+        backend.release.set()
+        await asyncio.gather(*runners)
+        assert backend.calls == ['apple']
+        assert first.elements == second.elements == ('apple result',)
+    asyncio.run(main())
@@ -0,0 +1,64 @@
+import os
+
+import pytest
+
+from nice_droplets.components.search_index import SearchIndex, SearchIndexBuilder, SearchIndexSource
+
+RECORDS = [
+    {'name': 'Apple MacBook Pro', 'category': 'laptop'},
+    {'name': 'Apple iPhone', 'category': 'phone'},
+    {'name': 'Samsung Galaxy', 'category': 'phone'},
+    {'name': 'Café Crème', 'category': 'drink'},
+]
+
+
+@pytest.fixture
+def index_path(tmp_path):
+    path = str(tmp_path / 'products.idx')
+    builder = SearchIndexBuilder()
+    builder.add_all(RECORDS)
+    builder.write(path)
+    return path
+
+
+def test_search_matches_all_token_prefixes(index_path):
+    index = SearchIndex(index_path)
+    assert len(index) == 4
+    assert index.search('apple') == RECORDS[:2]
+    assert index.search('apple pho') == [RECORDS[1]]
+    assert index.search('phone', limit=1) == [RECORDS[1]]
+    assert index.search('tablet') == []
+    assert index.search('') == []
+
+
+def test_queries_are_normalized(index_path):
+    index = SearchIndex(index_path)
+    assert index.search('CAFE creme') == [RECORDS[3]]
+
+
+def test_term_range(index_path):
+    index = SearchIndex(index_path)
+    assert [index.term(term) for term in index.term_range('ph')] == [b'phone']
+    assert list(index.postings(index.term_range('phone')[0])) == [1, 2]
+
+
+def test_invalid_file(tmp_path):
+    path = tmp_path / 'invalid.idx'
+    path.write_bytes(b'\0' * 128)
+    with pytest.raises(ValueError):
+        SearchIndex(str(path))
+
+
+def test_source_reloads_replaced_index(index_path):
+    source = SearchIndexSource(index_path, reload_interval=0)
+    assert source.search('galaxy') == [RECORDS[2]]
+    builder = SearchIndexBuilder()
+    builder.add({'name': 'Samsung Galaxy S2', 'category': 'phone'})
+    builder.write(index_path)
+    assert source.search('galaxy') == [{'name': 'Samsung Galaxy S2', 'category': 'phone'}]
+    assert not os.path.exists(f'{index_path}.{os.getpid()}.tmp')
+
+
+def test_source_limits_the_decoded_records(index_path):
+    source = SearchIndexSource(index_path, max_elements=1)
+    assert len(source.search('phone')) == 2  # one more than max_elements, so the task knows there are more
@@ -0,0 +1,179 @@
+import asyncio
+import threading
+import time
+from typing import Any
+
+from nicegui import ui
+from nicegui.testing import User
+
+from nice_droplets.components.cancellation_token import CancellationToken
+from nice_droplets.components.metrics import metrics
+from nice_droplets.components.search_task import SearchTask
+from nice_droplets.elements.search_list import SearchList, result_fingerprint
+from nice_droplets.factories import FlexDefaultFactory
+
+
+class Source:
+    """Search source counting its searches, its results can be changed between them."""
+
+    def __init__(self):
+        self.queries: list[str] = []
+        self.tokens: list[CancellationToken] = []
+        self.suffix = ''
+        self.delay = 0.0
+
+    def search(self, query: str, token: CancellationToken) -> list[str]:
+        self.queries.append(query)
+        self.tokens.append(token)
+        results = [f'{query.strip().lower()} {index}{self.suffix}' for index in range(3)]
+        if self.delay:
+            token.publish(results[:1])
+            time.sleep(self.delay)
+        return results
+
+    def __call__(self, query: str) -> SearchTask:
+        return SearchTask(self.search, query, with_token=True)
+
+
+class PreparingFactory(FlexDefaultFactory):
+    """Factory recording the threads preparing view models and the view models passed to create_item."""
+
+    def __init__(self):
+        super().__init__()
+        self.threads: set[int] = set()
+        self.received: list[Any] = []
+
+    def prepare_item(self, data: Any) -> dict[str, Any]:
+        self.threads.add(threading.get_ident())
+        return {**super().prepare_item(data), 'label': f'<{data}>'}
+
+    def create_item(self, data: Any, view_model: dict[str, Any] | None = None):
+        self.received.append(view_model)
+        return super().create_item(data, view_model=view_model)
+
+
+class PlainFactory(PreparingFactory):
+    """Factory preparing view models without accepting them in create_item."""
+
+    def create_item(self, data: Any):
+        self.received.append(None)
+        return FlexDefaultFactory.create_item(self, data)
+
+
+async def open_list(user: User, source: Source, **kwargs) -> SearchList:
+    lists: list[SearchList] = []
+
+    @ui.page('/')
+    def page():
+        lists.append(SearchList(on_search=source, debounce=0.01, poll_interval=0.01, **kwargs))
+
+    await user.open('/')
+    return lists[0]
+
+
+async def search(search_list: SearchList, query: str) -> None:
+    with search_list:
+        search_list.set_search_query(query)
+    await finished(search_list)
+
+
+async def finished(search_list: SearchList) -> None:
+    for _ in range(500):
+        if not search_list._search_manager.is_searching:
+            return
+        await asyncio.sleep(0.01)
+    raise TimeoutError(search_list.query)
+
+
+async def test_results_are_fingerprinted(user: User):
+    search_list = await open_list(user, Source())
+    await search(search_list, 'apple')
+    assert list(search_list.items) == ['apple 0', 'apple 1', 'apple 2']
+    assert search_list.fingerprint == result_fingerprint(search_list.items)
+    await user.should_see('apple 1')
+
+
+async def test_cached_results_are_shown_and_revalidated(user: User):
+    source = Source()
+    search_list = await open_list(user, source, cache_size=5)
+    await search(search_list, 'apple')
+    await search(search_list, 'apples')
+    skipped = metrics.counter('search_list.skipped_renders')
+
+    with search_list:
+        search_list.set_search_query('Apple ')  # the same normalized query
+    assert list(search_list.items) == ['apple 0', 'apple 1', 'apple 2']
+    await finished(search_list)
+    assert source.queries == ['apple', 'apples', 'Apple ']
+    assert metrics.counter('search_list.skipped_renders') == skipped + 1  # the fresh results are equal
+
+    source.suffix = '!'
+    await search(search_list, 'apples')
+    assert list(search_list.items) == ['apples 0!', 'apples 1!', 'apples 2!']
+
+
+async def test_partial_results_do_not_replace_cached_ones(user: User):
+    source = Source()
+    search_list = await open_list(user, source, cache_size=5)
+    await search(search_list, 'apple')
+    await search(search_list, 'pear')
+
+    source.delay = 0.2
+    with search_list:
+        search_list.set_search_query('apple')
+    await asyncio.sleep(0.1)
+    assert list(search_list.items) == ['apple 0', 'apple 1', 'apple 2']
+    await finished(search_list)
+    assert source.queries == ['apple', 'pear', 'apple']
+
+    with search_list:
+        search_list.set_search_query('plum')  # not cached, so its partial results are shown
+    await asyncio.sleep(0.1)
+    assert list(search_list.items) == ['plum 0']
+    await finished(search_list)
+    assert list(search_list.items) == ['plum 0', 'plum 1', 'plum 2']
+
+
+async def test_without_cache_every_query_is_searched(user: User):
+    source = Source()
+    search_list = await open_list(user, source)
+    await search(search_list, 'apple')
+    await search(search_list, 'apple')
+    assert source.queries == ['apple', 'apple']
+    assert list(search_list.items) == ['apple 0', 'apple 1', 'apple 2']
+
+
+async def test_deleted_list_cancels_its_search(user: User):
+    source = Source()
+    search_list = await open_list(user, source, cache_size=5)
+    await search(search_list, 'apple')
+    source.delay = 0.2
+    with search_list:
+        search_list.set_search_query('pear')
+    await asyncio.sleep(0.1)
+    assert search_list._search_manager.is_searching
+    search_list.delete()  # also happens once the client disconnects
+    assert source.tokens[-1].is_cancelled
+    assert not search_list._search_manager.is_searching
+    assert search_list.items == [] and search_list.factory.container is None
+    await asyncio.sleep(0.2)
+    assert search_list.factory.items == []
+
+
+async def test_view_models_are_prepared_in_the_worker(user: User):
+    factory = PreparingFactory()
+    search_list = await open_list(user, Source(), factory=factory)
+    await search(search_list, 'apple')
+    assert factory.threads and threading.get_ident() not in factory.threads
+    assert factory.received == [{'label': '<apple 0>', 'disabled': False},
+                                {'label': '<apple 1>', 'disabled': False},
+                                {'label': '<apple 2>', 'disabled': False}]
+    await user.should_see('<apple 1>')
+
+
+async def test_create_item_without_view_model_parameter(user: User):
+    factory = PlainFactory()
+    search_list = await open_list(user, Source(), factory=factory)
+    await search(search_list, 'apple')
+    assert factory.received == [None, None, None]
+    await user.should_see('<apple 1>')  # create_item prepares the view model itself
@@ -0,0 +1,110 @@
+import asyncio
+from threading import Thread
+
+from nice_droplets.components.ranking import Ranker
+from nice_droplets.components.search_task import ResultSnapshot, SearchTask
+
+
+class CountingRanker(Ranker):
+    """Ranker counting the records it ranked."""
+
+    def __init__(self):
+        super().__init__()
+        self.ranked = 0
+
+    def top_k(self, records: list, query: str | None, k: int = -1) -> list:
+        self.ranked += len(records)
+        return super().top_k(records, query, k)
+
+
+def test_snapshots_are_immutable_generations():
+    task = SearchTask(query='apple')
+    assert task.snapshot == ResultSnapshot((), 0)
+    task.add_elements(['a', 'b'])
+    first = task.snapshot
+    task.add_elements(['c'])
+    assert first == ResultSnapshot(('a', 'b'), 1)
+    assert task.snapshot == ResultSnapshot(('a', 'b', 'c'), 2)
+    assert task.partial_elements == ('a', 'b', 'c')
+    assert task.elements == ()  # only final results once the task is done
+
+    task.add_elements([])
+    assert task.version == 2
+    task.set_elements(['d'])
+    assert task.snapshot == ResultSnapshot(('d',), 3)
+
+
+def test_max_elements_limits_the_results():
+    task = SearchTask(query='apple', max_elements=3)
+    task.add_elements(['a', 'b'])
+    assert not task.more_elements
+    task.add_elements(['c', 'd'])
+    assert task.partial_elements == ('a', 'b', 'c')
+    assert task.more_elements
+
+    replaced = SearchTask(query='apple', max_elements=2)
+    replaced.set_elements(['a', 'b'])
+    assert not replaced.more_elements
+    replaced.set_elements(['a', 'b', 'c'])
+    assert replaced.partial_elements == ('a', 'b')
+    assert replaced.more_elements
+
+
+def test_readers_see_consistent_snapshots_while_writing():
+    task = SearchTask(query='apple')
+    inconsistent = []
+
+    def write():
+        for index in range(2000):
+            task.add_elements([index])
+
+    writer = Thread(target=write)
+    writer.start()
+    while writer.is_alive():
+        snapshot = task.snapshot
+        if len(snapshot.elements) != snapshot.generation or list(snapshot.elements) != list(range(snapshot.generation)):
+            inconsistent.append(snapshot)
+    writer.join()
+    assert not inconsistent
+    assert task.version == 2000
+
+
+def test_added_elements_are_ranked_once_at_completion():
+    ranker = CountingRanker()
+
+    class StreamingTask(SearchTask):
+        def execute(self):
+            for batch in (['pear'], ['apple pie', 'plum'], ['apple']):
+                self.add_elements(batch)
+
+    task = StreamingTask(query='apple', max_elements=2, ranker=ranker)
+    task.run()
+    assert task.error is None
+    assert task.elements == ('apple', 'apple pie')
+    assert task.more_elements
+    assert ranker.ranked == 4
+
+
+def test_set_elements_ranks_the_results():
+    task = SearchTask(lambda query: ['pear', 'apple pie', 'apple'], 'apple', ranker=Ranker())
+    task.run()
+    assert task.elements[:2] == ('apple', 'apple pie')
+    assert not task.requires_post_processing
+
+
+def test_view_models_and_fingerprint_belong_to_the_final_results():
+    async def search(query: str) -> list[str]:
+        return [query, query.upper()]
+
+    async def main():
+        task = SearchTask(search, 'apple')
+        task.view_model_fn = lambda elements: [{'label': element} for element in elements]
+        task.fingerprint_fn = lambda elements: '|'.join(elements)
+        assert task.view_models is None
+        await task.run_async()
+        assert task.view_models == [{'label': 'apple'}, {'label': 'APPLE'}]
+        assert task.fingerprint == 'apple|APPLE'
+
+        task.add_elements(['late'])  # published after the preparation, so it no longer matches
+        assert task.view_models is None and task.fingerprint is None
+    asyncio.run(main())
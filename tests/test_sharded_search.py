@@ -0,0 +1,53 @@
+import subprocess
+import sys
+
+import pytest
+
+from nice_droplets.components.sharded_search import ShardedSearch
+
+RECORDS = ['pineapple', 'apple', 'crab apple', 'apple pie', 'pear', 'Äpfel', 'plum', 'snapple', 'apples']
+
+
+@pytest.fixture(scope='module')
+def engine():
+    with ShardedSearch(RECORDS, shards=3, max_elements=3) as engine:
+        yield engine
+
+
+def test_shards_cover_all_records(engine: ShardedSearch):
+    assert engine.shard_ranges() == [(0, 3), (3, 6), (6, 9)]
+
+
+def test_shard_results_are_merged_by_score(engine: ShardedSearch):
+    task = engine('Apple')
+    task.run()
+    assert task.error is None
+    assert task.elements == ('apple', 'apples', 'apple pie')  # exact match, then the shorter prefix
+    assert task.total_elements == 6
+    assert task.more_elements
+
+    umlaut = engine('apfel')
+    umlaut.run()
+    assert umlaut.elements == ('Äpfel',)
+
+
+def test_cancelled_queries_stop_every_shard(engine: ShardedSearch):
+    slot, query_id = engine.begin_query()
+    engine.cancel_query(slot, query_id)
+    futures = engine.submit('apple', slot, query_id, 10)
+    assert [future.result(5) for future in futures] == [(0, [])] * 3
+
+
+def test_workers_do_not_track_the_shared_memory():
+    script = (
+        'from nice_droplets.components.sharded_search import ShardedSearch\n'
+        'with ShardedSearch(["apple", "pear"], shards=2) as engine:\n'
+        '    task = engine("apple")\n'
+        '    task.run()\n'
+        '    print(task.elements)\n'
+    )
+    result = subprocess.run([sys.executable, '-c', script], capture_output=True, text=True, timeout=60)
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == "('apple',)"
+    # the resource tracker neither warns about leaked blocks nor fails to unregister them
+    assert 'resource_tracker' not in result.stderr and 'Traceback' not in result.stderr
@@ -0,0 +1,64 @@
+import asyncio
+import json
+import pstats
+import time
+
+import pytest
+
+from nice_droplets.components.search_task import SearchTask
+from nice_droplets.components.task_profiler import profiler
+
+
+@pytest.fixture
+def profiles(tmp_path):
+    yield tmp_path
+    profiler.disable()
+
+
+def busy_search(query: str) -> list[str]:
+    end = time.monotonic() + 0.05
+    while time.monotonic() < end:
+        pass
+    return [query]
+
+
+async def busy_async_search(query: str) -> list[str]:
+    return busy_search(query)
+
+
+def test_selected_sync_tasks_are_profiled_with_cprofile(profiles):
+    profiler.enable(profiles, predicate=lambda task: task.query == 'invoice')
+    SearchTask(busy_search, 'apple').run()
+    assert list(profiles.iterdir()) == []
+
+    SearchTask(busy_search, 'invoice').run()
+    profile, = profiles.glob('*-SearchTask-*.prof')
+    functions = {function for _, _, function in pstats.Stats(str(profile)).stats}
+    assert 'busy_search' in functions
+    info = json.loads(profile.with_suffix('.json').read_text())
+    assert info['query'] == 'invoice' and info['mode'] == 'pstats' and info['error'] is None
+    assert info['duration'] >= 0.05
+
+
+def test_async_tasks_are_sampled_as_collapsed_stacks(profiles):
+    profiler.enable(profiles, fraction=1.0, interval=0.001)
+    asyncio.run(SearchTask(busy_async_search, 'apple').run_async())
+    folded, = profiles.glob('*.folded')
+    lines = folded.read_text().splitlines()
+    assert lines and all(line.rsplit(' ', 1)[1].isdigit() for line in lines)
+    assert any(line.startswith('run_async (task.py:') and 'busy_search (test_task_profiler.py:' in line
+               for line in lines)
+    info = json.loads(folded.with_suffix('.json').read_text())
+    assert info['mode'] == 'collapsed' and info['samples'] > 0
+
+
+def test_fast_executions_are_discarded(profiles):
+    profiler.enable(profiles, fraction=1.0, min_duration=10)
+    SearchTask(busy_search, 'apple').run()
+    assert list(profiles.iterdir()) == []
+
+
+def test_unknown_modes_are_rejected(profiles):
+    with pytest.raises(ValueError):
+        profiler.enable(profiles, mode='flamegraph')
+    assert not profiler.enabled
@@ -0,0 +1,58 @@
+from nicegui import Client, core, ui
+from nicegui.testing import User
+
+from nice_droplets.components.traffic_meter import TrafficMeter
+
+
+async def open_clients(user: User, count: int) -> list[Client]:
+    clients: list[Client] = []
+
+    @ui.page('/')
+    def page():
+        clients.append(ui.context.client)
+
+    for _ in range(count):
+        await user.open('/')
+    return clients
+
+
+def send_event(client_id: str) -> None:
+    core.sio.handlers['/']['event']('sid', {'client_id': client_id, 'id': -1, 'type': 'input'})
+
+
+async def test_only_metered_clients_are_counted(user: User):
+    metered, other = await open_clients(user, 2)
+    meter = TrafficMeter(max_messages=2)
+    meter.install(metered)
+    assert meter.supported
+    meter.keystroke(metered)
+    before = meter.statistics(metered)
+    await core.sio.emit('update', {'text': 'apple'}, room=metered.id)
+    await core.sio.emit('update', {'text': 'apple'}, room=other.id)
+    send_event(metered.id)
+    send_event(other.id)
+    statistics = meter.statistics(metered)
+    assert statistics['messages_out'] == before['messages_out'] + 1
+    assert statistics['messages_in'] == before['messages_in'] + 1
+    assert statistics['bytes_out'] > before['bytes_out']
+    assert meter.statistics(other) == {}
+
+    send_event(metered.id)
+    meter.keystroke(metered)
+    assert meter.statistics(metered)['over_budget'] == 1
+    meter.uninstall(metered)
+
+
+async def test_server_is_restored_after_the_last_client(user: User):
+    first, second = await open_clients(user, 2)
+    emit, handle_event = core.sio.emit, core.sio.handlers['/']['event']
+    meter = TrafficMeter()
+    meter.install(first)
+    meter.install(second)
+    assert core.sio.emit != emit
+    meter.uninstall(first)
+    assert core.sio.handlers['/']['event'] != handle_event
+    second.delete()  # deleted clients are uninstalled automatically
+    assert core.sio.emit == emit
+    assert core.sio.handlers['/']['event'] == handle_event
+    assert 'emit' not in vars(core.sio)